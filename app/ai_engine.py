@@ -1,122 +1,164 @@
-async def ai_live_commentary(event: dict) -> str:
-    s = event.get("state", {})
-    hs, ays = s.get("home_score", 0), s.get("away_score", 0)
-    q = s.get("quarter")
-    clock = s.get("clock", "")
-    status = s.get("status")
-    home = s.get("home_team", "Home")
-    away = s.get("away_team", "Away")
-    
-    # Pregame
+import functools
+from typing import Iterable
+
+# Rule-based commentary as decision tables. Every rule below is evaluated once
+# at import for each (bucket, quarter) combination and stored in a dict, so a
+# state costs one key computation plus one lookup and one str.format. Formatted
+# lines are additionally memoized on the exact inputs, so a replay or a slate
+# that revisits a score/quarter skips the formatting too. The async ai_* functions are kept as
+# the public entry points; they do no I/O and just call the sync versions.
+
+# Quarters the rules distinguish; anything else (None, 0, overtime) is folded in.
+_QUARTERS = (None, 1, 2, 3, 4, 5)
+
+def _quarter_key(q) -> int | None:
+    if q in (1, 2, 3, 4):
+        return q
+    if isinstance(q, int) and q >= 5:
+        return 5
+    return None
+
+def _margin_bucket(margin: int) -> str:
+    if margin == 0:
+        return "tied"
+    if margin <= 8:
+        return "one_score"
+    if margin <= 16:
+        return "two_score"
+    return "blowout"
+
+# (margin bucket, quarter test, template); first match wins.
+_LIVE_RULES = (
+    ("tied", lambda q: q == 4, "Tied {hs}-{ays} in the 4th quarter! Every possession crucial."),
+    ("tied", lambda q: q == 3, "All square at {hs}-{ays}. Third quarter - game still wide open."),
+    ("tied", lambda q: True, "Score tied {hs}-{hs}. Both teams trading blows early."),
+    ("one_score", lambda q: q == 4, "{leader} leads {hs}-{ays} in crunch time. {trailer} needs a stop here."),
+    ("one_score", lambda q: q == 3, "{leader} up {hs}-{ays}. One-score game heading into the 4th."),
+    ("one_score", lambda q: True, "{leader} holds slim {hs}-{ays} advantage. Still anyone's game."),
+    ("two_score", lambda q: q == 4, "{leader} leads {hs}-{ays} late. {trailer} needs scores on consecutive drives."),
+    ("two_score", lambda q: True, "{leader} building momentum, up {hs}-{ays}. {trailer} needs an answer."),
+    ("blowout", lambda q: q is not None and q >= 3, "{leader} in command {hs}-{ays}. Dominant performance unfolding."),
+    ("blowout", lambda q: True, "{leader} jumps ahead {hs}-{ays}. Early statement being made."),
+)
+_PREGAME = "Pregame: {away} at {home}. Teams warming up, kickoff approaching."
+
+# (quarter, margin test, explanation); first match wins.
+_WINPROB_RULES = (
+    (1, lambda m: True, "Early - score margin has less predictive weight"),
+    (2, lambda m: m <= 7, "Close at halftime - game very much in flux"),
+    (2, lambda m: True, "Lead established but plenty of time remains"),
+    (3, lambda m: m <= 3, "One possession game in 3rd - critical juncture"),
+    (3, lambda m: True, "Margin grows more significant as time dwindles"),
+    (4, lambda m: m <= 7, "Late one-score game - single drive can flip outcome"),
+    (4, lambda m: m <= 14, "Two-score lead late - needs multiple possessions to overcome"),
+    (4, lambda m: True, "Commanding lead with clock becoming a factor"),
+)
+_WINPROB_DEFAULT = "Win probability based on score margin and time remaining"
+
+# (exclusive lower bound on passing yards, label); first match wins.
+_EFFICIENCY_RULES = (
+    (300, "Outstanding passing day"),
+    (200, "Solid production through the air"),
+    (100, "Steady performance"),
+    (None, "Limited passing output"),
+)
+
+def _decision(tds: int, ints: int) -> str:
+    if tds > 0 and ints == 0:
+        return "Clean decision-making, protecting the football"
+    if tds > ints:
+        return "More positives than negatives"
+    if tds == ints:
+        return "Mixed results in the turnover battle"
+    return "Struggling with ball security"
+
+
+# Tables are keyed by the raw margin (capped where the rules stop caring) so a
+# lookup needs no bucketing call on the hot path.
+_LIVE_MARGIN_CAP = 17
+_WINPROB_MARGIN_CAP = 15
+
+def _compile_live() -> dict[tuple[int, int | None], str]:
+    table = {}
+    for margin in range(_LIVE_MARGIN_CAP + 1):
+        bucket = _margin_bucket(margin)
+        for q in _QUARTERS:
+            table[margin, q] = next(t for b, test, t in _LIVE_RULES if b == bucket and test(q))
+    return table
+
+def _compile_winprob() -> dict[tuple[int, int], str]:
+    # Quarters without rules (pregame None, overtime) are absent: they get the default.
+    table = {}
+    for q in (1, 2, 3, 4):
+        for margin in range(_WINPROB_MARGIN_CAP + 1):
+            table[q, margin] = next(
+                (t for rq, test, t in _WINPROB_RULES if rq == q and test(margin)), _WINPROB_DEFAULT
+            )
+    return table
+
+LIVE_TABLE = _compile_live()
+WINPROB_TABLE = _compile_winprob()
+
+
+@functools.lru_cache(maxsize=8192)
+def live_commentary_text(home: str, away: str, hs: int, ays: int, q, status) -> str:
     if status == "pregame":
-        return f"Pregame: {away} at {home}. Teams warming up, kickoff approaching."
-    
-    # Game is live
+        return _PREGAME.format(home=home, away=away)
     margin = abs(hs - ays)
     leader = home if hs > ays else away
     trailer = away if hs > ays else home
-    
-    # Tied game
-    if hs == ays:
-        if q == 4:
-            return f"Tied {hs}-{ays} in the 4th quarter! Every possession crucial."
-        elif q == 3:
-            return f"All square at {hs}-{ays}. Third quarter - game still wide open."
-        else:
-            return f"Score tied {hs}-{hs}. Both teams trading blows early."
-    
-    # One-score game (1-8 points)
-    if margin <= 8:
-        if q == 4:
-            return f"{leader} leads {hs}-{ays} in crunch time. {trailer} needs a stop here."
-        elif q == 3:
-            return f"{leader} up {hs}-{ays}. One-score game heading into the 4th."
-        else:
-            return f"{leader} holds slim {hs}-{ays} advantage. Still anyone's game."
-    
-    # Two-score game (9-16 points)
-    elif margin <= 16:
-        if q == 4:
-            return f"{leader} leads {hs}-{ays} late. {trailer} needs scores on consecutive drives."
-        else:
-            return f"{leader} building momentum, up {hs}-{ays}. {trailer} needs an answer."
-    
-    # Blowout (17+ points)
-    else:
-        if q >= 3:
-            return f"{leader} in command {hs}-{ays}. Dominant performance unfolding."
-        else:
-            return f"{leader} jumps ahead {hs}-{ays}. Early statement being made."
+    if margin > _LIVE_MARGIN_CAP:
+        margin = _LIVE_MARGIN_CAP
+    template = LIVE_TABLE.get((margin, q)) or LIVE_TABLE[margin, _quarter_key(q)]
+    return template.format(hs=hs, ays=ays, leader=leader, trailer=trailer)
 
-async def ai_mendoza_watch(state: dict) -> str:
-    m = state.get("mendoza", {})
-    yds = m.get("pass_yds")
-    tds = m.get("td", 0)
-    ints = m.get("int", 0)
-    
+@functools.lru_cache(maxsize=8192)
+def mendoza_watch_text(yds, tds, ints) -> str:
     if yds is None:
         return "Player stats not yet available. Check back after first quarter."
-    
-    # Build detailed analysis based on performance
     stat_line = f"{yds} passing yards, {tds} TD, {ints} INT"
-    
-    # Efficiency analysis
-    if yds > 300:
-        efficiency = "Outstanding passing day"
-    elif yds > 200:
-        efficiency = "Solid production through the air"
-    elif yds > 100:
-        efficiency = "Steady performance"
-    else:
-        efficiency = "Limited passing output"
-    
-    # TD/INT ratio analysis
-    if tds > 0 and ints == 0:
-        decision = "Clean decision-making, protecting the football"
-    elif tds > ints:
-        decision = "More positives than negatives"
-    elif tds == ints:
-        decision = "Mixed results in the turnover battle"
-    else:
-        decision = "Struggling with ball security"
-    
-    return f"{stat_line}. {efficiency}. {decision}."
+    efficiency = next(label for bound, label in _EFFICIENCY_RULES if bound is None or yds > bound)
+    return f"{stat_line}. {efficiency}. {_decision(tds or 0, ints or 0)}."
 
-async def ai_winprob_explain(state: dict, wp: float) -> str:
-    q = state.get("quarter")
+def live_commentary(state: dict) -> str:
+    hs, ays = state.get("home_score", 0) or 0, state.get("away_score", 0) or 0
+    return live_commentary_text(
+        state.get("home_team", "Home"), state.get("away_team", "Away"),
+        hs, ays, state.get("quarter"), state.get("status"),
+    )
+
+def mendoza_watch(state: dict) -> str:
+    m = state.get("mendoza", {})
+    return mendoza_watch_text(m.get("pass_yds"), m.get("td", 0), m.get("int", 0))
+
+def winprob_explain(state: dict, wp: float | None = None) -> str:
     status = state.get("status")
-    hs = state.get("home_score", 0)
-    ays = state.get("away_score", 0)
-    margin = abs(hs - ays)
-    
     if status == "pregame":
         return "Even odds before kickoff"
-    
     if status == "final":
         return "Game complete"
-    
-    # Build context-aware explanation
-    if q == 1:
-        return "Early - score margin has less predictive weight"
-    elif q == 2:
-        if margin <= 7:
-            return "Close at halftime - game very much in flux"
-        else:
-            return "Lead established but plenty of time remains"
-    elif q == 3:
-        if margin <= 3:
-            return "One possession game in 3rd - critical juncture"
-        else:
-            return "Margin grows more significant as time dwindles"
-    elif q == 4:
-        if margin <= 7:
-            return "Late one-score game - single drive can flip outcome"
-        elif margin <= 14:
-            return "Two-score lead late - needs multiple possessions to overcome"
-        else:
-            return "Commanding lead with clock becoming a factor"
-    
-    return "Win probability based on score margin and time remaining"
+    margin = abs((state.get("home_score", 0) or 0) - (state.get("away_score", 0) or 0))
+    if margin > _WINPROB_MARGIN_CAP:
+        margin = _WINPROB_MARGIN_CAP
+    return WINPROB_TABLE.get((state.get("quarter"), margin), _WINPROB_DEFAULT)
+
+
+def commentary_batch(states: Iterable[dict]) -> list[dict[str, str]]:
+    """Live, player and win-prob lines for many states (a slate, a replay) in one call."""
+    return [
+        {"commentary": live_commentary(s), "player": mendoza_watch(s), "winprob": winprob_explain(s)}
+        for s in states
+    ]
+
+
+async def ai_live_commentary(event: dict) -> str:
+    return live_commentary(event.get("state", {}))
+
+async def ai_mendoza_watch(state: dict) -> str:
+    return mendoza_watch(state)
+
+async def ai_winprob_explain(state: dict, wp: float) -> str:
+    return winprob_explain(state, wp)
 
 async def ai_postgame_recap(final_state: dict, winprob_history: list[str], mendoza_notes: list[str]) -> str:
     home = final_state["home_team"]
@@ -1,5 +1,22 @@
 from __future__ import annotations
+import asyncio
+import hashlib
+import io
+import json
 import os
+from pathlib import Path, PurePosixPath
+from urllib.parse import urlparse
+
+import httpx
+from fastapi.staticfiles import StaticFiles
+
+from app.config import settings
+
+# Optional: Pillow is only used when installed (pip install pillow).
+try:
+    from PIL import Image  # type: ignore
+except ImportError:
+    Image = None
 
 # Defaults (Wikimedia CDN). You can override with env vars later.
 DEFAULT_TEAM_LOGOS = {
@@ -12,24 +29,156 @@ DEFAULT_PLAYER_IMAGES = {
     "fernando mendoza": "https://upload.wikimedia.org/wikipedia/commons/thumb/7/7a/2026-0117_Fernando_Mendoza.jpeg/250px-2026-0117_Fernando_Mendoza.jpeg",
 }
 
+# Local copies: images are fetched once (or taken from ASSET_SEED_DIR), shrunk
+# to twice their CSS display size when Pillow is installed, and written to
+# app/static/assets/<name>-<content hash>.<ext>. A name changes whenever the
+# bytes do, so /static/assets/* is served as immutable. Until an image is
+# cached the remote URL is used, so a cold start or a failed fetch only costs
+# the hot-link it replaces.
+ASSET_DIR = Path("app/static/assets")
+ASSET_URL_PREFIX = "/static/assets/"
+MANIFEST_PATH = Path("runtime/assets.json")   # source URL -> cached file name
+TEAM_LOGO_SIZE = (112, 56)       # .teamLogo is 28px high
+PLAYER_IMAGE_SIZE = (88, 88)     # .playerImg is 44x44
+IMMUTABLE = "public, max-age=31536000, immutable"
+USER_AGENT = "cfp-ai-tracker/1.0 (asset cache)"
+
 def _k(s: str) -> str:
     return (s or "").strip().lower()
 
+def _resolve(prefix: str, defaults: dict[str, str]) -> dict[str, str]:
+    # Optional overrides, read once at startup:
+    #   TEAM_LOGO_INDIANA="https://..."   TEAM_LOGO_OHIO_STATE="https://..."
+    #   PLAYER_IMG_FERNANDO_MENDOZA="https://..."
+    urls = {_k(name): url for name, url in defaults.items()}
+    for env_key, value in os.environ.items():
+        if env_key.startswith(prefix) and value:
+            urls[env_key[len(prefix):].replace("_", " ").lower()] = value
+    return urls
+
+TEAM_LOGOS = _resolve("TEAM_LOGO_", DEFAULT_TEAM_LOGOS)
+PLAYER_IMAGES = _resolve("PLAYER_IMG_", DEFAULT_PLAYER_IMAGES)
+
+def _load_manifest() -> dict[str, str]:
+    if not settings.asset_cache:
+        return {}
+    try:
+        saved = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    # Drop entries whose file is gone (static dir wiped, new checkout).
+    return {url: ASSET_URL_PREFIX + name for url, name in saved.items() if (ASSET_DIR / name).is_file()}
+
+# source URL -> local /static/assets/... URL
+_local: dict[str, str] = _load_manifest()
+
+def _served(url: str | None) -> str | None:
+    return _local.get(url, url) if url else None
+
 def team_logo_url(team_name: str) -> str | None:
-    # Optional overrides:
-    #   TEAM_LOGO_INDIANA="https://..."
-    #   TEAM_LOGO_MIAMI="https://..."
-    key = _k(team_name)
-    env_key = f"TEAM_LOGO_{key.replace(' ', '_').upper()}"
-    if os.getenv(env_key):
-        return os.getenv(env_key)
-    return DEFAULT_TEAM_LOGOS.get(key)
+    return _served(TEAM_LOGOS.get(_k(team_name)))
 
 def player_image_url(player_name: str) -> str | None:
-    # Optional override:
-    #   PLAYER_IMG_FERNANDO_MENDOZA="https://..."
-    key = _k(player_name)
-    env_key = f"PLAYER_IMG_{key.replace(' ', '_').upper()}"
-    if os.getenv(env_key):
-        return os.getenv(env_key)
-    return DEFAULT_PLAYER_IMAGES.get(key)
+    return _served(PLAYER_IMAGES.get(_k(player_name)))
+
+
+def _seeded(key: str) -> tuple[bytes, str] | None:
+    """ASSET_SEED_DIR/<key with underscores>.<ext>, e.g. indiana.png or fernando_mendoza.jpeg."""
+    if not settings.asset_seed_dir:
+        return None
+    stem = key.replace(" ", "_")
+    for path in sorted(Path(settings.asset_seed_dir).glob(f"{stem}.*")):
+        return path.read_bytes(), path.suffix.lower()
+    return None
+
+def _suffix(url: str, content_type: str | None = None) -> str:
+    suffix = PurePosixPath(urlparse(url).path).suffix.lower()
+    if suffix in (".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg"):
+        return suffix
+    return {"image/jpeg": ".jpg", "image/gif": ".gif", "image/webp": ".webp", "image/svg+xml": ".svg"}.get(
+        (content_type or "").split(";")[0].strip(), ".png"
+    )
+
+def _shrink(data: bytes, size: tuple[int, int]) -> bytes:
+    if Image is None:
+        return data
+    try:
+        img = Image.open(io.BytesIO(data))
+        fmt = img.format or "PNG"
+        if img.width <= size[0] and img.height <= size[1]:
+            return data
+        img.thumbnail(size)
+        if fmt == "JPEG" and img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        out = io.BytesIO()
+        img.save(out, format=fmt, optimize=True, **({"quality": 85} if fmt == "JPEG" else {}))
+        return out.getvalue()
+    except Exception as e:
+        print(f"Asset cache: could not resize image, keeping original: {e}")
+        return data
+
+def _write_asset(key: str, data: bytes, suffix: str, size: tuple[int, int]) -> str:
+    if suffix != ".svg":
+        data = _shrink(data, size)
+    digest = hashlib.blake2b(data, digest_size=6).hexdigest()
+    name = f"{key.replace(' ', '_')}-{digest}{suffix}"
+    path = ASSET_DIR / name
+    if not path.exists():
+        ASSET_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    return name
+
+def _save_manifest() -> None:
+    try:
+        MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+        names = {url: local[len(ASSET_URL_PREFIX):] for url, local in _local.items()}
+        tmp = MANIFEST_PATH.with_name(f".assets.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(names, indent=2), encoding="utf-8")
+        os.replace(tmp, MANIFEST_PATH)
+    except OSError as e:
+        print(f"Asset cache: could not save manifest: {e}")
+
+async def warm_asset_cache() -> int:
+    """Cache every known team logo and player image locally; returns how many were added."""
+    if not settings.asset_cache:
+        return 0
+    todo = [
+        (key, url, size)
+        for urls, size in ((TEAM_LOGOS, TEAM_LOGO_SIZE), (PLAYER_IMAGES, PLAYER_IMAGE_SIZE))
+        for key, url in urls.items()
+        if url not in _local and url.startswith(("http://", "https://"))
+    ]
+    if not todo:
+        return 0
+    added = 0
+    async with httpx.AsyncClient(timeout=10.0, follow_redirects=True, headers={"User-Agent": USER_AGENT}) as client:
+        for key, url, size in todo:
+            try:
+                seeded = _seeded(key)
+                if seeded is not None:
+                    data, suffix = seeded
+                else:
+                    resp = await client.get(url)
+                    resp.raise_for_status()
+                    data, suffix = resp.content, _suffix(url, resp.headers.get("content-type"))
+                name = await asyncio.to_thread(_write_asset, key, data, suffix, size)
+            except Exception as e:
+                print(f"Asset cache: could not cache {url}: {e}")
+                continue
+            _local[url] = ASSET_URL_PREFIX + name
+            added += 1
+    if added:
+        _save_manifest()
+    return added
+
+
+class AssetStaticFiles(StaticFiles):
+    """/static with far-future caching for the content-addressed files under assets/."""
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if path.startswith("assets/") and response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE
+        return response
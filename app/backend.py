@@ -0,0 +1,470 @@
+from __future__ import annotations
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import urlparse
+
+from app.config import settings
+
+# Shared state for `uvicorn --workers N`.
+#
+# Every worker keeps its own MemoryStores (reads stay in-process), but only
+# the worker holding the leader lease polls upstream. After each change the
+# leader publishes a versioned snapshot per game (MemoryStore.snapshot() as
+# JSON) to the backend; followers check the version numbers every
+# STATE_SYNC_S and restore() the games that moved. Upstream load is one
+# poller no matter how many workers serve reads.
+#
+#   STATE_BACKEND=memory                  single process (default, no sharing)
+#   STATE_BACKEND=sqlite:runtime/shared.db  one host, WAL mode
+#   STATE_BACKEND=redis://127.0.0.1:6379/0  plain RESP (loadtest/redis_standin.py works)
+#
+# The lease expires after LEADER_LEASE_S without renewal, so a dead leader is
+# replaced within that time; the new leader restores the latest snapshots
+# before its first poll and continues the version numbers. A worker whose
+# renewal fails, or has not succeeded for LEADER_LEASE_S, stops acting as
+# leader at once: by then another worker may hold the lease.
+
+LEASE_NAME = "leader"
+
+
+class MemoryBackend:
+    """Single process: always the leader, nothing to share."""
+
+    shared = False
+
+    async def acquire(self, owner: str, ttl_s: float) -> bool:
+        return True
+
+    async def release(self, owner: str) -> None:
+        pass
+
+    async def publish(self, game_id: str, version: int, body: bytes) -> None:
+        pass
+
+    async def versions(self, game_ids: list[str]) -> dict[str, int]:
+        return {}
+
+    async def fetch(self, game_id: str) -> bytes | None:
+        return None
+
+    async def close(self) -> None:
+        pass
+
+    def describe(self) -> str:
+        return "memory"
+
+
+class SQLiteBackend:
+    """One database file shared by the workers of one host (WAL: readers never block the writer)."""
+
+    shared = True
+
+    def __init__(self, path: str):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS lease (name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots (game_id TEXT PRIMARY KEY, version INTEGER NOT NULL, body BLOB NOT NULL)"
+        )
+
+    def _run(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        with self._lock:
+            return fn(self._db)
+
+    async def _call(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        return await asyncio.to_thread(self._run, fn)
+
+    async def acquire(self, owner: str, ttl_s: float) -> bool:
+        def acquire(db: sqlite3.Connection) -> bool:
+            now = time.time()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute(
+                    "INSERT INTO lease (name, owner, expires) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires = excluded.expires "
+                    "WHERE lease.owner = excluded.owner OR lease.expires < ?",
+                    (LEASE_NAME, owner, now + ttl_s, now),
+                )
+                row = db.execute("SELECT owner FROM lease WHERE name = ?", (LEASE_NAME,)).fetchone()
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            return row is not None and row[0] == owner
+        return await self._call(acquire)
+
+    async def release(self, owner: str) -> None:
+        await self._call(lambda db: db.execute(
+            "DELETE FROM lease WHERE name = ? AND owner = ?", (LEASE_NAME, owner)
+        ))
+
+    async def publish(self, game_id: str, version: int, body: bytes) -> None:
+        await self._call(lambda db: db.execute(
+            "INSERT INTO snapshots (game_id, version, body) VALUES (?, ?, ?) "
+            "ON CONFLICT(game_id) DO UPDATE SET version = excluded.version, body = excluded.body",
+            (game_id, version, body),
+        ))
+
+    async def versions(self, game_ids: list[str]) -> dict[str, int]:
+        rows = await self._call(lambda db: db.execute("SELECT game_id, version FROM snapshots").fetchall())
+        wanted = set(game_ids)
+        return {game_id: version for game_id, version in rows if game_id in wanted}
+
+    async def fetch(self, game_id: str) -> bytes | None:
+        row = await self._call(lambda db: db.execute(
+            "SELECT body FROM snapshots WHERE game_id = ?", (game_id,)
+        ).fetchone())
+        return bytes(row[0]) if row else None
+
+    async def close(self) -> None:
+        self._run(lambda db: db.close())
+
+    def describe(self) -> str:
+        return f"sqlite:{self.path}"
+
+
+class RespError(Exception):
+    pass
+
+
+class RespClient:
+    """Just enough of the Redis protocol (RESP2) for the commands below; one connection, one command at a time."""
+
+    def __init__(self, host: str, port: int, db: int = 0, password: str | None = None):
+        self.host, self.port, self.db, self.password = host, port, db, password
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock: asyncio.Lock | None = None
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            await self._roundtrip(("AUTH", self.password))
+        if self.db:
+            await self._roundtrip(("SELECT", self.db))
+
+    @staticmethod
+    def _encode(args: tuple) -> bytes:
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode("utf-8")
+            out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(out)
+
+    async def _read(self) -> Any:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("redis connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RespError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            n = int(rest)
+            if n < 0:
+                return None
+            data = await self._reader.readexactly(n + 2)
+            return data[:-2]
+        if kind == b"*":
+            n = int(rest)
+            return None if n < 0 else [await self._read() for _ in range(n)]
+        raise RespError(f"unexpected reply {line!r}")
+
+    async def _roundtrip(self, args: tuple) -> Any:
+        self._writer.write(self._encode(args))
+        await self._writer.drain()
+        return await self._read()
+
+    async def execute(self, *args) -> Any:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    await self._connect()
+                return await self._roundtrip(args)
+            except (ConnectionError, OSError, asyncio.IncompleteReadError):
+                # Reconnect on the next command.
+                await self.close()
+                raise
+
+    async def close(self) -> None:
+        writer, self._writer, self._reader = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+
+# Compare-and-set on the lease, run atomically by the server: between a GET
+# and a separate PEXPIRE/DEL the lease can lapse and be taken by another
+# worker, whose lease we would then extend or delete.
+_RENEW_SCRIPT = 'if redis.call("GET", KEYS[1]) == ARGV[1] then return redis.call("PEXPIRE", KEYS[1], ARGV[2]) else return 0 end'
+_RELEASE_SCRIPT = 'if redis.call("GET", KEYS[1]) == ARGV[1] then return redis.call("DEL", KEYS[1]) else return 0 end'
+
+
+class RedisBackend:
+    """Keys: cfp:leader (lease, PX ttl), cfp:ver:<game> (int), cfp:snap:<game> (snapshot JSON)."""
+
+    shared = True
+
+    def __init__(self, url: str):
+        u = urlparse(url)
+        self.url = url
+        self.prefix = "cfp:"
+        self._client = RespClient(
+            u.hostname or "127.0.0.1",
+            u.port or 6379,
+            int((u.path or "/0").lstrip("/") or 0),
+            u.password,
+        )
+
+    async def acquire(self, owner: str, ttl_s: float) -> bool:
+        key, ttl_ms = self.prefix + LEASE_NAME, int(ttl_s * 1000)
+        if await self._client.execute("SET", key, owner, "NX", "PX", ttl_ms) == "OK":
+            return True
+        # Renew only if it is still ours.
+        return await self._client.execute("EVAL", _RENEW_SCRIPT, 1, key, owner, ttl_ms) == 1
+
+    async def release(self, owner: str) -> None:
+        await self._client.execute("EVAL", _RELEASE_SCRIPT, 1, self.prefix + LEASE_NAME, owner)
+
+    async def publish(self, game_id: str, version: int, body: bytes) -> None:
+        # Body first: a follower that sees the new version always finds a body at least that new.
+        await self._client.execute("SET", f"{self.prefix}snap:{game_id}", body)
+        await self._client.execute("SET", f"{self.prefix}ver:{game_id}", version)
+
+    async def versions(self, game_ids: list[str]) -> dict[str, int]:
+        if not game_ids:
+            return {}
+        values = await self._client.execute("MGET", *(f"{self.prefix}ver:{g}" for g in game_ids))
+        return {g: int(v) for g, v in zip(game_ids, values) if v is not None}
+
+    async def fetch(self, game_id: str) -> bytes | None:
+        return await self._client.execute("GET", f"{self.prefix}snap:{game_id}")
+
+    async def close(self) -> None:
+        await self._client.close()
+
+    def describe(self) -> str:
+        return self.url
+
+
+def open_backend(spec: str):
+    if spec.startswith("sqlite:"):
+        return SQLiteBackend(spec[len("sqlite:"):].removeprefix("//") or "runtime/shared.db")
+    if spec.startswith("redis://"):
+        return RedisBackend(spec)
+    if spec != "memory":
+        print(f"Unknown STATE_BACKEND {spec!r}; using memory")
+    return MemoryBackend()
+
+
+class SharedState:
+    """Leader lease plus snapshot publish (leader) / restore (followers) for a set of stores."""
+
+    def __init__(self, backend, lease_s: float = 10.0, sync_s: float = 0.5):
+        self.backend = backend
+        self.lease_s = lease_s
+        self.sync_s = sync_s
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._leader = not backend.shared
+        self._stores: dict = {}
+        self._on_restore: Callable | None = None
+        self._snapshot_extra: Callable[[str], dict] | None = None
+        self._apply_extra: Callable[[str, dict], None] | None = None
+        self._seen: dict[str, int] = {}        # shared version each local store reflects
+        self._published: dict[str, int] = {}   # local store.version at last publish
+        self._dirty = False
+        self._publish_task: asyncio.Task | None = None
+        self._task: asyncio.Task | None = None
+        self._lease_at = 0.0                   # last renewal attempt
+        self._held_at = 0.0                    # start of the last successful one
+
+        # meta / observability
+        self.publishes = 0
+        self.restores = 0
+        self.leader_changes = 0
+        self.errors = 0
+
+    def attach(
+        self,
+        stores: dict,
+        on_restore: Callable | None = None,
+        snapshot_extra: Callable[[str], dict] | None = None,
+        apply_extra: Callable[[str, dict], None] | None = None,
+    ) -> None:
+        """`on_restore(store)` runs after a follower restores a game (re-publish to viewers)."""
+        self._stores = stores
+        self._on_restore = on_restore
+        self._snapshot_extra = snapshot_extra
+        self._apply_extra = apply_extra
+
+    @property
+    def is_leader(self) -> bool:
+        """True while the lease is ours: the last renewal succeeded less than lease_s ago."""
+        if not self.backend.shared:
+            return True
+        return self._leader and time.monotonic() - self._held_at < self.lease_s
+
+    # --- lifecycle -------------------------------------------------------
+
+    async def start(self) -> None:
+        if not self.backend.shared:
+            return
+        await self._renew()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self.backend.shared:
+            try:
+                if self.is_leader:
+                    await self.flush()
+                    await self.backend.release(self.owner)
+            except Exception as e:
+                print(f"shared state shutdown failed: {e!r}")
+        await self.backend.close()
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_s)
+            try:
+                if time.monotonic() - self._lease_at >= self.lease_s / 3:
+                    await self._renew()
+                if not self.is_leader:
+                    await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                print(f"shared state sync failed: {e!r}")
+
+    async def _renew(self) -> None:
+        started = time.monotonic()
+        try:
+            leader = await self.backend.acquire(self.owner, self.lease_s)
+        except Exception:
+            # Unknown whether the lease is still ours: stop polling until a renewal succeeds.
+            self._leader = False
+            raise
+        finally:
+            self._lease_at = time.monotonic()
+        if leader and not self.is_leader:
+            # Taking over: continue from the last published game state.
+            self.leader_changes += 1
+            await self.sync()
+            for game_id, store in self._stores.items():
+                self._published[game_id] = store.version
+        if leader:
+            self._held_at = started
+        self._leader = leader
+
+    # --- follower --------------------------------------------------------
+
+    async def sync(self) -> None:
+        """Restore every game whose shared version is newer than what this process shows."""
+        if not self.backend.shared:
+            return
+        remote = await self.backend.versions(list(self._stores))
+        for game_id, version in remote.items():
+            if version <= self._seen.get(game_id, 0):
+                continue
+            body = await self.backend.fetch(game_id)
+            if body is None:
+                continue
+            doc = json.loads(body)
+            store = self._stores[game_id]
+            store.restore(doc["snap"])
+            if self._apply_extra is not None:
+                self._apply_extra(game_id, doc.get("extra") or {})
+            self._seen[game_id] = int(doc.get("version") or version)
+            self.restores += 1
+            if self._on_restore is not None:
+                self._on_restore(store)
+
+    # --- leader ----------------------------------------------------------
+
+    def mark_dirty(self) -> None:
+        """Coalesce changes into one publish pass (leader only)."""
+        if not self.backend.shared or not self.is_leader:
+            return
+        self._dirty = True
+        if self._publish_task is None:
+            try:
+                self._publish_task = asyncio.get_running_loop().create_task(self._publish_soon())
+            except RuntimeError:
+                pass
+
+    async def _publish_soon(self) -> None:
+        try:
+            while self._dirty:
+                self._dirty = False
+                await self._publish_changed()
+        except Exception as e:
+            self.errors += 1
+            print(f"shared state publish failed: {e!r}")
+        finally:
+            self._publish_task = None
+
+    async def flush(self) -> None:
+        task = self._publish_task
+        if task is not None:
+            await task
+        await self._publish_changed()
+
+    async def _publish_changed(self) -> None:
+        for game_id, store in list(self._stores.items()):
+            if self._published.get(game_id) == store.version:
+                continue
+            local_version = store.version
+            version = self._seen.get(game_id, 0) + 1
+            doc = {"version": version, "snap": store.snapshot()}
+            if self._snapshot_extra is not None:
+                doc["extra"] = self._snapshot_extra(game_id)
+            body = json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            await self.backend.publish(game_id, version, body)
+            self._seen[game_id] = version
+            self._published[game_id] = local_version
+            self.publishes += 1
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "backend": self.backend.describe(),
+            "owner": self.owner,
+            "leader": self.is_leader,
+            "versions": dict(self._seen),
+            "publishes": self.publishes,
+            "restores": self.restores,
+            "leader_changes": self.leader_changes,
+            "errors": self.errors,
+        }
+
+
+SHARED = SharedState(open_backend(settings.state_backend), settings.leader_lease_s, settings.state_sync_s)
@@ -0,0 +1,290 @@
+from __future__ import annotations
+import functools
+import sys
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from app.config import settings
+
+# Player lines from the ESPN summary's boxscore.players.
+#
+# One pass over the response builds an index of the athletes in the
+# categories we read (ESPN athlete id -> raw stat rows, normalized name -> id);
+# tracked players are then dict lookups, and only their rows are converted to
+# numbers. A tracked name is resolved to its athlete id once; after that the
+# pass skips everyone else with one set lookup and never touches names.
+# Columns are located through each category's `keys` (or `labels`) header
+# rather than by position; the header -> column layout is cached, since ESPN
+# sends the same headers on every poll, and is only looked up for categories
+# a tracked player appears in. Cost per poll is one walk over the listed
+# athletes however many players are tracked. What is learned from a response
+# (resolved ids, converted lines) is kept per game, so a name fragment pinned
+# in one game never picks a player in another.
+
+# category -> {our field: (ESPN key, ESPN label)}
+COLUMNS: dict[str, dict[str, tuple[str, str]]] = {
+    "passing": {
+        "comp_att": ("completions/passingAttempts", "C/ATT"),
+        "pass_yds": ("passingYards", "YDS"),
+        "pass_td": ("passingTouchdowns", "TD"),
+        "pass_int": ("interceptions", "INT"),
+    },
+    "rushing": {
+        "rush_car": ("rushingAttempts", "CAR"),
+        "rush_yds": ("rushingYards", "YDS"),
+        "rush_td": ("rushingTouchdowns", "TD"),
+    },
+    "receiving": {
+        "rec": ("receptions", "REC"),
+        "rec_yds": ("receivingYards", "YDS"),
+        "rec_td": ("receivingTouchdowns", "TD"),
+    },
+}
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerLine:
+    name: str
+    athlete_id: str | None = None
+    team: str | None = None
+    pass_comp: int | None = None
+    pass_att: int | None = None
+    pass_yds: int | None = None
+    pass_td: int | None = None
+    pass_int: int | None = None
+    rush_car: int | None = None
+    rush_yds: int | None = None
+    rush_td: int | None = None
+    rec: int | None = None
+    rec_yds: int | None = None
+    rec_td: int | None = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "name", intern_str(self.name))
+        object.__setattr__(self, "team", intern_str(self.team))
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "id": self.athlete_id,
+            "team": self.team,
+            "passing": {"comp": self.pass_comp, "att": self.pass_att, "yds": self.pass_yds,
+                        "td": self.pass_td, "int": self.pass_int},
+            "rushing": {"car": self.rush_car, "yds": self.rush_yds, "td": self.rush_td},
+            "receiving": {"rec": self.rec, "yds": self.rec_yds, "td": self.rec_td},
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "PlayerLine":
+        """Inverse of to_dict(); also accepts the flat dataclasses.asdict() form.
+
+        Equal lines come back as one shared instance: a replayed history
+        repeats each player's line for many states in a row.
+        """
+        if "passing" not in d:
+            values = tuple(d.get(name) for name in _FIELDS)
+        else:
+            p, r, c = d.get("passing") or {}, d.get("rushing") or {}, d.get("receiving") or {}
+            values = (
+                d.get("name", ""), d.get("id"), d.get("team"),
+                p.get("comp"), p.get("att"), p.get("yds"), p.get("td"), p.get("int"),
+                r.get("car"), r.get("yds"), r.get("td"),
+                c.get("rec"), c.get("yds"), c.get("td"),
+            )
+        line = _shared.get(values)
+        if line is None:
+            if len(_shared) >= MAX_SHARED_LINES:
+                _shared.clear()
+            line = _shared[values] = cls(*values)
+        return line
+
+
+_FIELDS = PlayerLine.__match_args__
+# field values -> the PlayerLine handed out for them by from_dict()
+_shared: dict[tuple, PlayerLine] = {}
+MAX_SHARED_LINES = 65536
+
+
+def intern_str(value):
+    """sys.intern() for str values; anything else (None) passes through."""
+    return sys.intern(value) if type(value) is str else value
+
+
+@functools.lru_cache(maxsize=4096)
+def norm_name(name: str | None) -> str:
+    return " ".join((name or "").lower().split())
+
+
+@functools.lru_cache(maxsize=256)
+def _layout(category: str, keys: tuple, labels: tuple) -> tuple[tuple[str, int], ...]:
+    """(field, column) pairs for one category header; missing columns are left out."""
+    upper_labels = tuple(str(label).upper() for label in labels)
+    out = []
+    for field, (key, label) in COLUMNS[category].items():
+        if key in keys:
+            out.append((field, keys.index(key)))
+        elif label in upper_labels:
+            out.append((field, upper_labels.index(label)))
+    return tuple(out)
+
+
+def _int(value: Any) -> int | None:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+# (game id, athlete key) -> (raw rows, line): most polls repeat a player's
+# stats, so the previous line is handed back as-is instead of re-converting
+# every column.
+_lines: dict[tuple[str | None, str], tuple[tuple, PlayerLine]] = {}
+MAX_CACHED_LINES = 2048
+
+
+class BoxscoreIndex:
+    """Athletes listed under the categories in COLUMNS, indexed once per response.
+
+    With `only` (athlete keys), everyone else is skipped and no name index is built.
+    `game_id` scopes the converted-line cache to one game.
+    """
+
+    __slots__ = ("_rows", "_by_name", "_game_id")
+
+    def __init__(self, players_data: Iterable[dict], only: set[str] | None = None, game_id: str | None = None):
+        self._game_id = game_id
+        # athlete key -> [display name, id, team, [(category, stats), ...]]
+        self._rows: dict[str, list] = {}
+        self._by_name: dict[str, str] = {}
+        rows = self._rows
+        for team_players in players_data or ():
+            team = None
+            for category in team_players.get("statistics") or ():
+                if category.get("name") not in COLUMNS:
+                    continue
+                for entry in category.get("athletes") or ():
+                    athlete = entry.get("athlete") or {}
+                    athlete_id = athlete.get("id")
+                    key = norm_name(athlete.get("displayName")) if athlete_id is None else str(athlete_id)
+                    if only is not None and key not in only:
+                        continue
+                    row = rows.get(key)
+                    if row is None:
+                        if team is None:
+                            team = (team_players.get("team") or {}).get("displayName")
+                        display = athlete.get("displayName") or ""
+                        row = rows[key] = [display, None if athlete_id is None else key, team, []]
+                        if only is None:
+                            self._by_name[norm_name(display)] = key
+                    row[3].append((category, entry.get("stats") or ()))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def find(self, spec: str) -> str | None:
+        """Athlete key for an ESPN id, a full name, or (fallback) part of a name."""
+        if spec in self._rows:
+            return spec
+        wanted = norm_name(spec)
+        key = self._by_name.get(wanted)
+        if key is None and wanted:
+            key = next((k for name, k in self._by_name.items() if wanted in name), None)
+        return key
+
+    def line(self, spec: str) -> PlayerLine | None:
+        key = self.find(spec)
+        return None if key is None else self.line_for(key)
+
+    def line_for(self, key: str) -> PlayerLine | None:
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        display, athlete_id, team, rows = row
+        raw = (display, team, tuple((category.get("name"), tuple(stats)) for category, stats in rows))
+        cache_key = (self._game_id, key)
+        cached = _lines.get(cache_key)
+        if cached is not None and cached[0] == raw:
+            return cached[1]
+        values: dict[str, int | None] = {}
+        for category, stats in rows:
+            layout = _layout(category["name"], tuple(category.get("keys") or ()), tuple(category.get("labels") or ()))
+            for field, col in layout:
+                if col >= len(stats):
+                    continue
+                if field == "comp_att":
+                    comp, _, att = str(stats[col]).partition("/")
+                    values["pass_comp"], values["pass_att"] = _int(comp), _int(att)
+                else:
+                    values[field] = _int(stats[col])
+        line = PlayerLine(display, athlete_id, team, **values)
+        if len(_lines) >= MAX_CACHED_LINES:
+            _lines.clear()
+        _lines[cache_key] = (raw, line)
+        return line
+
+
+def tracked_specs() -> list[str]:
+    """TRACKED_PLAYER first (it backs the player panel), then TRACKED_PLAYERS."""
+    specs = [settings.tracked_player]
+    seen = {norm_name(settings.tracked_player)}
+    for spec in settings.tracked_players:
+        if norm_name(spec) not in seen:
+            seen.add(norm_name(spec))
+            specs.append(spec)
+    return specs
+
+
+TRACKED = tracked_specs()
+
+
+# game id -> {tracked spec (name or id) -> athlete key}, learned from earlier
+# responses for that game
+_resolved: dict[str | None, dict[str, str]] = {}
+MAX_RESOLVED_GAMES = 256
+
+
+def extract_players(
+    players_data: Iterable[dict], specs: list[str] = TRACKED, game_id: str | None = None,
+) -> tuple[PlayerLine | None, tuple[PlayerLine, ...]]:
+    """(line for specs[0] or None, lines for every tracked player found)."""
+    if not players_data or not specs:
+        return None, ()
+    resolved = _resolved.get(game_id)
+    if resolved is None:
+        if len(_resolved) >= MAX_RESOLVED_GAMES:
+            _resolved.clear()
+        resolved = _resolved[game_id] = {}
+    keys = [resolved.get(spec) for spec in specs]
+    index = None
+    if None not in keys:
+        index = BoxscoreIndex(players_data, set(keys), game_id)
+        if len(index) < len(set(keys)):
+            # A pinned athlete is not in this boxscore: look the missing ones up again.
+            keys = [key if key in index else None for key in keys]
+            index = None
+    # Full index (with names) only while some tracked player is unresolved.
+    if index is None:
+        index = BoxscoreIndex(players_data, None, game_id)
+    lines = []
+    primary = None
+    seen: set[str] = set()
+    for i, (spec, key) in enumerate(zip(specs, keys)):
+        if key is None:
+            key = index.find(spec)
+            if key is None:
+                resolved.pop(spec, None)
+                continue
+            resolved[spec] = key
+        # Specs that differ as text can name one athlete ("Fernando Mendoza", "Mendoza", his id).
+        if key in seen:
+            continue
+        seen.add(key)
+        line = index.line_for(key)
+        if line is not None:
+            lines.append(line)
+            if i == 0:
+                primary = line
+    return primary, tuple(lines)
@@ -5,6 +5,11 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+DEMO_GAME_ID = "demo"
+
+def _csv(value: str | None) -> list[str]:
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
+
 class Settings(BaseModel):
     demo_mode: bool = os.getenv("DEMO_MODE", "1") == "1"
     kickoff_iso: str = os.getenv("KICKOFF_ISO", "2026-01-19T16:30:00-08:00")
@@ -14,9 +19,85 @@ class Settings(BaseModel):
     # OpenAI settings (OPTIONAL - app works without API key using rule-based commentary)
     openai_api_key: str | None = os.getenv("OPENAI_API_KEY") or None
     openai_model: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    # Any OpenAI-compatible endpoint (loadtest/openai_standin.py for local runs)
+    openai_base_url: str = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+    # Model-written commentary/player lines, off unless LLM_COMMENTARY=1 (a key
+    # alone never sends game data to a provider); the rule-based line is used when the
+    # model misses LLM_BUDGET_S, so a slow provider never holds up a poll for longer.
+    llm_commentary: bool = os.getenv("LLM_COMMENTARY", "0") == "1"
+    llm_max_concurrency: int = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+    llm_budget_s: float = float(os.getenv("LLM_BUDGET_S", "1.5"))
+    llm_batch_window_s: float = float(os.getenv("LLM_BATCH_WINDOW_S", "0.05"))
     
     # Live game settings
-    espn_game_id: str | None = os.getenv("ESPN_GAME_ID") or None
+    # ESPN_GAME_IDS="401,402,..." tracks a whole slate; ESPN_GAME_ID still works for one game.
+    espn_game_ids: list[str] = _csv(os.getenv("ESPN_GAME_IDS")) or _csv(os.getenv("ESPN_GAME_ID"))
+    espn_game_id: str | None = (espn_game_ids or [None])[0]
+    max_concurrent_fetches: int = int(os.getenv("MAX_CONCURRENT_FETCHES", "8"))
     tracked_player: str = os.getenv("TRACKED_PLAYER", "Fernando Mendoza")
+    # More players to follow in the boxscore (names or ESPN athlete ids); shown in state["players"]
+    tracked_players: list[str] = _csv(os.getenv("TRACKED_PLAYERS"))
+
+    # Demo replay: one game per recording (.json array or journal .jsonl).
+    # DEMO_SPEED=0 steps one event per poll; >0 plays on recorded time at that multiple.
+    demo_files: list[str] = _csv(os.getenv("DEMO_FILES")) or ["demo_data/demo_events.json"]
+    demo_speed: float = float(os.getenv("DEMO_SPEED", "0"))
+
+    # Panel dedupe window: last N entries, optionally also limited to the last N seconds
+    dedupe_window: int = int(os.getenv("DEDUPE_WINDOW", "10"))
+    dedupe_ttl_s: float | None = float(os.getenv("DEDUPE_TTL_S", "0")) or None
+
+    # Server-side polling (replaces per-tab browser polling)
+    auto_poll: bool = os.getenv("AUTO_POLL", "1") == "1"
+    poll_interval_s: float = float(os.getenv("POLL_INTERVAL_S", "15"))
+
+    # Team logos / headshots served from app/static/assets instead of hot-linked (app/assets.py)
+    asset_cache: bool = os.getenv("ASSET_CACHE", "1") == "1"
+    asset_seed_dir: str | None = os.getenv("ASSET_SEED_DIR") or None
+
+    # Sampling profiler + span timings (app/profiling.py); also toggled via POST /admin/profile
+    profile_enabled: bool = os.getenv("PROFILE", "0") == "1"
+    profile_hz: float = float(os.getenv("PROFILE_HZ", "25"))
+
+    # Seconds a reverse proxy may reuse the rendered dashboard (s-maxage); browsers always revalidate.
+    html_shared_max_age_s: int = int(os.getenv("HTML_SHARED_MAX_AGE_S", "1"))
+
+    # runtime/state.json is written at most once per this many seconds of changes
+    persist_debounce_s: float = float(os.getenv("PERSIST_DEBOUNCE_S", "1.0"))
+    # Append every state transition to runtime/journal/<game>.jsonl (+ .idx). Off by
+    # default: the files are never trimmed, and each append writes on the poll path.
+    journal_enabled: bool = os.getenv("JOURNAL_ENABLED", "0") == "1"
+
+    # Shared state for `uvicorn --workers N` (app/backend.py): memory | sqlite:<path> | redis://host:port/db
+    state_backend: str = os.getenv("STATE_BACKEND", "memory")
+    leader_lease_s: float = float(os.getenv("LEADER_LEASE_S", "10"))
+    state_sync_s: float = float(os.getenv("STATE_SYNC_S", "0.5"))
+
+    # Precomputed win-prob table file; built at startup (and saved here) if missing
+    winprob_table: str | None = os.getenv("WINPROB_TABLE") or None
+
+    # Upstream HTTP client (one pooled client for the app lifetime)
+    # Override to point at a local stand-in (loadtest/espn_standin.py).
+    espn_base_url: str = os.getenv(
+        "ESPN_BASE_URL", "https://site.api.espn.com/apis/site/v2/sports/football/college-football"
+    ).rstrip("/")
+    espn_http2: bool = os.getenv("ESPN_HTTP2", "0") == "1"
+    espn_max_connections: int = int(os.getenv("ESPN_MAX_CONNECTIONS", "10"))
+    # Parse the summary as it streams in (needs ijson); lower peak memory, more CPU.
+    espn_stream_parse: bool = os.getenv("ESPN_STREAM_PARSE", "0") == "1"
+
+    @property
+    def llm_enabled(self) -> bool:
+        """Both an explicit LLM_COMMENTARY=1 and an OPENAI_API_KEY."""
+        return self.llm_commentary and bool(self.openai_api_key)
+
+    @property
+    def game_ids(self) -> list[str]:
+        """Games this process tracks; the first one backs the unkeyed routes."""
+        if self.demo_mode:
+            # demo, demo-2, demo-3, ... one per DEMO_FILES entry
+            return [DEMO_GAME_ID] + [f"{DEMO_GAME_ID}-{i}" for i in range(2, len(self.demo_files) + 1)]
+        # No id configured: keep one empty slot so the dashboard still renders.
+        return self.espn_game_ids or [""]
 
 settings = Settings()
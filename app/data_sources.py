@@ -1,37 +1,38 @@
-import json
+from dataclasses import dataclass
 from pathlib import Path
+import time
 import httpx
 from app.game_logic import GameState
-from app.config import settings
+from app.boxscore import PlayerLine, extract_players
+from app.config import settings, DEMO_GAME_ID
+from app.replay import Recording, ReplaySession
+from app import summary_stream
+from app.profiling import span
+from app.metrics import STAGE_PARSE, UPSTREAM_FETCH_SECONDS, UPSTREAM_RESPONSE_BYTES
 
 DEMO_PATH = Path("demo_data/demo_events.json")
 
 class DemoFeed:
-    def __init__(self):
-        self.idx = 0
-        self.events = json.loads(DEMO_PATH.read_text(encoding="utf-8"))
+    """Demo game backed by a ReplaySession over a recording (see app/replay.py)."""
+
+    def __init__(self, path: str | Path = DEMO_PATH, speed: float = 0.0):
+        self.session = ReplaySession(Recording(path), speed)
 
     def set_index(self, i: int) -> None:
         try:
             i = int(i)
         except Exception:
             return
-        if i < 0:
-            i = 0
-        if i > len(self.events):
-            i = len(self.events)
-        self.idx = i
+        self.session.seek(i)
 
     def get_index(self) -> int:
-        return int(self.idx)
+        return int(self.session.position)
 
     def next_state(self) -> GameState:
-        # idx points to the NEXT event to emit
-        e = self.events[min(self.idx, len(self.events) - 1)]
-        self.idx += 1
+        e = self.session.next_event() or {}
         return GameState(
-            home_team=settings.home_team,
-            away_team=settings.away_team,
+            home_team=e.get("home_team", settings.home_team),
+            away_team=e.get("away_team", settings.away_team),
             home_score=e.get("home_score", 0),
             away_score=e.get("away_score", 0),
             status=e.get("status", "pregame"),
@@ -40,137 +41,263 @@ class DemoFeed:
             mendoza_pass_yds=e.get("mendoza_pass_yds"),
             mendoza_td=e.get("mendoza_td"),
             mendoza_int=e.get("mendoza_int"),
+            players=tuple(PlayerLine.from_dict(p) for p in e.get("players") or ()),
+        )
+
+# One independent feed per demo game id (DEMO_FILES); each has its own cursor.
+DEMO_FEEDS: dict[str, DemoFeed] = {
+    game_id: DemoFeed(path, settings.demo_speed)
+    for game_id, path in zip(settings.game_ids, settings.demo_files)
+} if settings.demo_mode else {}
+_demo = DEMO_FEEDS.get(DEMO_GAME_ID) or DemoFeed(speed=settings.demo_speed)
+
+def demo_feed(game_id: str | None = None) -> DemoFeed:
+    return DEMO_FEEDS.get(game_id or DEMO_GAME_ID, _demo)
+
+def demo_get_index(game_id: str | None = None) -> int:
+    return demo_feed(game_id).get_index()
+
+def demo_set_index(i: int, game_id: str | None = None) -> None:
+    demo_feed(game_id).set_index(i)
+
+
+ESPN_SUMMARY_URL = f"{settings.espn_base_url}/summary"
+
+
+class UpstreamError(Exception):
+    """A summary fetch or parse failed; the game keeps its last good state."""
+
+
+@dataclass
+class UpstreamStats:
+    """Counters for the shared ESPN client (exposed at /api/upstream)."""
+    requests: int = 0
+    new_connections: int = 0
+    reused_connections: int = 0
+    not_modified: int = 0
+    bytes_received: int = 0
+    errors: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "not_modified": self.not_modified,
+            "bytes_received": self.bytes_received,
+            "errors": self.errors,
+        }
+
+UPSTREAM = UpstreamStats()
+
+_client: httpx.AsyncClient | None = None
+
+# url -> (etag, last_modified, state parsed from that body)
+_validators: dict[str, tuple[str | None, str | None, GameState]] = {}
+
+
+def _http2_enabled() -> bool:
+    if not settings.espn_http2:
+        return False
+    try:
+        import h2  # noqa: F401  (httpx[http2] extra)
+    except ImportError:
+        print("ESPN_HTTP2=1 but the 'h2' package is missing; falling back to HTTP/1.1")
+        return False
+    return True
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared keep-alive client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=10.0,
+            http2=_http2_enabled(),
+            limits=httpx.Limits(
+                max_connections=settings.espn_max_connections,
+                max_keepalive_connections=settings.espn_max_connections,
+                keepalive_expiry=60.0,
+            ),
         )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _connection_trace():
+    """httpcore trace hook for one request: counts the connection it was sent on.
+
+    httpcore emits connect_tcp only when it opens a connection, before the
+    request headers go out; headers sent without one rode a pooled connection.
+    """
+    fresh = False
 
-_demo = DemoFeed()
+    async def trace(event_name: str, info: dict) -> None:
+        nonlocal fresh
+        if event_name == "connection.connect_tcp.complete":
+            fresh = True
+            UPSTREAM.new_connections += 1
+        elif event_name.endswith(".send_request_headers.started") and not fresh:
+            UPSTREAM.reused_connections += 1
 
-def demo_get_index() -> int:
-    return _demo.get_index()
+    return trace
 
-def demo_set_index(i: int) -> None:
-    _demo.set_index(i)
 
+async def _request_summary(url: str, headers: dict) -> tuple[httpx.Response, dict | None]:
+    """GET a summary; returns the response and the decoded body (None on 304).
 
-async def fetch_live_espn_state() -> GameState:
-    """Fetch live game data from ESPN API."""
-    if not settings.espn_game_id:
-        # No game ID, return empty state
+    With ESPN_STREAM_PARSE=1 (and ijson installed) the body is parsed as it
+    streams in, keeping only the subtrees parse_summary reads.
+    """
+    client = get_client()
+    trace = _connection_trace()
+    if settings.espn_stream_parse and summary_stream.available():
+        # Download and decode interleave here, so they share one span.
+        with span("request_stream"):
+            async with client.stream("GET", url, headers=headers, extensions={"trace": trace}) as resp:
+                if resp.status_code == 304:
+                    await resp.aread()  # drain so the connection goes back to the pool
+                    return resp, None
+                resp.raise_for_status()
+                stream = summary_stream.SummaryStream()
+                async for chunk in resp.aiter_bytes():
+                    stream.send(chunk)
+                return resp, stream.close()
+
+    with span("request"):
+        resp = await client.get(url, headers=headers, extensions={"trace": trace})
+    if resp.status_code == 304:
+        return resp, None
+    resp.raise_for_status()
+    with span("decode"):
+        return resp, resp.json()
+
+
+def parse_summary(data: dict) -> GameState:
+    """Build a GameState from a decoded ESPN summary response."""
+    # Parse ESPN data - use root level competitions (most reliable)
+    competitions = data.get("competitions", [])
+    if not competitions:
+        # Fallback to header if root competitions not found
+        header = data.get("header", {})
+        competitions = header.get("competitions", [])
+
+    if not competitions:
+        # Not a game we can show; never guess the teams from settings.
+        raise ValueError("summary has no competitions")
+
+    competition = competitions[0]
+    competitors = competition.get("competitors", [])
+
+    # Find home/away teams
+    home_competitor = next((c for c in competitors if c.get("homeAway") == "home"), {})
+    away_competitor = next((c for c in competitors if c.get("homeAway") == "away"), {})
+
+    home_team = home_competitor.get("team", {}).get("displayName", settings.home_team)
+    away_team = away_competitor.get("team", {}).get("displayName", settings.away_team)
+    home_score = int(home_competitor.get("score", 0))
+    away_score = int(away_competitor.get("score", 0))
+
+    # Game status
+    status_detail = competition.get("status", {})
+    status_type = status_detail.get("type", {}).get("state", "pre").lower()
+
+    # Map ESPN status to our status
+    # ESPN uses: pre, in, post
+    if status_type in ["pre", "scheduled"]:
+        status = "pregame"
+    elif status_type in ["in", "inprogress"]:
+        status = "live"
+    elif status_type in ["post", "final", "complete"]:
+        status = "final"
+    else:
+        status = "pregame"
+
+    # Quarter and clock
+    period = status_detail.get("period")
+    clock = status_detail.get("displayClock")
+
+    # Tracked players: one indexed pass over the boxscore (app/boxscore.py),
+    # cached per game by the competition id (present on the streamed path too)
+    primary, players = extract_players(data.get("boxscore", {}).get("players", []), game_id=competition.get("id"))
+
+    return GameState(
+        home_team=home_team,
+        away_team=away_team,
+        home_score=home_score,
+        away_score=away_score,
+        status=status,
+        quarter=period,
+        clock=clock,
+        mendoza_pass_yds=primary.pass_yds if primary else None,
+        mendoza_td=primary.pass_td if primary else None,
+        mendoza_int=primary.pass_int if primary else None,
+        players=players,
+    )
+
+
+async def fetch_live_espn_state(game_id: str | None = None) -> GameState:
+    """Fetch live game data from ESPN API.
+
+    Uses the shared pooled client and sends ETag / If-Modified-Since
+    validators, so an unchanged upstream answers 304 and we reuse the
+    previously parsed state without decoding anything.
+    """
+    game_id = game_id or settings.espn_game_id
+    if not game_id:
+        # No game configured at all: the single slot shows the configured matchup.
         return GameState(settings.home_team, settings.away_team)
-    
-    url = f"https://site.api.espn.com/apis/site/v2/sports/football/college-football/summary?event={settings.espn_game_id}"
-    
+
+    url = f"{ESPN_SUMMARY_URL}?event={game_id}"
+
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-        
-        # Parse ESPN data - use root level competitions (most reliable)
-        competitions = data.get("competitions", [])
-        if not competitions:
-            # Fallback to header if root competitions not found
-            header = data.get("header", {})
-            competitions = header.get("competitions", [])
-        
-        if not competitions:
-            # No competition data found
-            return GameState(settings.home_team, settings.away_team)
-        
-        competition = competitions[0]
-        competitors = competition.get("competitors", [])
-        
-        # Find home/away teams
-        home_competitor = next((c for c in competitors if c.get("homeAway") == "home"), {})
-        away_competitor = next((c for c in competitors if c.get("homeAway") == "away"), {})
-        
-        home_team = home_competitor.get("team", {}).get("displayName", settings.home_team)
-        away_team = away_competitor.get("team", {}).get("displayName", settings.away_team)
-        home_score = int(home_competitor.get("score", 0))
-        away_score = int(away_competitor.get("score", 0))
-        
-        # Game status
-        status_detail = competition.get("status", {})
-        status_type = status_detail.get("type", {}).get("state", "pre").lower()
-        
-        # Map ESPN status to our status
-        # ESPN uses: pre, in, post
-        if status_type in ["pre", "scheduled"]:
-            status = "pregame"
-        elif status_type in ["in", "inprogress"]:
-            status = "live"
-        elif status_type in ["post", "final", "complete"]:
-            status = "final"
+        headers = {}
+        cached = _validators.get(url)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        t0 = time.perf_counter()
+        resp, data = await _request_summary(url, headers)
+        t1 = time.perf_counter()
+        UPSTREAM_FETCH_SECONDS.observe(t1 - t0)
+        UPSTREAM_RESPONSE_BYTES.observe(resp.num_bytes_downloaded)
+        UPSTREAM.requests += 1
+        UPSTREAM.bytes_received += resp.num_bytes_downloaded
+
+        if data is None:
+            if not cached:
+                raise ValueError("304 Not Modified without a cached response")
+            UPSTREAM.not_modified += 1
+            return cached[2]
+
+        with span("parse"):
+            state = parse_summary(data)
+        STAGE_PARSE.observe(time.perf_counter() - t1)
+
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if etag or last_modified:
+            _validators[url] = (etag, last_modified, state)
         else:
-            status = "pregame"
-        
-        # Quarter and clock
-        period = status_detail.get("period")
-        clock = status_detail.get("displayClock")
-        
-        # Player stats (tracked player)
-        mendoza_pass_yds = None
-        mendoza_td = None
-        mendoza_int = None
-        
-        # Try to find player stats
-        boxscore = data.get("boxscore", {})
-        players_data = boxscore.get("players", [])
-        
-        for team_players in players_data:
-            team_display = team_players.get("team", {}).get("displayName", "")
-            stats_categories = team_players.get("statistics", [])
-            for category in stats_categories:
-                if category.get("name") == "passing":
-                    athletes = category.get("athletes", [])
-                    for athlete in athletes:
-                        athlete_name = athlete.get("athlete", {}).get("displayName", "")
-                        if settings.tracked_player.lower() in athlete_name.lower():
-                            # Parse passing stats
-                            stats = athlete.get("stats", [])
-                            # ESPN API can return different formats:
-                            # Short format: ['6/9', '62', '6.9', '0', '0'] = [comp/att, yards, avg, TD, INT]
-                            # Long format: [comp, att, yards, avg, TD, INT, sacks, QBR]
-                            
-                            if len(stats) >= 5:
-                                # Short format (more common)
-                                try:
-                                    mendoza_pass_yds = int(float(stats[1])) if stats[1] else None
-                                    mendoza_td = int(float(stats[3])) if stats[3] else None
-                                    mendoza_int = int(float(stats[4])) if stats[4] else None
-                                except (ValueError, IndexError):
-                                    pass
-                            elif len(stats) >= 6:
-                                # Long format (fallback)
-                                try:
-                                    mendoza_pass_yds = int(float(stats[2])) if stats[2] else None
-                                    mendoza_td = int(float(stats[4])) if stats[4] else None
-                                    mendoza_int = int(float(stats[5])) if stats[5] else None
-                                except (ValueError, IndexError):
-                                    pass
-                            break
-            if mendoza_pass_yds is not None:
-                break
-        
-        return GameState(
-            home_team=home_team,
-            away_team=away_team,
-            home_score=home_score,
-            away_score=away_score,
-            status=status,
-            quarter=period,
-            clock=clock,
-            mendoza_pass_yds=mendoza_pass_yds,
-            mendoza_td=mendoza_td,
-            mendoza_int=mendoza_int,
-        )
-    
+            _validators.pop(url, None)
+        return state
+
     except Exception as e:
-        print(f"Error fetching live data from ESPN: {e}")
-        # Return default state on error
-        return GameState(settings.home_team, settings.away_team)
+        UPSTREAM.errors += 1
+        raise UpstreamError(f"game {game_id}: {e!r}") from e
 
 
-async def fetch_state() -> GameState:
+async def fetch_state(game_id: str | None = None) -> GameState:
     if settings.demo_mode:
-        return _demo.next_state()
-    return await fetch_live_espn_state()
+        return demo_feed(game_id).next_state()
+    return await fetch_live_espn_state(game_id)
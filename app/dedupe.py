@@ -0,0 +1,51 @@
+from __future__ import annotations
+import time
+from collections import deque
+
+# Sliding-window duplicate filter for panel text. Each entry is normalized and
+# hashed once on insert; membership is a dict lookup instead of re-normalizing
+# the last N strings on every insert. The window is bounded by count and,
+# optionally, by age; whichever is tighter evicts first.
+
+def normalize(s: str) -> str:
+    return " ".join((s or "").strip().lower().split())
+
+
+class DedupeIndex:
+    __slots__ = ("window", "ttl_s", "_order", "_hashes")
+
+    def __init__(self, window: int = 10, ttl_s: float | None = None):
+        self.window = max(1, window)
+        self.ttl_s = ttl_s or None
+        self._order: deque[tuple[int, float]] = deque()   # (hash, inserted_at), oldest first
+        self._hashes: set[int] = set()
+
+    def _evict(self, now: float) -> None:
+        order = self._order
+        while len(order) > self.window or (
+            order and self.ttl_s is not None and now - order[0][1] > self.ttl_s
+        ):
+            self._hashes.discard(order.popleft()[0])
+
+    def add_if_new(self, text: str, now: float | None = None) -> bool:
+        """Record `text`; False if an equivalent entry is already in the window."""
+        now = time.monotonic() if now is None else now
+        self._evict(now)
+        h = hash(normalize(text))
+        if h in self._hashes:
+            return False
+        self._order.append((h, now))
+        self._hashes.add(h)
+        self._evict(now)
+        return True
+
+    def __contains__(self, text: str) -> bool:
+        self._evict(time.monotonic())
+        return hash(normalize(text)) in self._hashes
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def clear(self) -> None:
+        self._order.clear()
+        self._hashes.clear()
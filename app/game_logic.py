@@ -1,10 +1,23 @@
 from dataclasses import dataclass
-import hashlib
+import functools
+import enum
 import json
-from datetime import datetime, timezone
 
-@dataclass
-class GameState:
+from app.boxscore import PlayerLine, intern_str
+
+# GameState is immutable: one instance per polled state, shared by the store,
+# the journal, the diff and every reader. Being frozen lets it carry its own
+# serialized forms: to_dict() and to_json() are built on first use and reused
+# by every later caller. The caches live in slots outside the dataclass
+# fields, so ==, repr, asdict() and from_dict() never see them. Strings that
+# repeat from state to state (teams, status, clock) are interned, so a long
+# history holds one copy of each.
+
+class _Cached:
+    __slots__ = ("_dict", "_json")
+
+@dataclass(frozen=True, slots=True)
+class GameState(_Cached):
     home_team: str
     away_team: str
     home_score: int = 0
@@ -13,12 +26,57 @@ class GameState:
     quarter: int | None = None
     clock: str | None = None
 
+    # Passing line of TRACKED_PLAYER (the player panel); kept as flat fields
+    # because journals, demo recordings and state.json use them.
     mendoza_pass_yds: int | None = None
     mendoza_td: int | None = None
     mendoza_int: int | None = None
 
+    # Every tracked player found in the boxscore (TRACKED_PLAYER + TRACKED_PLAYERS).
+    players: tuple[PlayerLine, ...] = ()
+
+    def __post_init__(self):
+        set_ = object.__setattr__
+        set_(self, "home_team", intern_str(self.home_team))
+        set_(self, "away_team", intern_str(self.away_team))
+        set_(self, "status", intern_str(self.status))
+        set_(self, "clock", intern_str(self.clock))
+        set_(self, "_dict", None)
+        set_(self, "_json", None)
+
+    # copy and pickle skip __init__: carry the fields only and start the
+    # restored instance with empty caches.
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__match_args__)
+
+    def __setstate__(self, state: tuple) -> None:
+        for name, value in zip(self.__match_args__, state):
+            object.__setattr__(self, name, value)
+        self.__post_init__()
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "GameState":
+        """Inverse of to_dict(); also accepts dataclasses.asdict() output (snapshots, journal entries)."""
+        mendoza = d.get("mendoza")
+        if isinstance(mendoza, dict):
+            pass_yds, td, int_ = mendoza.get("pass_yds"), mendoza.get("td"), mendoza.get("int")
+        else:
+            pass_yds, td, int_ = d.get("mendoza_pass_yds"), d.get("mendoza_td"), d.get("mendoza_int")
+        # Always a tuple: JSON hands back lists, and a list (even an empty one)
+        # would make the state unequal to a fresh one and unhashable.
+        return cls(
+            d["home_team"], d["away_team"],
+            d.get("home_score", 0), d.get("away_score", 0), d.get("status", "pregame"),
+            d.get("quarter"), d.get("clock"),
+            pass_yds, td, int_,
+            tuple(PlayerLine.from_dict(p) for p in d.get("players") or ()),
+        )
+
     def to_dict(self) -> dict:
-        return {
+        """The /api/state "state" object, built once per instance; callers must not mutate it."""
+        if self._dict is not None:
+            return self._dict
+        d = {
             "home_team": self.home_team,
             "away_team": self.away_team,
             "home_score": self.home_score,
@@ -31,21 +89,80 @@ class GameState:
                 "td": self.mendoza_td,
                 "int": self.mendoza_int,
             },
+            "players": [p.to_dict() for p in self.players],
+            "phase": game_phase(self),
         }
+        object.__setattr__(self, "_dict", d)
+        return d
+
+    def to_json(self) -> bytes:
+        """to_dict() encoded the way JSONResponse does, built once per instance."""
+        if self._json is None:
+            body = json.dumps(self.to_dict(), ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+            object.__setattr__(self, "_json", body.encode("utf-8"))
+        return self._json
+
+class StateChange(enum.IntFlag):
+    """Which parts of the game moved between two polls."""
+    NONE = 0
+    SCORE = 1
+    QUARTER = 2
+    CLOCK = 4
+    STATUS = 8
+    TEAMS = 16
+    PLAYER = 32
+    ALL = SCORE | QUARTER | CLOCK | STATUS | TEAMS | PLAYER
 
 # Fingerprinting detects *state transitions*, not time-based polling.
 # This mirrors edge-triggered logic in digital systems.
-def fingerprint(state: GameState) -> str:
-    payload = {
-        "home_score": state.home_score,
-        "away_score": state.away_score,
-        "status": state.status,
-        "quarter": state.quarter,
-        "clock": state.clock,
-        "mendoza": (state.mendoza_pass_yds, state.mendoza_td, state.mendoza_int),
-    }
-    b = json.dumps(payload, sort_keys=True).encode("utf-8")
-    return hashlib.sha256(b).hexdigest()
+# A plain tuple: hashable, compared field by field, no serialization or hashing.
+def fingerprint(state: GameState) -> tuple:
+    return (
+        state.home_score,
+        state.away_score,
+        state.status,
+        state.quarter,
+        state.clock,
+        state.mendoza_pass_yds,
+        state.mendoza_td,
+        state.mendoza_int,
+        state.players,
+    )
+
+# Field-level diff so each downstream stage runs only when its inputs moved.
+# Compares attributes directly (no intermediate objects); an idle game costs
+# a handful of equality checks per poll. The bits are the StateChange members'
+# int values, taken once here: OR-ing the members themselves goes through the
+# enum machinery and costs several times the comparisons.
+_SCORE, _QUARTER, _CLOCK, _STATUS, _TEAMS, _PLAYER = (
+    int(flag) for flag in (
+        StateChange.SCORE, StateChange.QUARTER, StateChange.CLOCK,
+        StateChange.STATUS, StateChange.TEAMS, StateChange.PLAYER,
+    )
+)
+
+def diff_states(prev: GameState | None, cur: GameState) -> StateChange:
+    if prev is None:
+        return StateChange.ALL
+    bits = 0
+    if prev.home_score != cur.home_score or prev.away_score != cur.away_score:
+        bits |= _SCORE
+    if prev.quarter != cur.quarter:
+        bits |= _QUARTER
+    if prev.clock != cur.clock:
+        bits |= _CLOCK
+    if prev.status != cur.status:
+        bits |= _STATUS
+    if prev.home_team != cur.home_team or prev.away_team != cur.away_team:
+        bits |= _TEAMS
+    if (
+        prev.mendoza_pass_yds != cur.mendoza_pass_yds
+        or prev.mendoza_td != cur.mendoza_td
+        or prev.mendoza_int != cur.mendoza_int
+        or prev.players != cur.players
+    ):
+        bits |= _PLAYER
+    return StateChange(bits) if bits else StateChange.NONE
 
 # Explainable heuristic model (not ML):
 # deterministic, bounded, debuggable.
@@ -58,17 +175,27 @@ def compute_win_prob_simple(state: GameState) -> float:
     p = 1 / (1 + math.exp(-x))
     return float(max(0.01, min(0.99, p)))
 
-def kickoff_countdown(kickoff_iso: str) -> dict:
-    kickoff = datetime.fromisoformat(kickoff_iso)
-    now = datetime.now(tz=kickoff.tzinfo or timezone.utc)
-    diff = kickoff - now
-    seconds = max(0, int(diff.total_seconds()))
-    return {
-        "h": seconds // 3600,
-        "m": (seconds % 3600) // 60,
-        "s": seconds % 60,
-        "seconds": seconds,
-    }
+QUARTER_SECONDS = 15 * 60
+
+@functools.lru_cache(maxsize=4096)   # a period has at most ~900 distinct clocks
+def clock_seconds(clock: str | None) -> int | None:
+    """Seconds left in the period from ESPN's displayClock ("6:55", "0:42", "12")."""
+    if not clock:
+        return None
+    try:
+        mins, _, secs = clock.strip().rpartition(":")
+        return int(mins or 0) * 60 + int(float(secs))
+    except ValueError:
+        return None
+
+def game_elapsed_seconds(quarter: int | None, clock: str | None) -> int:
+    """Game time played so far; overtime periods keep counting past 60:00."""
+    if not quarter or quarter < 1:
+        return 0
+    left = clock_seconds(clock)
+    if left is None:
+        left = QUARTER_SECONDS
+    return (quarter - 1) * QUARTER_SECONDS + QUARTER_SECONDS - min(left, QUARTER_SECONDS)
 
 # Explicit finite-state-machine label
 def game_phase(state: GameState) -> str:
@@ -0,0 +1,97 @@
+from __future__ import annotations
+import gzip
+import hashlib
+from typing import Callable
+
+from fastapi import Request
+from fastapi.responses import Response
+
+# Optional: brotli is only used when installed (pip install brotli).
+try:
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None
+
+# Encoded-response cache. A resource is re-encoded only when its version moves;
+# compressed variants are built lazily, once per version, and every request in
+# between is a dict lookup plus a socket write. The ETag is a content hash, so
+# it stays valid across restarts and across worker processes; each encoding
+# gets its own strong ETag ("<hash>-gzip"), since the bytes differ.
+
+class ResponseCache:
+    def __init__(self, media_type: str = "application/json"):
+        self.media_type = media_type
+        self.version: int | None = None
+        self.etag: str | None = None
+        self._variants: dict[str, bytes] = {}
+
+    def body(self, version: int, build: Callable[[], bytes], encoding: str = "identity") -> bytes:
+        if version != self.version:
+            raw = build()
+            self.version = version
+            self.etag = '"' + hashlib.blake2b(raw, digest_size=8).hexdigest() + '"'
+            self._variants = {"identity": raw}
+        data = self._variants.get(encoding)
+        if data is None:
+            data = self._variants[encoding] = _compress(self._variants["identity"], encoding)
+        return data
+
+    def etag_for(self, encoding: str) -> str:
+        return self.etag if encoding == "identity" else self.etag[:-1] + "-" + encoding + '"'
+
+
+def _compress(raw: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(raw, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(raw, compresslevel=6, mtime=0)
+    return raw
+
+
+def pick_encoding(accept_encoding: str | None) -> str:
+    offered = set()
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        offered.add(token.strip().lower())
+    if brotli is not None and "br" in offered:
+        return "br"
+    if "gzip" in offered:
+        return "gzip"
+    return "identity"
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag or tag == "*":
+            return True
+    return False
+
+
+def cached_response(
+    request: Request,
+    cache: ResponseCache,
+    version: int,
+    build: Callable[[], bytes],
+    cache_control: str = "no-cache",
+) -> Response:
+    """Serve `cache` at `version`, answering 304 when the client's ETag is current."""
+    encoding = pick_encoding(request.headers.get("accept-encoding"))
+    data = cache.body(version, build, encoding)
+    etag = cache.etag_for(encoding)
+    headers = {
+        "ETag": etag,
+        "Vary": "Accept-Encoding",
+        "Cache-Control": cache_control,
+    }
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=data, media_type=cache.media_type, headers=headers)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+import dataclasses
+import json
+import mmap
+import os
+import re
+import struct
+import time
+from pathlib import Path
+from typing import Any
+
+from app.game_logic import GameState, game_elapsed_seconds
+
+# Append-only per-game journal of GameState transitions.
+#
+#   runtime/journal/<game>.jsonl   one compact JSON line per transition
+#   runtime/journal/<game>.idx     fixed 24-byte records: seq, game seconds, offset, length
+#
+# Records are fixed-size and seqs are consecutive, so entry N is one multiply
+# away in the mmap'd index; a game-clock lookup ("Q3 06:55") is a binary
+# search over the same records. The index stores the running max of game
+# seconds (the JSON line keeps the real value), so a stray out-of-order clock
+# from upstream cannot break that search. Neither touches the data file until the
+# matching line is sliced out. Appends are a buffered write + flush (no fsync)
+# so the poll path never waits on the disk.
+
+JOURNAL_DIR = Path("runtime") / "journal"
+
+INDEX_RECORD = "<QiQI"   # seq u64, max elapsed game seconds so far i32, data offset u64, line length u32
+_REC = struct.Struct(INDEX_RECORD)
+
+_AT_RE = re.compile(r"^\s*(?:Q|OT)?\s*(\d+)\s+(\d{1,2}:\d{2})\s*$", re.IGNORECASE)
+
+
+def parse_game_time(text: str) -> int | None:
+    """"Q3 06:55" -> elapsed game seconds; None if it does not parse."""
+    m = _AT_RE.match(text or "")
+    if not m:
+        return None
+    return game_elapsed_seconds(int(m.group(1)), m.group(2))
+
+
+def _safe_name(game_id: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]", "_", game_id) or "default"
+
+
+class JournalWriter:
+    def __init__(self, data_path: Path, index_path: Path):
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        self._size, self.next_seq, self._max_elapsed = self._recover(data_path, index_path)
+        self._data = open(data_path, "ab")
+        self._index = open(index_path, "ab")
+
+    @staticmethod
+    def _recover(data_path: Path, index_path: Path) -> tuple[int, int, int]:
+        """Drop a torn tail (partial index record or unindexed line) left by a crash.
+
+        Returns (data size, next seq, indexed elapsed of the last entry).
+        """
+        data_size = data_path.stat().st_size if data_path.exists() else 0
+        index_size = index_path.stat().st_size if index_path.exists() else 0
+        n = index_size // _REC.size
+        last_seq, end, max_elapsed = 0, 0, 0
+        if n:
+            with open(index_path, "rb") as f:
+                while n:
+                    f.seek((n - 1) * _REC.size)
+                    seq, elapsed, offset, length = _REC.unpack(f.read(_REC.size))
+                    if offset + length <= data_size:
+                        last_seq, end, max_elapsed = seq, offset + length, elapsed
+                        break
+                    n -= 1
+        if index_path.exists() and index_size != n * _REC.size:
+            os.truncate(index_path, n * _REC.size)
+        if data_path.exists() and data_size != end:
+            os.truncate(data_path, end)
+        return end, last_seq + 1, max_elapsed
+
+    def append(self, state: GameState, ts: float | None = None) -> int:
+        seq = self.next_seq
+        elapsed = game_elapsed_seconds(state.quarter, state.clock)
+        line = json.dumps(
+            {"seq": seq, "ts": time.time() if ts is None else ts, "elapsed": elapsed,
+             "state": dataclasses.asdict(state)},
+            ensure_ascii=False, separators=(",", ":"),
+        ).encode("utf-8") + b"\n"
+        self._data.write(line)
+        self._data.flush()
+        self._max_elapsed = max(self._max_elapsed, elapsed)
+        self._index.write(_REC.pack(seq, self._max_elapsed, self._size, len(line)))
+        self._index.flush()
+        self._size += len(line)
+        self.next_seq = seq + 1
+        return seq
+
+    def close(self) -> None:
+        self._data.close()
+        self._index.close()
+
+
+class JournalReader:
+    """mmap-backed random access into one game's journal."""
+
+    def __init__(self, data_path: Path, index_path: Path):
+        self._files = []
+        self._data = self._map(data_path)
+        self._index = self._map(index_path)
+        self._n = len(self._index) // _REC.size if self._index is not None else 0
+        self._first_seq = self._record(0)[0] if self._n else 1
+
+    def _map(self, path: Path) -> mmap.mmap | None:
+        if not path.exists() or path.stat().st_size == 0:
+            return None
+        f = open(path, "rb")
+        self._files.append(f)
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _record(self, i: int) -> tuple[int, int, int, int]:
+        return _REC.unpack_from(self._index, i * _REC.size)
+
+    def entry(self, i: int) -> dict[str, Any]:
+        _, _, offset, length = self._record(i)
+        return json.loads(self._data[offset:offset + length])
+
+    def position_of_seq(self, seq: int) -> int | None:
+        i = seq - self._first_seq
+        return i if 0 <= i < self._n else None
+
+    def position_at(self, elapsed: int) -> int:
+        """First entry at or after `elapsed` game seconds (binary search over the running max)."""
+        lo, hi = 0, self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(mid)[1] < elapsed:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def entries(self, start: int, limit: int) -> list[dict[str, Any]]:
+        return [self.entry(i) for i in range(max(0, start), min(self._n, start + limit))]
+
+    def close(self) -> None:
+        for m in (self._data, self._index):
+            if m is not None:
+                m.close()
+        for f in self._files:
+            f.close()
+
+    def __enter__(self) -> "JournalReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Journal:
+    """Per-game journals under one directory; writers stay open while tracked."""
+
+    def __init__(self, root: Path = JOURNAL_DIR):
+        self.root = root
+        self._writers: dict[str, JournalWriter] = {}
+
+    def paths(self, game_id: str) -> tuple[Path, Path]:
+        name = _safe_name(game_id)
+        return self.root / f"{name}.jsonl", self.root / f"{name}.idx"
+
+    def append(self, game_id: str, state: GameState, ts: float | None = None) -> int:
+        writer = self._writers.get(game_id)
+        if writer is None:
+            writer = self._writers[game_id] = JournalWriter(*self.paths(game_id))
+        return writer.append(state, ts)
+
+    def reader(self, game_id: str) -> JournalReader:
+        return JournalReader(*self.paths(game_id))
+
+    def close(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+
+JOURNAL = Journal()
@@ -0,0 +1,239 @@
+from __future__ import annotations
+import asyncio
+import json
+from collections import OrderedDict
+from typing import Any, Hashable
+
+import httpx
+
+from app.config import settings
+
+# Optional LLM-written panel lines (OPENAI_API_KEY set, LLM_COMMENTARY=1).
+#
+# Any OpenAI-compatible /chat/completions endpoint works (OPENAI_BASE_URL;
+# loadtest/openai_standin.py for local runs). The rule-based text is always
+# computed first and is what the caller gets whenever the model is slower than
+# LLM_BUDGET_S or fails, so an upstream stall costs a poll at most the budget.
+#
+#   - one pooled httpx client and one semaphore (LLM_MAX_CONCURRENCY) per process
+#   - LRU cache keyed by (prompt version, kind, teams, state fingerprint)
+#   - requests arriving within LLM_BATCH_WINDOW_S (all games of one poll) are
+#     sent as a single numbered prompt that asks for a JSON array back
+#   - a request that misses the budget keeps running (shielded) and fills the
+#     cache, so the next identical state gets the model's line
+
+PROMPT_VERSION = "v1"
+
+SYSTEM_PROMPT = (
+    "You are a college football TV analyst. For each numbered item write one "
+    "punchy sentence (max 25 words) of the requested kind: 'commentary' is live "
+    "game commentary, 'player' is a note on the tracked quarterback's line, "
+    "'winprob' explains the home win probability. Use only the facts given. "
+    "Reply with a JSON array of strings, one per item, in order, and nothing else."
+)
+
+
+def _describe(kind: str, state: dict[str, Any], extra: str = "") -> str:
+    q = state.get("quarter")
+    when = f"Q{q} {state.get('clock') or ''}".strip() if q else state.get("status", "pregame")
+    line = (
+        f"[{kind}] {state.get('away_team')} {state.get('away_score', 0)} at "
+        f"{state.get('home_team')} {state.get('home_score', 0)}, {when}, status {state.get('status')}"
+    )
+    m = state.get("mendoza") or {}
+    if kind == "player" and m.get("pass_yds") is not None:
+        line += f"; {settings.tracked_player}: {m.get('pass_yds')} pass yds, {m.get('td')} TD, {m.get('int')} INT"
+    return line + (f"; {extra}" if extra else "")
+
+
+def _parse_lines(content: str, expected: int) -> list[str]:
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.strip("`").removeprefix("json").strip()
+    try:
+        lines = json.loads(text)
+    except ValueError:
+        lines = [text] if expected == 1 else None
+    if not isinstance(lines, list) or len(lines) != expected:
+        raise ValueError(f"expected a JSON array of {expected} lines")
+    return [str(line).strip() for line in lines]
+
+
+class LLMCommentary:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str | None,
+        model: str,
+        max_concurrency: int = 4,
+        budget_s: float = 1.5,
+        batch_window_s: float = 0.05,
+        max_batch: int = 16,
+        cache_size: int = 1024,
+        timeout_s: float = 20.0,
+        transport: httpx.AsyncBaseTransport | None = None,   # tests: httpx.MockTransport
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self.budget_s = budget_s
+        self.batch_window_s = batch_window_s
+        self.max_batch = max(1, max_batch)
+        self.cache_size = cache_size
+        self.timeout_s = timeout_s
+        self._transport = transport
+
+        self._client: httpx.AsyncClient | None = None
+        self._sem: asyncio.Semaphore | None = None
+        self._cache: OrderedDict[Hashable, str] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._pending: list[tuple[Hashable, str, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+        # meta / observability
+        self.requests = 0
+        self.batches = 0
+        self.cache_hits = 0
+        self.fallbacks = 0
+        self.errors = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=self.timeout_s,
+                limits=httpx.Limits(max_connections=self.max_concurrency),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # --- public ----------------------------------------------------------
+
+    async def line(self, key: Hashable, kind: str, state: dict[str, Any], fallback: str, extra: str = "") -> str:
+        """The model's line for `state`, or `fallback` if it is not back within the budget."""
+        key = (PROMPT_VERSION, kind, key)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+        fut = self._enqueue(key, _describe(kind, state, extra))
+        try:
+            return await asyncio.wait_for(asyncio.shield(fut), self.budget_s)
+        except Exception:
+            # Budget exceeded or upstream failure: the rule-based line is already in hand.
+            self.fallbacks += 1
+            return fallback
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "model": self.model,
+            "requests": self.requests,
+            "batches": self.batches,
+            "cache_hits": self.cache_hits,
+            "cached": len(self._cache),
+            "fallbacks": self.fallbacks,
+            "errors": self.errors,
+            "budget_s": self.budget_s,
+        }
+
+    # --- batching --------------------------------------------------------
+
+    def _enqueue(self, key: Hashable, prompt: str) -> asyncio.Future:
+        fut = self._inflight.get(key)
+        if fut is not None:
+            return fut
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        # Callers may have given up (budget); mark the outcome retrieved either way.
+        fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = fut
+        self._pending.append((key, prompt, fut))
+        self.requests += 1
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush_later())
+        return fut
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.sleep(self.batch_window_s)
+        finally:
+            self._flush_task = None
+        self._flush()
+
+    def _flush(self) -> None:
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: list[tuple[Hashable, str, asyncio.Future]]) -> None:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_concurrency)
+        try:
+            async with self._sem:
+                self.batches += 1
+                lines = await self._complete([prompt for _, prompt, _ in batch])
+            for (key, _, fut), line in zip(batch, lines):
+                self._remember(key, line)
+                if not fut.done():
+                    fut.set_result(line)
+        except Exception as e:
+            self.errors += 1
+            print(f"LLM commentary request failed: {e!r}")
+            for _, _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+        finally:
+            for key, _, _ in batch:
+                self._inflight.pop(key, None)
+
+    async def _complete(self, prompts: list[str]) -> list[str]:
+        numbered = "\n".join(f"{i}. {p}" for i, p in enumerate(prompts, 1))
+        resp = await self._get_client().post("/chat/completions", json={
+            "model": self.model,
+            "temperature": 0.7,
+            "max_tokens": 60 * len(prompts),
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": numbered},
+            ],
+        })
+        resp.raise_for_status()
+        content = resp.json()["choices"][0]["message"]["content"]
+        return _parse_lines(content, len(prompts))
+
+    def _remember(self, key: Hashable, line: str) -> None:
+        self._cache[key] = line
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+LLM: LLMCommentary | None = (
+    LLMCommentary(
+        settings.openai_base_url,
+        settings.openai_api_key,
+        settings.openai_model,
+        max_concurrency=settings.llm_max_concurrency,
+        budget_s=settings.llm_budget_s,
+        batch_window_s=settings.llm_batch_window_s,
+    )
+    if settings.llm_enabled
+    else None
+)
@@ -1,51 +1,113 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, Request, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
-from fastapi.staticfiles import StaticFiles
 
 from app.config import settings
-from app.data_sources import fetch_state, demo_get_index, demo_set_index
+from app.data_sources import (
+    fetch_state,
+    demo_feed,
+    demo_get_index,
+    demo_set_index,
+    get_client,
+    close_client,
+    UPSTREAM,
+    UpstreamError,
+)
 from app.game_logic import (
+    StateChange,
+    diff_states,
     fingerprint,
-    kickoff_countdown,
-    compute_win_prob_simple,
-    game_phase,
+    game_elapsed_seconds,
 )
-from app.store import STORE
+from app.store import STORE, STORES, MemoryStore
 from app.ai_engine import (
-    ai_live_commentary,
-    ai_mendoza_watch,
-    ai_winprob_explain,
+    live_commentary,
+    mendoza_watch,
+    winprob_explain,
     ai_postgame_recap,
 )
-from app.persist import load_state, save_state
-from app.assets import team_logo_url, player_image_url
+from app.persist import load_state, StateWriter
+from app.assets import AssetStaticFiles, team_logo_url, player_image_url, warm_asset_cache
+from app.poller import Poller
+from app.stream import BROADCASTER, make_event
+from app.http_cache import ResponseCache, cached_response
+from app.ringbuf import RingBuffer
+from app.journal import JOURNAL, parse_game_time
+from app.winprob import compute_win_prob
+from app.llm import LLM
+from app.backend import SHARED
+from app.profiling import PROFILER, SpanMiddleware, span
+from app.metrics import (
+    REGISTRY,
+    callback,
+    POLLS_CHANGED,
+    POLLS_UNCHANGED,
+    POLLS_FAILED,
+    STAGE_COMMENTARY,
+    STAGE_DIFF,
+    STAGE_LLM,
+    STAGE_PLAYER,
+    STAGE_PUBLISH,
+    STAGE_RECAP,
+    STAGE_WINPROB,
+    STAGE_WINPROB_EXPLAIN,
+    STATE_SERIALIZE_SECONDS,
+)
 
-app = FastAPI(title="Event-Driven CFP Analysis Engine")
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled upstream client for the whole process lifetime.
+    get_client()
+    if settings.profile_enabled:
+        PROFILER.start()
+    assets_task = asyncio.create_task(_warm_assets())
+    # Leader election first: only the lease holder polls (followers restore its snapshots).
+    await SHARED.start()
+    if settings.auto_poll:
+        POLLER.start()
+    yield
+    assets_task.cancel()
+    await POLLER.stop()
+    await WRITER.flush()
+    await SHARED.stop()
+    PROFILER.stop()
+    JOURNAL.close()
+    if LLM is not None:
+        await LLM.close()
+    await close_client()
+
+
+app = FastAPI(title="Event-Driven CFP Analysis Engine", lifespan=lifespan)
+app.add_middleware(SpanMiddleware)
+app.mount("/static", AssetStaticFiles(directory="app/static"), name="static")
 templates = Jinja2Templates(directory="app/templates")
 
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
-def _norm(s: str) -> str:
-    return " ".join((s or "").strip().lower().split())
-
-def _dedupe_insert(buf: list[str], text: str, max_items: int = 50) -> None:
+async def _warm_assets() -> None:
+    # Background: pages use the remote image URLs until the local copies exist.
+    try:
+        if await warm_asset_cache():
+            for store in STORES.values():
+                store.version += 1   # re-render pages/state with the local URLs
+    except Exception as e:
+        print("asset cache warm-up failed:", e)
+
+def _dedupe_insert(buf: RingBuffer, text: str) -> None:
+    # The buffer's DedupeIndex (DEDUPE_WINDOW / DEDUPE_TTL_S) rejects repeats in O(1).
     t = (text or "").strip()
-    if not t:
-        return
-    nt = _norm(t)
-    for existing in buf[:10]:
-        if _norm(existing) == nt:
-            return
-    buf.insert(0, t)
-    del buf[max_items:]
+    if t:
+        buf.append_unique(t)
 
 
 def _asset_payload(state: dict | None) -> dict:
@@ -58,32 +120,120 @@ def _asset_payload(state: dict | None) -> dict:
         "player_img": player_image_url(settings.tracked_player),
     }
 
-def _payload() -> dict:
-    assets = _asset_payload(STORE.last_state)
+def _get_store(game_id: str) -> MemoryStore:
+    store = STORES.get(game_id)
+    if store is None:
+        raise HTTPException(status_code=404, detail=f"game {game_id!r} is not tracked")
+    return store
+
+def _require_leader() -> None:
+    """Admin writes change the leader's state; a follower's copy is overwritten by the next sync."""
+    if not SHARED.is_leader:
+        raise HTTPException(status_code=409, detail="this worker is a follower; retry so the leader handles it")
+
+PANELS = ("commentary", "mendoza_notes", "winprob_history")
+
+def _payload(store: MemoryStore = STORE, since: int | None = None) -> dict:
+    """Full snapshot, or with `since` only panel entries newer than that seq.
+
+    A delta lists in meta.reset the panels cleared after `since`; clients
+    replace those panels instead of merging.
+    """
+    assets = _asset_payload(store.last_state)
+    meta = {
+        "poll_count": store.poll_count,
+        "last_update_iso": store.last_update_iso,
+        "demo_mode": settings.demo_mode,
+        "demo_idx": demo_get_index(store.game_id) if settings.demo_mode else None,
+        "seq": store.seq.value,
+    }
+    panels = {}
+    if since is None:
+        for name in PANELS:
+            panels[name] = getattr(store, name).latest(20)
+    else:
+        meta["since"] = since
+        meta["reset"] = []
+        for name in PANELS:
+            buf = getattr(store, name)
+            if since < buf.reset_seq:
+                meta["reset"].append(name)
+                panels[name] = buf.latest(20)
+            else:
+                panels[name] = buf.since(since)
+    return {
+        "game_id": store.game_id,
+        "state": store.last_state,
+        **panels,
+        "winprob_home": store.winprob_home,
+        "postgame_recap": store.postgame_recap,
+        "meta": meta,
+        **assets,
+    }
+
+def _encode(obj: dict) -> bytes:
+    # Same encoding as JSONResponse.
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+# game_id -> encoded /api/state body for the store's current version
+_state_cache: dict[str, ResponseCache] = {}
+
+def _state_cache_for(store: MemoryStore) -> ResponseCache:
+    cache = _state_cache.get(store.game_id)
+    if cache is None:
+        cache = _state_cache[store.game_id] = ResponseCache()
+    return cache
+
+def _build_state_body(store: MemoryStore) -> bytes:
+    t = time.perf_counter()
+    with span("serialize_state"):
+        payload = _payload(store)
+        game = store.last_game
+        if game is not None and payload["state"] is game.to_dict():
+            # The game's own bytes are cached on the GameState; encode the
+            # rest and splice them in ("game_id" is the only key before it).
+            payload["state"] = None
+            body = _encode(payload).replace(b'"state":null', b'"state":' + game.to_json(), 1)
+        else:
+            body = _encode(payload)
+    STATE_SERIALIZE_SECONDS.observe(time.perf_counter() - t)
+    return body
+
+def _state_body(store: MemoryStore) -> bytes:
+    return _state_cache_for(store).body(store.version, lambda: _build_state_body(store))
+
+def _state_response(request: Request, store: MemoryStore):
+    return cached_response(
+        request,
+        _state_cache_for(store),
+        store.version,
+        lambda: _build_state_body(store),
+    )
+
+def _touch(store: MemoryStore) -> None:
+    store.version += 1
+    store.last_update_iso = _now_iso()
+
+def _publish(store: MemoryStore) -> None:
+    # Serialized once per version; /api/state and every SSE/WebSocket subscriber share it.
+    BROADCASTER.publish(store.game_id, make_event(_state_body(store).decode("utf-8")))
+
+def _snapshot() -> dict:
     return {
-        "state": STORE.last_state,
-        "commentary": STORE.commentary[:20],
-        "mendoza_notes": STORE.mendoza_notes[:20],
-        "winprob_home": STORE.winprob_home,
-        "winprob_history": STORE.winprob_history[:20],
-        "postgame_recap": STORE.postgame_recap,
         "meta": {
-            "poll_count": STORE.poll_count,
-            "last_update_iso": STORE.last_update_iso,
             "demo_mode": settings.demo_mode,
             "demo_idx": demo_get_index() if settings.demo_mode else None,
+            "demo_positions": {g: demo_get_index(g) for g in STORES} if settings.demo_mode else None,
         },
-        **assets,
+        "games": {game_id: store.snapshot() for game_id, store in STORES.items()},
     }
 
+# Write-behind: one atomic write per burst of real changes, off the event loop.
+WRITER = StateWriter(_snapshot, settings.persist_debounce_s)
+
 def _persist() -> None:
-    # Persist ONLY what we need to resume demo position.
-    save_state({
-        "meta": {
-            "demo_mode": settings.demo_mode,
-            "demo_idx": demo_get_index() if settings.demo_mode else None,
-        }
-    })
+    WRITER.mark_dirty()
+    SHARED.mark_dirty()
 
 def _hydrate_from_disk() -> None:
     saved = load_state()
@@ -92,60 +242,201 @@ def _hydrate_from_disk() -> None:
     meta = (saved.get("meta") or {})
     if settings.demo_mode and meta.get("demo_idx") is not None:
         demo_set_index(meta.get("demo_idx"))
+        for game_id, idx in (meta.get("demo_positions") or {}).items():
+            if game_id in STORES:
+                demo_set_index(idx, game_id)
 
-    # Panels regenerate fresh after restart:
-    STORE.last_fingerprint = None
-    STORE.commentary.clear()
-    STORE.mendoza_notes.clear()
-    STORE.winprob_history.clear()
-    STORE.winprob_home = None
-    STORE.postgame_recap = None
-    STORE.last_state = None
-    STORE.poll_count = 0
-    STORE.last_update_iso = None
+    # Warm start: restore panels and last state for games we still track,
+    # as long as the file came from the same mode (demo vs live).
+    if meta.get("demo_mode") != settings.demo_mode:
+        return
+    for game_id, snap in (saved.get("games") or {}).items():
+        store = STORES.get(game_id)
+        if store is not None and snap:
+            try:
+                store.restore(snap)
+            except Exception as e:
+                print(f"Could not restore game {game_id!r} from disk: {e}")
 
 _hydrate_from_disk()
 
+def _shared_extra(game_id: str) -> dict:
+    return {"demo_idx": demo_get_index(game_id)} if settings.demo_mode else {}
+
+def _apply_shared_extra(game_id: str, extra: dict) -> None:
+    if settings.demo_mode and extra.get("demo_idx") is not None:
+        demo_set_index(extra["demo_idx"], game_id)
+
+# Followers re-publish restored games to their own SSE/WebSocket subscribers.
+SHARED.attach(STORES, _publish, _shared_extra, _apply_shared_extra)
+
+
+# Caps simultaneous upstream fetches when a whole slate is tracked.
+_fetch_limit = asyncio.Semaphore(settings.max_concurrent_fetches)
+
+# Which stages care about which fields.
+COMMENTARY_INPUTS = StateChange.SCORE | StateChange.QUARTER | StateChange.STATUS | StateChange.TEAMS
+PLAYER_INPUTS = StateChange.PLAYER
+# The number moves with the clock; the history line only on the events that used to drive it.
+WINPROB_INPUTS = StateChange.SCORE | StateChange.QUARTER | StateChange.CLOCK | StateChange.STATUS | StateChange.TEAMS
+WINPROB_NARRATIVE_INPUTS = StateChange.SCORE | StateChange.QUARTER | StateChange.STATUS | StateChange.TEAMS
+
+async def _llm_lines(state_obj, state: dict, commentary: str | None, player: str | None):
+    """Swap in model-written lines; each falls back to its rule-based text after LLM_BUDGET_S."""
+    key = (state_obj.home_team, state_obj.away_team, fingerprint(state_obj))
+
+    async def line(kind: str, fallback: str | None):
+        if not fallback:
+            return fallback
+        return await LLM.line(key, kind, state, fallback)
+
+    return await asyncio.gather(line("commentary", commentary), line("player", player))
+
+async def poll_game(store: MemoryStore) -> bool:
+    """Poll one game; True when its state changed."""
+    with span("poll_game"):
+        return await _poll_game(store)
+
+async def _poll_game(store: MemoryStore) -> bool:
+    async with _fetch_limit:
+        with span("fetch"):
+            try:
+                state_obj = await fetch_state(store.game_id)
+            except UpstreamError as e:
+                # This game sits out the cycle with its last good state; the others go on.
+                POLLS_FAILED.inc()
+                print(f"Poll skipped: {e}")
+                return False
+
+    # Stage timings go to /metrics; a perf_counter() pair and one observe() each.
+    clock = time.perf_counter
+    t = clock()
+    changes = diff_states(store.last_game, state_obj)
+    STAGE_DIFF.observe(clock() - t)
+    store.poll_count += 1
+    if not changes:
+        # Same game: keep the version (and so the ETag) so clients get 304s.
+        POLLS_UNCHANGED.inc()
+        return False
+    POLLS_CHANGED.inc()
+    _touch(store)
+    store.last_game = state_obj
+    if settings.journal_enabled:
+        try:
+            with span("journal"):
+                JOURNAL.append(store.game_id, state_obj)
+        except Exception as e:
+            print("journal append failed:", e)
 
-async def poll_once() -> None:
-    state_obj = await fetch_state()
     state = state_obj.to_dict()
-    state["phase"] = game_phase(state_obj)
-    STORE.last_state = state
+    store.last_state = state
+
+    with span("commentary"):
+        commentary = player = None
+        if changes & COMMENTARY_INPUTS:
+            t = clock()
+            commentary = live_commentary(state)
+            STAGE_COMMENTARY.observe(clock() - t)
+        if changes & PLAYER_INPUTS:
+            t = clock()
+            player = mendoza_watch(state)
+            STAGE_PLAYER.observe(clock() - t)
+        if LLM is not None and (commentary or player):
+            t = clock()
+            commentary, player = await _llm_lines(state_obj, state, commentary, player)
+            STAGE_LLM.observe(clock() - t)
+        if commentary:
+            _dedupe_insert(store.commentary, commentary)
+        if player:
+            _dedupe_insert(store.mendoza_notes, player)
+
+    with span("winprob"):
+        if changes & WINPROB_INPUTS:
+            t = clock()
+            wp = compute_win_prob(state_obj)
+            store.winprob_home = wp
+            store.winprob_series.append(
+                time.time(), game_elapsed_seconds(state_obj.quarter, state_obj.clock), wp
+            )
+            STAGE_WINPROB.observe(clock() - t)
+        if changes & WINPROB_NARRATIVE_INPUTS:
+            t = clock()
+            wp = store.winprob_home
+            expl = winprob_explain(state, wp)
+            leader = state["home_team"] if wp >= 0.5 else state["away_team"]
+            pct = int(wp * 100) if wp >= 0.5 else int((1 - wp) * 100)
+            _dedupe_insert(store.winprob_history, f"{leader} {pct}% — {expl}")
+            STAGE_WINPROB_EXPLAIN.observe(clock() - t)
+
+    if state["status"] == "final" and store.postgame_recap is None:
+        t = clock()
+        with span("recap"):
+            store.postgame_recap = await ai_postgame_recap(
+                state,
+                store.winprob_history.latest(10),
+                store.mendoza_notes.latest(10),
+            )
+        STAGE_RECAP.observe(clock() - t)
+
+    t = clock()
+    with span("publish"):
+        _publish(store)
+    STAGE_PUBLISH.observe(clock() - t)
+    return True
 
-    fp = fingerprint(state_obj)
-    STORE.poll_count += 1
-    STORE.last_update_iso = _now_iso()
 
-    if STORE.last_fingerprint == fp:
-        _persist()
+async def poll_once() -> None:
+    """Poll every tracked game concurrently (bounded by MAX_CONCURRENT_FETCHES)."""
+    if not SHARED.is_leader:
+        # Another worker polls; just pick up what it published.
+        await SHARED.sync()
         return
-    STORE.last_fingerprint = fp
-
-    _dedupe_insert(STORE.commentary, await ai_live_commentary({"state": state}))
-    _dedupe_insert(STORE.mendoza_notes, await ai_mendoza_watch(state))
-
-    wp = compute_win_prob_simple(state_obj)
-    STORE.winprob_home = wp
-    expl = await ai_winprob_explain(state, wp)
-    leader = state["home_team"] if wp >= 0.5 else state["away_team"]
-    pct = int(wp * 100) if wp >= 0.5 else int((1 - wp) * 100)
-    _dedupe_insert(STORE.winprob_history, f"{leader} {pct}% — {expl}")
-
-    if state["status"] == "final" and STORE.postgame_recap is None:
-        STORE.postgame_recap = await ai_postgame_recap(
-            state,
-            STORE.winprob_history[:10],
-            STORE.mendoza_notes[:10],
+    with span("poll"):
+        results = await asyncio.gather(
+            *(poll_game(store) for store in list(STORES.values())),
+            return_exceptions=True,
         )
+    changed = False
+    for store, result in zip(list(STORES.values()), results):
+        if isinstance(result, Exception):
+            print(f"Poll failed for game {store.game_id!r}: {result}")
+        elif result:
+            changed = True
+    # Disk only hears about real state changes.
+    if changed:
+        _persist()
 
-    _persist()
 
+POLLER = Poller(poll_once, settings.poll_interval_s)
+
+
+# game_id -> rendered dashboard HTML for the store's current version
+_html_cache: dict[str, ResponseCache] = {}
+
+def _render_html(store: MemoryStore) -> bytes:
+    # Depends on store state and settings only (the countdown ticks in the browser),
+    # so one render serves every viewer until the next change.
+    assets = _asset_payload(store.last_state)
+    with span("render_html"):
+        html = templates.get_template("index.html").render(
+            game_id=store.game_id,
+            kickoff=settings.kickoff_iso,
+            state=store.last_state,
+            commentary=store.commentary.latest(20),
+            mendoza_notes=store.mendoza_notes.latest(20),
+            winprob_history=store.winprob_history.latest(20),
+            winprob_home=store.winprob_home,
+            postgame_recap=store.postgame_recap,
+            meta={"poll_count": store.poll_count, "last_update_iso": store.last_update_iso},
+            auto_poll=settings.auto_poll,
+            poll_interval_s=settings.poll_interval_s,
+            **assets,
+        )
+    return html.encode("utf-8")
 
-@app.get("/", response_class=HTMLResponse)
-async def home(request: Request):
-    if STORE.last_state is None:
-        STORE.last_state = {
+def _render_home(request: Request, store: MemoryStore):
+    if store.last_state is None:
+        store.last_state = {
             "home_team": settings.home_team,
             "away_team": settings.away_team,
             "home_score": 0,
@@ -154,66 +445,292 @@ async def home(request: Request):
             "quarter": None,
             "clock": None,
             "mendoza": {"pass_yds": None, "td": None, "int": None},
+            "players": [],
             "phase": "PREGAME",
         }
-
-    assets = _asset_payload(STORE.last_state)
-
-    return templates.TemplateResponse(
-        "index.html",
-        {
-            "request": request,
-            "kickoff": settings.kickoff_iso,
-            "countdown": kickoff_countdown(settings.kickoff_iso),
-            "state": STORE.last_state,
-            "commentary": STORE.commentary[:20],
-            "mendoza_notes": STORE.mendoza_notes[:20],
-            "winprob_history": STORE.winprob_history[:20],
-            "winprob_home": STORE.winprob_home,
-            "postgame_recap": STORE.postgame_recap,
-            "meta": {"poll_count": STORE.poll_count, "last_update_iso": STORE.last_update_iso},
-            **assets,
-        },
+        store.version += 1
+
+    cache = _html_cache.get(store.game_id)
+    if cache is None:
+        cache = _html_cache[store.game_id] = ResponseCache("text/html; charset=utf-8")
+    # Browsers revalidate every load (304 on a current ETag); a shared cache in
+    # front may serve the same copy for HTML_SHARED_MAX_AGE_S.
+    return cached_response(
+        request,
+        cache,
+        store.version,
+        lambda: _render_html(store),
+        cache_control=f"public, max-age=0, s-maxage={settings.html_shared_max_age_s}",
     )
 
 
+@app.get("/", response_class=HTMLResponse)
+async def home(request: Request):
+    return _render_home(request, STORE)
+
+
+@app.get("/game/{game_id}", response_class=HTMLResponse)
+async def home_game(request: Request, game_id: str):
+    return _render_home(request, _get_store(game_id))
+
+
 @app.post("/admin/poll")
 async def admin_poll():
-    await poll_once()
+    # Joins the in-flight poll if one is running (single-flight).
+    await POLLER.poll()
     return JSONResponse({"ok": True, **_payload()})
 
 
 @app.get("/api/state")
-async def api_state():
-    return JSONResponse(_payload())
+async def api_state(request: Request, since: int | None = None):
+    if since is not None:
+        return JSONResponse(_payload(STORE, since))
+    return _state_response(request, STORE)
+
+
+@app.get("/api/state/{game_id}")
+async def api_state_game(request: Request, game_id: str, since: int | None = None):
+    store = _get_store(game_id)
+    if since is not None:
+        return JSONResponse(_payload(store, since))
+    return _state_response(request, store)
+
+
+@app.get("/api/games")
+async def api_games():
+    games = []
+    for store in STORES.values():
+        s = store.last_state or {}
+        games.append({
+            "game_id": store.game_id,
+            "home_team": s.get("home_team"),
+            "away_team": s.get("away_team"),
+            "home_score": s.get("home_score"),
+            "away_score": s.get("away_score"),
+            "phase": s.get("phase"),
+            "last_update_iso": store.last_update_iso,
+        })
+    return JSONResponse({"games": games})
+
+
+SSE_KEEPALIVE_S = 15.0
+
+async def _sse_events(store: MemoryStore):
+    if not BROADCASTER.has_snapshot(store.game_id):
+        _publish(store)
+    q = BROADCASTER.subscribe(store.game_id)
+    try:
+        # Starlette cancels this generator when the client disconnects.
+        while True:
+            try:
+                event = await asyncio.wait_for(q.get(), timeout=SSE_KEEPALIVE_S)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            yield event.sse
+    finally:
+        BROADCASTER.unsubscribe(store.game_id, q)
+
+def _sse_response(request: Request, store: MemoryStore) -> StreamingResponse:
+    return StreamingResponse(
+        _sse_events(store),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/stream")
+async def api_stream(request: Request):
+    return _sse_response(request, STORE)
+
+
+@app.get("/api/stream/{game_id}")
+async def api_stream_game(request: Request, game_id: str):
+    return _sse_response(request, _get_store(game_id))
+
+
+@app.websocket("/ws")
+@app.websocket("/ws/{game_id}")
+async def ws_stream(websocket: WebSocket, game_id: str | None = None):
+    store = STORE if game_id is None else STORES.get(game_id)
+    if store is None:
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    if not BROADCASTER.has_snapshot(store.game_id):
+        _publish(store)
+    q = BROADCASTER.subscribe(store.game_id)
+
+    async def pump() -> None:
+        while True:
+            event = await q.get()
+            await websocket.send_text(event.json)
+
+    sender = asyncio.create_task(pump())
+    try:
+        # Reading is how we notice the client went away; whatever the client
+        # sends (text or binary) is ignored.
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    except WebSocketDisconnect:
+        pass
+    finally:
+        BROADCASTER.unsubscribe(store.game_id, q)
+        sender.cancel()
+        # Collects the pump's CancelledError, or the send error it died of.
+        await asyncio.gather(sender, return_exceptions=True)
 
 
 @app.post("/admin/clear/{panel}")
-async def clear_panel(panel: str):
+async def clear_panel(panel: str, game_id: str | None = None):
+    store = STORE if game_id is None else _get_store(game_id)
+    _require_leader()
     panel = panel.lower()
     if panel == "commentary":
-        STORE.commentary.clear()
+        store.commentary.clear()
     elif panel == "mendoza":
-        STORE.mendoza_notes.clear()
+        store.mendoza_notes.clear()
     elif panel == "winprob":
-        STORE.winprob_history.clear()
-        STORE.winprob_home = None
+        store.winprob_history.clear()
+        store.winprob_home = None
+        store.winprob_series.clear()
     elif panel == "recap":
-        STORE.postgame_recap = None
+        store.postgame_recap = None
     elif panel == "all":
-        STORE.commentary.clear()
-        STORE.mendoza_notes.clear()
-        STORE.winprob_history.clear()
-        STORE.winprob_home = None
-        STORE.postgame_recap = None
+        store.commentary.clear()
+        store.mendoza_notes.clear()
+        store.winprob_history.clear()
+        store.winprob_home = None
+        store.winprob_series.clear()
+        store.postgame_recap = None
     else:
         raise HTTPException(status_code=400, detail="panel must be one of: commentary, mendoza, winprob, recap, all")
 
-    STORE.last_update_iso = _now_iso()
+    _touch(store)
     _persist()
-    return JSONResponse({"ok": True, **_payload()})
+    _publish(store)
+    return JSONResponse({"ok": True, **_payload(store)})
+
+
+def _series_response(store: MemoryStore, points: int) -> JSONResponse:
+    points = max(3, min(points, 2000))
+    series = store.winprob_series
+    return JSONResponse({
+        "game_id": store.game_id,
+        "count": len(series),
+        "fields": ["ts", "game_s", "home"],
+        "points": [[round(t, 1), int(g), round(p, 4)] for t, g, p in series.downsample(points)],
+    })
+
+
+@app.get("/api/winprob/series")
+async def api_winprob_series(points: int = 200):
+    """P(home) over game time, LTTB-downsampled to at most `points` samples."""
+    return _series_response(STORE, points)
+
+
+@app.get("/api/winprob/series/{game_id}")
+async def api_winprob_series_game(game_id: str, points: int = 200):
+    return _series_response(_get_store(game_id), points)
+
+
+@app.get("/api/journal/{game_id}")
+async def api_journal(game_id: str, seq: int | None = None, at: str | None = None, limit: int = 20):
+    """Journal entries from `seq` (1-based) or from game time `at` ("Q3 06:55")."""
+    _get_store(game_id)
+    limit = max(1, min(limit, 500))
+    with JOURNAL.reader(game_id) as reader:
+        if at is not None:
+            elapsed = parse_game_time(at)
+            if elapsed is None:
+                raise HTTPException(status_code=400, detail="at must look like 'Q3 06:55'")
+            start = reader.position_at(elapsed)
+        elif seq is not None:
+            start = reader.position_of_seq(seq)
+            if start is None:
+                raise HTTPException(status_code=404, detail=f"no journal entry {seq}")
+        else:
+            start = max(0, len(reader) - limit)
+        return JSONResponse({
+            "game_id": game_id,
+            "count": len(reader),
+            "entries": reader.entries(start, limit),
+        })
+
+
+@app.get("/admin/profile")
+async def admin_profile_status():
+    return JSONResponse(PROFILER.to_dict())
+
+
+@app.post("/admin/profile")
+async def admin_profile(enabled: bool, hz: float | None = None):
+    """Start sampling + span timing, or stop and write runtime/profile/<stamp>.*"""
+    if enabled:
+        PROFILER.start(hz)
+        return JSONResponse({"ok": True, **PROFILER.to_dict()})
+    files = await asyncio.to_thread(PROFILER.stop)
+    return JSONResponse({"ok": True, "files": files, **PROFILER.to_dict()})
+
+
+@app.post("/admin/profile/dump")
+async def admin_profile_dump():
+    """Write what has been collected so far without stopping."""
+    files = await asyncio.to_thread(PROFILER.dump)
+    return JSONResponse({"ok": True, "files": files})
+
+
+@app.post("/admin/replay/{game_id}")
+async def admin_replay(game_id: str, index: int | None = None, at: str | None = None, speed: float | None = None):
+    """Reposition a demo replay: by event `index`, by game time `at` ("Q3 06:55"), and/or `speed`."""
+    _get_store(game_id)
+    if not settings.demo_mode:
+        raise HTTPException(status_code=400, detail="replay control needs DEMO_MODE=1")
+    _require_leader()
+    session = demo_feed(game_id).session
+    if speed is not None:
+        session.set_speed(speed)
+    if at is not None:
+        if session.seek_clock(at) is None:
+            raise HTTPException(status_code=400, detail="at must look like 'Q3 06:55'")
+    elif index is not None:
+        session.seek(index)
+    _persist()
+    return JSONResponse({"ok": True, "game_id": game_id, **session.to_dict()})
+
+
+# Counters owned by other components, read at scrape time.
+callback("cfp_upstream_requests_total", "ESPN summary requests", lambda: UPSTREAM.requests, "counter")
+callback("cfp_upstream_not_modified_total", "ESPN summary requests answered 304", lambda: UPSTREAM.not_modified, "counter")
+callback("cfp_upstream_errors_total", "ESPN summary requests that failed", lambda: UPSTREAM.errors, "counter")
+callback("cfp_upstream_bytes_total", "ESPN summary bytes received", lambda: UPSTREAM.bytes_received, "counter")
+callback("cfp_stream_clients", "Connected SSE/WebSocket clients", lambda: BROADCASTER.clients)
+callback("cfp_stream_dropped_total", "Events dropped for slow stream clients", lambda: BROADCASTER.dropped, "counter")
+callback("cfp_poller_runs_total", "Poll rounds run", lambda: POLLER.runs, "counter")
+callback("cfp_leader", "1 when this worker holds the polling lease", lambda: int(SHARED.is_leader))
+
+
+@app.get("/metrics")
+async def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/api/upstream")
+async def api_upstream():
+    return JSONResponse({
+        **UPSTREAM.to_dict(),
+        "poller": POLLER.to_dict(),
+        "stream": BROADCASTER.to_dict(),
+        "shared": SHARED.to_dict(),
+        "llm": LLM.to_dict() if LLM is not None else None,
+    })
 
 
 @app.get("/api/settings")
 async def api_settings():
-    return JSONResponse({"demo_mode": settings.demo_mode})
+    return JSONResponse({
+        "demo_mode": settings.demo_mode,
+        "auto_poll": settings.auto_poll,
+        "poll_interval_s": settings.poll_interval_s,
+        "game_ids": list(STORES),
+    })
@@ -0,0 +1,206 @@
+from __future__ import annotations
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+# Prometheus metrics without the client library: counters, histograms and
+# callback-backed values, rendered in the text exposition format at /metrics.
+#
+# Recording is built for the poll path: a histogram observation is one bisect
+# over a tuple of bounds, two adds and no locks (everything runs on the event
+# loop; persistence observes from one writer thread at a time). Label values
+# are resolved once, e.g. POLL_STAGE_SECONDS.labels("parse") at import, so
+# the hot path never builds label tuples. Metrics are per process; with
+# several workers each one reports its own.
+
+# Seconds: 10us .. 10s, so both in-process stages and upstream calls resolve.
+TIME_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _fmt(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _label_str(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        values = tuple(str(v) for v in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}")
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help, labelnames)
+        if not self.labelnames:
+            self._children[()] = _CounterChild()
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+    def _samples(self) -> Iterable[str]:
+        for values, child in self._children.items():
+            yield f"{self.name}{_label_str(self.labelnames, values)} {_fmt(child.value)}"
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = TIME_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        if not self.labelnames:
+            self._children[()] = _HistogramChild(self.buckets)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._children[()].observe(value)
+
+    def _samples(self) -> Iterable[str]:
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += n
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{_fmt(bound)}"'
+                yield f"{self.name}_bucket{_label_str(self.labelnames, values, le)} {cumulative}"
+            labels = _label_str(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_fmt(child.sum)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Callback(_Metric):
+    """A value owned elsewhere (UpstreamStats, Broadcaster), read at scrape time."""
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float], kind: str = "gauge"):
+        super().__init__(name, help)
+        self.kind = kind
+        self._fn = fn
+
+    def _samples(self) -> Iterable[str]:
+        yield f"{self.name} {_fmt(self._fn())}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+def counter(name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, help, labelnames))
+
+def histogram(name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = TIME_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, help, labelnames, buckets))
+
+def callback(name: str, help: str, fn: Callable[[], float], kind: str = "gauge") -> Callback:
+    return REGISTRY.register(Callback(name, help, fn, kind))
+
+
+# --- application metrics ------------------------------------------------------
+
+UPSTREAM_FETCH_SECONDS = histogram(
+    "cfp_upstream_fetch_seconds", "ESPN summary request time, including body decode"
+)
+UPSTREAM_RESPONSE_BYTES = histogram(
+    "cfp_upstream_response_bytes", "ESPN summary bytes on the wire (304s included)", buckets=BYTE_BUCKETS
+)
+POLL_STAGE_SECONDS = histogram(
+    "cfp_poll_stage_seconds", "Time per poll pipeline stage", ("stage",)
+)
+STAGE_PARSE = POLL_STAGE_SECONDS.labels("parse")
+STAGE_DIFF = POLL_STAGE_SECONDS.labels("diff")
+STAGE_COMMENTARY = POLL_STAGE_SECONDS.labels("commentary")
+STAGE_PLAYER = POLL_STAGE_SECONDS.labels("player")
+STAGE_LLM = POLL_STAGE_SECONDS.labels("llm")
+STAGE_WINPROB = POLL_STAGE_SECONDS.labels("winprob")
+STAGE_WINPROB_EXPLAIN = POLL_STAGE_SECONDS.labels("winprob_explain")
+STAGE_RECAP = POLL_STAGE_SECONDS.labels("recap")
+STAGE_PUBLISH = POLL_STAGE_SECONDS.labels("publish")
+
+PERSIST_SECONDS = histogram("cfp_persist_seconds", "runtime/state.json snapshot write (encode + fsync + rename)")
+STATE_SERIALIZE_SECONDS = histogram(
+    "cfp_state_serialize_seconds", "/api/state body build (once per store version)"
+)
+
+POLLS = counter("cfp_polls_total", "Game polls by outcome", ("result",))
+POLLS_CHANGED = POLLS.labels("changed")
+POLLS_UNCHANGED = POLLS.labels("unchanged")
+POLLS_FAILED = POLLS.labels("failed")
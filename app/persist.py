@@ -1,7 +1,13 @@
 from __future__ import annotations
+import asyncio
 import json
+import os
+import tempfile
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+
+from app.metrics import PERSIST_SECONDS
 
 RUNTIME_DIR = Path("runtime")
 STATE_PATH = RUNTIME_DIR / "state.json"
@@ -15,9 +21,105 @@ def load_state() -> dict[str, Any] | None:
         return None
 
 def save_state(payload: dict[str, Any]) -> None:
+    # Atomic: write a temp file next to the target, fsync, then rename over it.
+    # A crash leaves either the old file or the new one, never a torn mix.
+    t0 = time.perf_counter()
     try:
         RUNTIME_DIR.mkdir(parents=True, exist_ok=True)
-        STATE_PATH.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        fd, tmp = tempfile.mkstemp(dir=RUNTIME_DIR, prefix=".state-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp, 0o644)  # mkstemp creates 0600
+            os.replace(tmp, STATE_PATH)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        PERSIST_SECONDS.observe(time.perf_counter() - t0)
     except Exception:
         # Persistence is best-effort; never crash the app.
         pass
+
+
+class StateWriter:
+    """Write-behind persistence: a dirty flag plus a debounce.
+
+    mark_dirty() is cheap and may be called on every change; a burst of
+    changes inside `debounce_s` becomes one write. The snapshot is taken on
+    the event loop (consistent view), encoding and disk I/O run in a thread.
+    Writes land in snapshot order: each starts after the previous one has
+    finished, even when the task that started it was cancelled.
+    """
+
+    def __init__(self, snapshot: Callable[[], dict[str, Any]], debounce_s: float = 1.0):
+        self._snapshot = snapshot
+        self.debounce_s = debounce_s
+        self._dirty = False
+        self._task: asyncio.Task | None = None
+        self._lock: asyncio.Lock | None = None
+        self._inflight: asyncio.Future | None = None
+
+        # meta / observability
+        self.writes = 0
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+        if self._task is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop (scripts, shutdown): write now.
+            self._write_now()
+            return
+        self._task = loop.create_task(self._flush_later())
+
+    def _write_now(self) -> None:
+        self._dirty = False
+        save_state(self._snapshot())
+        self.writes += 1
+
+    async def _save(self, payload: dict[str, Any]) -> None:
+        # Cancelling the caller cannot stop a thread, so the write is shielded
+        # and the next one waits for it instead of racing it to the rename.
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            prev = self._inflight
+            if prev is not None and not prev.done():
+                await asyncio.shield(prev)
+            write = self._inflight = asyncio.ensure_future(asyncio.to_thread(save_state, payload))
+            write.add_done_callback(self._count_write)
+            await asyncio.shield(write)
+
+    def _count_write(self, write: asyncio.Future) -> None:
+        if not write.cancelled() and write.exception() is None:
+            self.writes += 1
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.sleep(self.debounce_s)
+            while self._dirty:
+                self._dirty = False
+                await self._save(self._snapshot())
+        finally:
+            self._task = None
+
+    async def flush(self) -> None:
+        """Write any pending change immediately (call on shutdown)."""
+        task = self._task
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._dirty:
+            payload = self._snapshot()
+            self._dirty = False
+            await self._save(payload)
+        elif self._inflight is not None and not self._inflight.done():
+            await asyncio.shield(self._inflight)
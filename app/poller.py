@@ -0,0 +1,70 @@
+from __future__ import annotations
+import asyncio
+from typing import Awaitable, Callable
+
+# Single-flight poller: the server drives upstream fetches on a fixed cadence,
+# and any manual poll that arrives mid-fetch joins the running one instead of
+# starting another. Upstream load no longer scales with open browser tabs.
+
+class Poller:
+    def __init__(self, poll_fn: Callable[[], Awaitable[None]], interval: float):
+        self._poll_fn = poll_fn
+        self.interval = interval
+        self._inflight: asyncio.Task | None = None
+        self._task: asyncio.Task | None = None
+
+        # meta / observability
+        self.runs = 0
+        self.coalesced = 0
+
+    async def poll(self) -> None:
+        """Run one poll, or wait for the one already in flight."""
+        if self._inflight is None:
+            self._inflight = asyncio.create_task(self._run())
+        else:
+            self.coalesced += 1
+        # shield: a cancelled caller must not cancel the shared fetch
+        await asyncio.shield(self._inflight)
+
+    async def _run(self) -> None:
+        try:
+            self.runs += 1
+            await self._poll_fn()
+        finally:
+            self._inflight = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Background poll failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._inflight is not None:
+            try:
+                await self._inflight
+            except Exception:
+                pass
+
+    def to_dict(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "interval_s": self.interval,
+            "runs": self.runs,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,231 @@
+from __future__ import annotations
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from app.config import settings
+
+# Opt-in profiling, toggled at runtime (POST /admin/profile) or with PROFILE=1.
+#
+# Spans: `with span("parse"):` records wall time per span path
+# ("poll;poll_game;fetch;decode"). The path lives in a ContextVar, so
+# concurrent games and requests each nest correctly across awaits. While
+# profiling is off, span() hands back one shared no-op object: a global check
+# and an empty with-block, cheap enough to leave in the poll path.
+#
+# Sampler: a daemon thread reads sys._current_frames() PROFILE_HZ times a
+# second and counts each thread's stack. Nothing runs on the sampled threads,
+# so the cost is one stack walk per thread per tick, independent of how busy
+# the event loop is.
+#
+# Dumps go to runtime/profile/: <stamp>.collapsed ("thread;outer;...;inner N"
+# lines for flamegraph.pl / speedscope) and <stamp>.spans.json.
+
+PROFILE_DIR = Path("runtime/profile")
+MAX_DEPTH = 64
+
+_path: ContextVar[str] = ContextVar("profile_span", default="")
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("name", "path", "_token", "_t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        parent = _path.get()
+        self.path = f"{parent};{self.name}" if parent else self.name
+        self._token = _path.set(self.path)
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        PROFILER.record(self.path, time.perf_counter() - self._t0)
+        _path.reset(self._token)
+        return False
+
+
+def span(name: str):
+    """Time a block under the current span path (no-op while profiling is off)."""
+    if not PROFILER.enabled:
+        return _NO_SPAN
+    return _Span(name)
+
+
+class Sampler:
+    """Collapsed-stack counts from periodic sys._current_frames() snapshots."""
+
+    def __init__(self, hz: float):
+        self.interval = 1.0 / max(0.1, hz)
+        self.counts: Counter[str] = Counter()
+        self.samples = 0
+        self._labels: dict[Any, str] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            try:
+                filename = os.path.relpath(filename)
+                if filename.startswith(".."):
+                    filename = os.path.basename(code.co_filename)
+            except ValueError:
+                filename = os.path.basename(filename)
+            label = self._labels[code] = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+        return label
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        names: dict[int, str] = {}
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            if len(names) != len(frames):
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_DEPTH:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                stack.reverse()
+                self.counts[";".join(stack)] += 1
+            self.samples += 1
+
+
+class Profiler:
+    def __init__(self, out_dir: Path = PROFILE_DIR, hz: float = 25.0):
+        self.out_dir = out_dir
+        self.hz = hz
+        self.enabled = False
+        self.started_at: float | None = None
+        # span path -> [count, total seconds, max seconds]
+        self.spans: dict[str, list] = {}
+        self._sampler: Sampler | None = None
+
+    def start(self, hz: float | None = None) -> None:
+        if self.enabled:
+            return
+        if hz:
+            self.hz = hz
+        self.spans = {}
+        self.started_at = time.time()
+        self._sampler = Sampler(self.hz)
+        self._sampler.start()
+        self.enabled = True
+
+    def stop(self) -> dict[str, str]:
+        """Stop sampling and write the results; returns the files written."""
+        if not self.enabled:
+            return {}
+        self.enabled = False
+        if self._sampler is not None:
+            self._sampler.stop()
+        return self.dump()
+
+    def record(self, path: str, seconds: float) -> None:
+        stat = self.spans.get(path)
+        if stat is None:
+            self.spans[path] = [1, seconds, seconds]
+        else:
+            stat[0] += 1
+            stat[1] += seconds
+            if seconds > stat[2]:
+                stat[2] = seconds
+
+    def span_table(self) -> list[dict[str, Any]]:
+        rows = [
+            {"span": path, "count": n, "total_ms": total * 1000, "mean_us": total / n * 1e6, "max_ms": peak * 1000}
+            for path, (n, total, peak) in self.spans.items()
+        ]
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return rows
+
+    def dump(self) -> dict[str, str]:
+        """Write collapsed stacks and span timings gathered so far."""
+        try:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            collapsed = self.out_dir / f"{stamp}.collapsed"
+            spans = self.out_dir / f"{stamp}.spans.json"
+            counts = self._sampler.counts if self._sampler is not None else Counter()
+            collapsed.write_text(
+                "".join(f"{stack} {n}\n" for stack, n in counts.most_common()), encoding="utf-8"
+            )
+            spans.write_text(json.dumps({
+                "started_at": self.started_at,
+                "written_at": time.time(),
+                "hz": self.hz,
+                "samples": self._sampler.samples if self._sampler is not None else 0,
+                "spans": self.span_table(),
+            }, indent=2), encoding="utf-8")
+        except OSError as e:
+            print(f"Could not write profile: {e}")
+            return {}
+        return {"collapsed": str(collapsed), "spans": str(spans)}
+
+    def to_dict(self, top: int = 20) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "hz": self.hz,
+            "started_at": self.started_at,
+            "samples": self._sampler.samples if self._sampler is not None else 0,
+            "spans": self.span_table()[:top],
+        }
+
+
+class SpanMiddleware:
+    """Pure ASGI: one span per HTTP request, named after the matched route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not PROFILER.enabled:
+            return await self.app(scope, receive, send)
+        token = _path.set("http")
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = scope.get("route")
+            name = getattr(route, "path", None) or scope.get("path", "")
+            PROFILER.record(f"http;{scope.get('method', '')} {name}", time.perf_counter() - t0)
+            _path.reset(token)
+
+
+PROFILER = Profiler(PROFILE_DIR, settings.profile_hz)
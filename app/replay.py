@@ -0,0 +1,221 @@
+from __future__ import annotations
+import asyncio
+import json
+import math
+import struct
+import time
+from array import array
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from app.game_logic import game_elapsed_seconds
+from app.journal import INDEX_RECORD, parse_game_time
+
+# Replay of recorded games. A Recording is a read-only view of one file:
+#
+#   *.json    a JSON array of demo events (demo_data/demo_events.json)
+#   *.jsonl   one event per line, either a bare demo event or a journal entry
+#             ({"seq", "ts", "elapsed", "state": {...}}, see app/journal.py)
+#
+# JSONL files are never loaded whole: line offsets are indexed lazily, only as
+# far as playback (or a seek) has reached, and each event is read with one
+# seek + readline. A journal's .idx sidecar, when present, supplies offsets and
+# game clocks without touching the data file. Seeking by game clock goes
+# through a per-second table (first event at or after second S), so it is a
+# single array lookup once built.
+#
+# A ReplaySession is one cursor over a Recording; any number of sessions can
+# share a Recording and play it at their own speed and position.
+
+_REC = struct.Struct(INDEX_RECORD)
+
+
+def _event(obj: dict[str, Any]) -> dict[str, Any]:
+    """Flatten a journal entry to the demo-event shape; bare events pass through."""
+    state = obj.get("state")
+    if not isinstance(state, dict):
+        return obj
+    event = dict(state)
+    if "ts" in obj:
+        event["ts"] = obj["ts"]
+    return event
+
+
+class Recording:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._events: list[dict[str, Any]] | None = None
+        self._file = None
+        self._offsets = array("Q")
+        self._elapsed = array("i")     # per event, filled on first clock seek (or from .idx: running max)
+        self._scan_pos = 0
+        self._by_second: array | None = None
+        self._by_second_len = 0
+
+        if self.path.suffix == ".json":
+            self._events = [_event(e) for e in json.loads(self.path.read_text(encoding="utf-8"))]
+            return
+        self._file = open(self.path, "rb")
+        self._load_sidecar()
+
+    def _load_sidecar(self) -> None:
+        idx = self.path.with_suffix(".idx")
+        if not idx.exists():
+            return
+        data = idx.read_bytes()
+        data = data[: len(data) - len(data) % _REC.size]   # ignore a torn last record
+        end = 0
+        for _, elapsed, offset, length in _REC.iter_unpack(data):
+            self._offsets.append(offset)
+            self._elapsed.append(elapsed)
+            end = offset + length
+        self._scan_pos = end
+
+    def _scan_to(self, i: int | None) -> None:
+        """Index line offsets up to event i (None: to the current end of file)."""
+        offsets = self._offsets
+        f = self._file
+        f.seek(self._scan_pos)
+        while i is None or len(offsets) <= i:
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                break      # EOF, or a line still being written
+            if line.strip():
+                offsets.append(self._scan_pos)
+            self._scan_pos += len(line)
+
+    def __len__(self) -> int:
+        if self._events is not None:
+            return len(self._events)
+        self._scan_to(None)
+        return len(self._offsets)
+
+    def has(self, i: int) -> bool:
+        """Whether event i exists, indexing no further than i."""
+        if self._events is not None:
+            return i < len(self._events)
+        if i >= len(self._offsets):
+            self._scan_to(i)
+        return i < len(self._offsets)
+
+    def clamp(self, i: int) -> int:
+        """min(i, len(self)) without indexing past i."""
+        i = max(0, i)
+        return i if i == 0 or self.has(i - 1) else len(self)
+
+    def get(self, i: int) -> dict[str, Any]:
+        if self._events is not None:
+            return self._events[i]
+        if i >= len(self._offsets):
+            self._scan_to(i)
+        self._file.seek(self._offsets[i])
+        return _event(json.loads(self._file.readline()))
+
+    def elapsed(self, i: int) -> int:
+        if i < len(self._elapsed):
+            return self._elapsed[i]
+        e = self.get(i)
+        return game_elapsed_seconds(e.get("quarter"), e.get("clock"))
+
+    def time_of(self, i: int) -> float:
+        """Replay timeline in seconds: wall-clock `ts` when recorded, else game clock."""
+        ts = self.get(i).get("ts")
+        return float(ts) if ts is not None else float(self.elapsed(i))
+
+    def index_at(self, elapsed: int) -> int:
+        """First event at or after `elapsed` game seconds (len() if none)."""
+        n = len(self)
+        if self._by_second is None or self._by_second_len != n:
+            self._build_clock_table(n)
+        table = self._by_second
+        if elapsed <= 0:
+            return 0
+        return table[elapsed] if elapsed < len(table) else n
+
+    def _build_clock_table(self, n: int) -> None:
+        for i in range(len(self._elapsed), n):
+            self._elapsed.append(self.elapsed(i))
+        table = array("i")
+        running = 0   # prefix max, so a stray out-of-order clock cannot break ordering
+        for i in range(n):
+            running = max(running, self._elapsed[i])
+            while len(table) <= running:
+                table.append(i)
+        self._by_second = table
+        self._by_second_len = n
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+class ReplaySession:
+    """One cursor over a Recording.
+
+    speed <= 0 steps one event per next_event() call (the classic demo).
+    speed > 0 plays on the recording's timeline at that multiple of real time:
+    next_event() returns the latest event whose time has come.
+    """
+
+    __slots__ = ("recording", "speed", "position", "_anchor")
+
+    def __init__(self, recording: Recording, speed: float = 0.0, position: int = 0):
+        self.recording = recording
+        self.speed = speed
+        self.position = position      # next event to emit
+        self._anchor: tuple[float, float] | None = None   # (monotonic, timeline) at (re)start
+
+    def seek(self, i: int) -> int:
+        self.position = self.recording.clamp(int(i))
+        self._anchor = None
+        return self.position
+
+    def seek_clock(self, text: str) -> int | None:
+        """Seek to the first event at or after game time "Q3 06:55"."""
+        elapsed = parse_game_time(text)
+        if elapsed is None:
+            return None
+        return self.seek(self.recording.index_at(elapsed))
+
+    def set_speed(self, speed: float) -> None:
+        self.speed = speed
+        self._anchor = None
+
+    def next_event(self, now: float | None = None) -> dict[str, Any] | None:
+        rec = self.recording
+        i = self.position
+        if not rec.has(i):
+            i -= 1          # past the end: keep repeating the last event
+            if i < 0:
+                return None
+        if self.speed > 0:
+            now = time.monotonic() if now is None else now
+            if self._anchor is None:
+                self._anchor = (now, rec.time_of(i))
+            wall0, t0 = self._anchor
+            target = t0 + (now - wall0) * self.speed
+            while rec.has(i + 1) and rec.time_of(i + 1) <= target:
+                i += 1
+        self.position = i + 1
+        return rec.get(i)
+
+    async def play(self) -> AsyncIterator[dict[str, Any]]:
+        """Yield every remaining event, sleeping out the recorded gaps / speed."""
+        rec = self.recording
+        prev: float | None = None
+        while rec.has(self.position):
+            i = self.position
+            t = rec.time_of(i)
+            if prev is not None and self.speed > 0 and math.isfinite(t - prev):
+                await asyncio.sleep(max(0.0, (t - prev) / self.speed))
+            prev = t
+            self.position = i + 1
+            yield rec.get(i)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "path": str(self.recording.path),
+            "position": self.position,
+            "length": len(self.recording),
+            "speed": self.speed,
+        }
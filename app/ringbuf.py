@@ -0,0 +1,92 @@
+from __future__ import annotations
+from collections import deque
+from typing import Iterator
+
+from app.dedupe import DedupeIndex
+
+# Fixed-capacity panel logs. Appends are O(1) (the oldest entry falls off the
+# far end) and every entry carries a sequence number from a counter shared by
+# all panels of one game, so a client can ask for "everything after seq N" and
+# receive only what it has not seen.
+
+class SeqCounter:
+    __slots__ = ("value",)
+
+    def __init__(self, value: int = 0):
+        self.value = value
+
+    def next(self) -> int:
+        self.value += 1
+        return self.value
+
+
+class RingBuffer:
+    __slots__ = ("_items", "_seq", "reset_seq", "dedupe")
+
+    def __init__(self, capacity: int, seq: SeqCounter, dedupe: DedupeIndex | None = None):
+        self._items: deque[tuple[int, str]] = deque(maxlen=capacity)  # newest first
+        self._seq = seq
+        self.dedupe = dedupe
+        # Seq at the last clear(); delta readers older than this must replace, not merge.
+        self.reset_seq = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._items.maxlen
+
+    def append(self, text: str) -> int:
+        seq = self._seq.next()
+        self._items.appendleft((seq, text))
+        return seq
+
+    def append_unique(self, text: str) -> int | None:
+        """Append unless the dedupe window already holds an equivalent entry."""
+        if self.dedupe is not None and not self.dedupe.add_if_new(text):
+            return None
+        return self.append(text)
+
+    def clear(self) -> None:
+        self._items.clear()
+        if self.dedupe is not None:
+            self.dedupe.clear()
+        self.reset_seq = self._seq.next()
+
+    def latest(self, n: int | None = None) -> list[str]:
+        """Newest-first texts, at most n of them."""
+        if n is None or n >= len(self._items):
+            return [text for _, text in self._items]
+        out = []
+        for seq_text in self._items:
+            if len(out) >= n:
+                break
+            out.append(seq_text[1])
+        return out
+
+    def since(self, seq: int) -> list[str]:
+        """Newest-first texts appended after `seq`; O(new entries)."""
+        out = []
+        for entry_seq, text in self._items:
+            if entry_seq <= seq:
+                break
+            out.append(text)
+        return out
+
+    def entries(self) -> list[tuple[int, str]]:
+        return list(self._items)
+
+    def restore(self, entries: list, reset_seq: int = 0) -> None:
+        """Reload (seq, text) pairs saved by entries(), newest first."""
+        self._items.clear()
+        if self.dedupe is not None:
+            self.dedupe.clear()
+        for seq, text in reversed(entries[: self.capacity]):
+            self._items.appendleft((int(seq), text))
+            if self.dedupe is not None:
+                self.dedupe.add_if_new(text)
+        self.reset_seq = int(reset_seq)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[str]:
+        return (text for _, text in self._items)
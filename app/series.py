@@ -0,0 +1,105 @@
+from __future__ import annotations
+from array import array
+from typing import Iterator
+
+# Numeric win-probability history for charts. Three parallel array('d')
+# columns (wall time, game seconds, P(home)) cost 24 bytes per sample instead
+# of a tuple of boxed floats. Memory is bounded: when `capacity` is reached the
+# older half is thinned to every other sample, so a whole game of play-level
+# samples fits and recent samples keep full resolution. Readers get an LTTB
+# downsample sized to the chart, not the raw series; it is memoized per point
+# count until the next append, so a room full of charts costs one pass.
+
+SERIES_CAPACITY = 2048
+
+
+class WinProbSeries:
+    __slots__ = ("capacity", "ts", "game_s", "prob", "_memo")
+
+    def __init__(self, capacity: int = SERIES_CAPACITY):
+        self.capacity = max(8, capacity)
+        self.ts = array("d")
+        self.game_s = array("d")
+        self.prob = array("d")
+        self._memo: dict[int, list[tuple[float, float, float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    def append(self, ts: float, game_s: float, prob: float) -> None:
+        self._memo.clear()
+        n = len(self.prob)
+        if n and self.game_s[n - 1] == game_s:
+            # Clock did not move (score change, status flip): keep the latest value only.
+            self.ts[n - 1] = ts
+            self.prob[n - 1] = prob
+            return
+        if n >= self.capacity:
+            self._thin()
+        self.ts.append(ts)
+        self.game_s.append(game_s)
+        self.prob.append(prob)
+
+    def _thin(self) -> None:
+        half = len(self.prob) // 2
+        for col in (self.ts, self.game_s, self.prob):
+            col[:half] = col[:half:2]
+
+    def clear(self) -> None:
+        self._memo.clear()
+        del self.ts[:], self.game_s[:], self.prob[:]
+
+    def points(self) -> Iterator[tuple[float, float, float]]:
+        return zip(self.ts, self.game_s, self.prob)
+
+    def downsample(self, threshold: int) -> list[tuple[float, float, float]]:
+        """Largest-Triangle-Three-Buckets over (game seconds, P(home))."""
+        cached = self._memo.get(threshold)
+        if cached is None:
+            if len(self._memo) >= 8:
+                self._memo.clear()
+            cached = self._memo[threshold] = self._lttb(threshold)
+        return cached
+
+    def _lttb(self, threshold: int) -> list[tuple[float, float, float]]:
+        n = len(self.prob)
+        if threshold >= n or threshold < 3:
+            return list(self.points())
+        x, y = self.game_s, self.prob
+        keep = [0]
+        bucket = (n - 2) / (threshold - 2)
+        a = 0
+        for i in range(threshold - 2):
+            # Average of the next bucket is the third triangle vertex.
+            nxt_start = int((i + 1) * bucket) + 1
+            nxt_end = min(int((i + 2) * bucket) + 1, n)
+            count = nxt_end - nxt_start
+            avg_x = sum(x[nxt_start:nxt_end]) / count
+            avg_y = sum(y[nxt_start:nxt_end]) / count
+
+            start = int(i * bucket) + 1
+            end = int((i + 1) * bucket) + 1
+            ax, ay = x[a], y[a]
+            best, best_area = start, -1.0
+            for j in range(start, end):
+                area = abs((ax - avg_x) * (y[j] - ay) - (ax - x[j]) * (avg_y - ay))
+                if area > best_area:
+                    best, best_area = j, area
+            keep.append(best)
+            a = best
+        keep.append(n - 1)
+        return [(self.ts[i], x[i], y[i]) for i in keep]
+
+    def to_lists(self) -> list[list[float]]:
+        return [self.ts.tolist(), self.game_s.tolist(), self.prob.tolist()]
+
+    def restore(self, columns: list) -> None:
+        self.clear()
+        if not columns or len(columns) != 3:
+            return
+        ts, game_s, prob = columns
+        n = min(len(ts), len(game_s), len(prob))
+        start = max(0, n - self.capacity)
+        self.ts.extend(ts[start:n])
+        self.game_s.extend(game_s[start:n])
+        self.prob.extend(prob[start:n])
@@ -1,21 +1,100 @@
+import dataclasses
 from dataclasses import dataclass, field
 from typing import Any
 
-@dataclass
+from app.config import settings
+from app.game_logic import GameState
+from app.ringbuf import RingBuffer, SeqCounter
+from app.dedupe import DedupeIndex
+from app.series import WinProbSeries
+
+PANEL_CAPACITY = 50
+
+def _dedupe_index() -> DedupeIndex:
+    return DedupeIndex(settings.dedupe_window, settings.dedupe_ttl_s)
+
+@dataclass(slots=True)
 class MemoryStore:
-    last_fingerprint: str | None = None
+    game_id: str = ""
+    # Previous poll's state; diff_states() against it decides what to regenerate.
+    last_game: GameState | None = None
 
-    commentary: list[str] = field(default_factory=list)
-    mendoza_notes: list[str] = field(default_factory=list)
-    winprob_history: list[str] = field(default_factory=list)
+    # Panel logs share one sequence so /api/state?since=N spans all of them.
+    seq: SeqCounter = field(default_factory=SeqCounter)
+    commentary: RingBuffer = field(init=False)
+    mendoza_notes: RingBuffer = field(init=False)
+    winprob_history: RingBuffer = field(init=False)
 
     winprob_home: float | None = None
+    # (wall time, game seconds, P(home)) per win-prob update, for /api/winprob/series
+    winprob_series: WinProbSeries = field(default_factory=WinProbSeries)
     postgame_recap: str | None = None
 
     last_state: dict[str, Any] | None = None
 
+    # Bumped on every mutation; keys the cached /api/state encodings.
+    version: int = 0
+
     # meta / observability
     poll_count: int = 0
     last_update_iso: str | None = None
 
-STORE = MemoryStore()
+    def __post_init__(self) -> None:
+        self.commentary = RingBuffer(PANEL_CAPACITY, self.seq, _dedupe_index())
+        self.mendoza_notes = RingBuffer(PANEL_CAPACITY, self.seq, _dedupe_index())
+        self.winprob_history = RingBuffer(PANEL_CAPACITY, self.seq, _dedupe_index())
+
+    def panels(self) -> dict[str, RingBuffer]:
+        return {
+            "commentary": self.commentary,
+            "mendoza_notes": self.mendoza_notes,
+            "winprob_history": self.winprob_history,
+        }
+
+    def snapshot(self) -> dict[str, Any]:
+        """Everything needed to warm-start this game after a restart."""
+        return {
+            "last_game": dataclasses.asdict(self.last_game) if self.last_game else None,
+            "last_state": self.last_state,
+            "seq": self.seq.value,
+            "panels": {
+                name: {"entries": buf.entries(), "reset_seq": buf.reset_seq}
+                for name, buf in self.panels().items()
+            },
+            "winprob_home": self.winprob_home,
+            "winprob_series": self.winprob_series.to_lists(),
+            "postgame_recap": self.postgame_recap,
+            "poll_count": self.poll_count,
+            "last_update_iso": self.last_update_iso,
+        }
+
+    def restore(self, snap: dict[str, Any]) -> None:
+        last_game = snap.get("last_game")
+        self.last_game = GameState.from_dict(last_game) if last_game else None
+        self.last_state = snap.get("last_state")
+        self.seq.value = int(snap.get("seq") or 0)
+        saved_panels = snap.get("panels") or {}
+        for name, buf in self.panels().items():
+            saved = saved_panels.get(name) or {}
+            buf.restore(saved.get("entries") or [], saved.get("reset_seq") or 0)
+        self.winprob_home = snap.get("winprob_home")
+        self.winprob_series.restore(snap.get("winprob_series") or [])
+        self.postgame_recap = snap.get("postgame_recap")
+        self.poll_count = int(snap.get("poll_count") or 0)
+        self.last_update_iso = snap.get("last_update_iso")
+        self.version += 1
+
+# One store per tracked game, keyed by ESPN event id ("demo" in demo mode).
+STORES: dict[str, MemoryStore] = {}
+
+def get_store(game_id: str) -> MemoryStore:
+    store = STORES.get(game_id)
+    if store is None:
+        store = STORES[game_id] = MemoryStore(game_id=game_id)
+    return store
+
+for _game_id in settings.game_ids:
+    get_store(_game_id)
+
+# Store behind the unkeyed routes (/, /api/state).
+STORE = get_store(settings.game_ids[0])
@@ -0,0 +1,68 @@
+from __future__ import annotations
+import asyncio
+from typing import NamedTuple
+
+# Push fan-out for dashboard clients. Each state change is serialized once and
+# the same bytes are handed to every subscriber. Every client has its own small
+# queue; when a slow client falls behind, its oldest pending event is dropped
+# (newer snapshots supersede it) so publish() never waits on a socket.
+
+class StreamEvent(NamedTuple):
+    json: str       # WebSocket text frame
+    sse: bytes      # ready-to-write Server-Sent Events frame
+
+
+def make_event(payload_json: str) -> StreamEvent:
+    return StreamEvent(payload_json, f"event: state\ndata: {payload_json}\n\n".encode("utf-8"))
+
+
+class Broadcaster:
+    def __init__(self, queue_size: int = 4):
+        self.queue_size = queue_size
+        self._subs: dict[str, set[asyncio.Queue]] = {}
+        self._last: dict[str, StreamEvent] = {}
+
+        # meta / observability
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, game_id: str) -> asyncio.Queue:
+        q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subs.setdefault(game_id, set()).add(q)
+        last = self._last.get(game_id)
+        if last is not None:
+            q.put_nowait(last)
+        return q
+
+    def unsubscribe(self, game_id: str, q: asyncio.Queue) -> None:
+        subs = self._subs.get(game_id)
+        if subs is not None:
+            subs.discard(q)
+            if not subs:
+                del self._subs[game_id]
+
+    def has_snapshot(self, game_id: str) -> bool:
+        return game_id in self._last
+
+    def publish(self, game_id: str, event: StreamEvent) -> None:
+        self._last[game_id] = event
+        self.published += 1
+        for q in self._subs.get(game_id, ()):
+            if q.full():
+                q.get_nowait()
+                self.dropped += 1
+            q.put_nowait(event)
+
+    @property
+    def clients(self) -> int:
+        return sum(len(s) for s in self._subs.values())
+
+    def to_dict(self) -> dict:
+        return {
+            "clients": self.clients,
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+BROADCASTER = Broadcaster()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+from typing import Any, Iterable
+
+# Optional: ijson (C yajl2 backend) is only used when installed (pip install ijson).
+try:
+    import ijson  # type: ignore
+except ImportError:
+    ijson = None
+
+# Streaming extraction of the ESPN summary response. The ~390 KB document is
+# consumed as a stream of parse events; only the subtrees parse_summary() reads
+# are built into Python objects (header.competitions, competitions,
+# boxscore.players). drives, news, standings, pickcenter... pass through as
+# events and are dropped immediately, and the body itself never has to be held
+# in memory as one buffer. The price is CPU: on espn_response.json this takes
+# ~2-3x as long as json.loads() + parse_summary() (~9 ms vs ~4 ms) for about a
+# quarter of the peak memory (257 KiB vs 1,188 KiB; benchmarks/summary_parse.py),
+# which is why it is opt-in.
+
+# event prefix -> (top-level key, child key or None)
+WANTED_PATHS: dict[str, tuple[str, str | None]] = {
+    "competitions": ("competitions", None),
+    "header.competitions": ("header", "competitions"),
+    "boxscore.players": ("boxscore", "players"),
+}
+
+_CONTAINER_START = ("start_map", "start_array")
+_CONTAINER_END = ("end_map", "end_array")
+
+
+def available() -> bool:
+    return ijson is not None
+
+
+class SummaryExtractor:
+    """Builds a sparse summary dict from ijson parse events."""
+
+    def __init__(self, wanted: dict[str, tuple[str, str | None]] = WANTED_PATHS):
+        self._wanted = wanted
+        self._builder = None
+        self._capture: str | None = None
+        self.data: dict[str, Any] = {}
+
+    def feed_many(self, events: Iterable[tuple[str, str, Any]]) -> None:
+        # Hot loop (one iteration per JSON token): locals only, no method calls
+        # unless we are inside a wanted subtree.
+        wanted = self._wanted
+        builder = self._builder
+        capture = self._capture
+        for prefix, event, value in events:
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == capture and event in _CONTAINER_END:
+                    self._store(capture, builder.value)
+                    builder = capture = None
+            elif prefix in wanted and event in _CONTAINER_START:
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                capture = prefix
+        self._builder = builder
+        self._capture = capture
+
+    def _store(self, prefix: str, value: Any) -> None:
+        top, child = self._wanted[prefix]
+        if child is None:
+            self.data[top] = value
+        else:
+            self.data.setdefault(top, {})[child] = value
+
+
+class SummaryStream:
+    """Push-style wrapper: feed raw body chunks as they arrive, then read .data."""
+
+    def __init__(self):
+        self._events = ijson.sendable_list()
+        self._coro = ijson.parse_coro(self._events, use_float=True)
+        self._extractor = SummaryExtractor()
+
+    def send(self, chunk: bytes) -> None:
+        self._coro.send(chunk)
+        self._drain()
+
+    def close(self) -> dict[str, Any]:
+        self._coro.close()
+        self._drain()
+        return self._extractor.data
+
+    def _drain(self) -> None:
+        self._extractor.feed_many(self._events)
+        del self._events[:]
+
+
+def extract_summary(chunks: Iterable[bytes]) -> dict[str, Any]:
+    """Sparse summary dict (same shape parse_summary expects) from body chunks."""
+    stream = SummaryStream()
+    for chunk in chunks:
+        stream.send(chunk)
+    return stream.close()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+import math
+import struct
+from array import array
+from pathlib import Path
+
+from app.config import settings
+from app.game_logic import QUARTER_SECONDS, GameState, clock_seconds
+
+# Clock-aware win probability from a precomputed table.
+#
+# Model: the final margin is normally distributed around the current margin
+# with a spread that shrinks with the square root of the time left,
+# P(home) = Phi(lead / (SIGMA * sqrt(t))). The table holds that curve for every
+# integer margin in +/-MAX_MARGIN and every STEP_S seconds of regulation. A
+# lookup is index arithmetic plus one linear interpolation in time over a
+# plain list of floats: no exp/erf and no containers built per call. Per state
+# it costs about what compute_win_prob_simple() does (~1 us,
+# benchmarks/test_hot_paths.py), for a curve that also knows the clock.
+#
+# Possession would shift the curve by a couple of points, but no feed we read
+# (ESPN summary, demo recordings) gives it to GameState, so the table has no
+# possession dimension.
+
+GAME_SECONDS = 4 * 15 * 60
+SIGMA = 16.0              # std dev of a full game's final margin (points)
+MAX_MARGIN = 50
+STEP_S = 15
+FLOOR, CEIL = 0.01, 0.99
+OVERTIME_SECONDS = 300    # an unresolved overtime is treated like 5:00 left
+
+_HEADER = struct.Struct("<4sIII")   # magic, max_margin, step_s, columns
+_MAGIC = b"WPT2"                     # WPT1 tables carried a possession dimension
+
+
+def _model(margin: int, seconds_left: int) -> float:
+    if seconds_left <= 0:
+        p = 1.0 if margin > 0 else 0.0 if margin < 0 else 0.5
+    else:
+        spread = SIGMA * math.sqrt(seconds_left / GAME_SECONDS)
+        p = 0.5 * (1.0 + math.erf(margin / (spread * math.sqrt(2.0))))
+    return max(FLOOR, min(CEIL, p))
+
+
+class WinProbTable:
+    __slots__ = ("max_margin", "step_s", "cols", "_rows", "_last_col", "_values")
+
+    def __init__(self, values: array, max_margin: int = MAX_MARGIN, step_s: int = STEP_S, cols: int | None = None):
+        self.max_margin = max_margin
+        self.step_s = step_s
+        self.cols = cols if cols is not None else GAME_SECONDS // step_s + 1
+        self._rows = 2 * max_margin + 1
+        self._last_col = self.cols - 1
+        if len(values) != self._rows * self.cols:
+            raise ValueError(f"win-prob table has {len(values)} values, expected {self._rows * self.cols}")
+        # A list hands back its float objects as-is; array("d") would box one per read.
+        self._values = values.tolist()
+
+    @classmethod
+    def build(cls, max_margin: int = MAX_MARGIN, step_s: int = STEP_S) -> "WinProbTable":
+        cols = GAME_SECONDS // step_s + 1
+        values = array("d")
+        for margin in range(-max_margin, max_margin + 1):
+            values.extend(_model(margin, c * step_s) for c in range(cols))
+        return cls(values, max_margin, step_s, cols)
+
+    def save(self, path: str | Path) -> None:
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.max_margin, self.step_s, self.cols))
+            array("d", self._values).tofile(f)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "WinProbTable":
+        with open(path, "rb") as f:
+            magic, max_margin, step_s, cols = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is not a win-prob table")
+            values = array("d")
+            values.frombytes(f.read())
+        return cls(values, max_margin, step_s, cols)
+
+    @classmethod
+    def load_or_build(cls, path: str | None) -> "WinProbTable":
+        """Load `path`; build (and write it there, if given) when missing or unreadable."""
+        if path:
+            try:
+                return cls.load(path)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Could not load win-prob table {path}: {e}; rebuilding")
+        table = cls.build()
+        if path:
+            try:
+                table.save(path)
+            except OSError as e:
+                print(f"Could not save win-prob table {path}: {e}")
+        return table
+
+    def lookup(self, margin: int, seconds_left: float) -> float:
+        """P(home wins) for a home-minus-away `margin` with `seconds_left` in regulation."""
+        m = self.max_margin
+        if margin > m:
+            margin = m
+        elif margin < -m:
+            margin = -m
+        values = self._values
+        row = (margin + m) * self.cols
+        if seconds_left <= 0:
+            return values[row]
+        pos = seconds_left / self.step_s
+        if pos >= self._last_col:
+            return values[row + self._last_col]
+        i = int(pos)
+        lo = values[row + i]
+        return lo + (values[row + i + 1] - lo) * (pos - i)
+
+
+def seconds_left(state: GameState) -> int:
+    """Regulation seconds remaining (0 once final, OVERTIME_SECONDS in overtime)."""
+    status = state.status
+    if status == "final":
+        return 0
+    quarter = state.quarter
+    if status == "pregame" or not quarter:
+        return GAME_SECONDS
+    if quarter > 4:
+        return OVERTIME_SECONDS
+    # Same arithmetic as game_elapsed_seconds(), counted down, minus two calls.
+    left = clock_seconds(state.clock)
+    if left is None or left > QUARTER_SECONDS:
+        left = QUARTER_SECONDS
+    return max(0, (4 - quarter) * QUARTER_SECONDS + left)
+
+
+def compute_win_prob(state: GameState, table: "WinProbTable | None" = None) -> float:
+    return (table or TABLE).lookup((state.home_score or 0) - (state.away_score or 0), seconds_left(state))
+
+
+# Built once at import (~75k erf calls), or read from WINPROB_TABLE.
+TABLE = WinProbTable.load_or_build(settings.winprob_table)
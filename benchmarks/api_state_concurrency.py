@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Requests/sec for GET /api/state with 1,000 concurrent readers.
+
+Compares the old handler (rebuild the dict + re-encode JSON on every hit)
+against the versioned cache (encode once per store version), plain, gzip,
+and conditional (If-None-Match -> 304).
+
+    python benchmarks/api_state_concurrency.py [readers] [requests_per_reader]
+"""
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+os.environ.setdefault("AUTO_POLL", "0")
+os.environ.setdefault("DEMO_MODE", "1")
+
+import httpx
+from fastapi.responses import JSONResponse
+
+from app.main import app, poll_game, _payload
+from app.store import STORE
+
+
+async def legacy_state():
+    return JSONResponse(_payload(STORE))
+
+app.add_api_route("/_bench/legacy_state", legacy_state)
+
+
+async def asgi_get(path: str, headers: dict) -> int:
+    """One request straight into the ASGI app (no client/socket overhead)."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "server": ("bench", 80), "client": ("127.0.0.1", 1),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def run(path: str, readers: int, per_reader: int, headers: dict) -> float:
+    async def reader():
+        for _ in range(per_reader):
+            status = await asgi_get(path, headers)
+            assert status in (200, 304), status
+
+    start = time.perf_counter()
+    await asyncio.gather(*(reader() for _ in range(readers)))
+    elapsed = time.perf_counter() - start
+    return readers * per_reader / elapsed
+
+
+async def bench(readers: int, per_reader: int) -> None:
+    # Fill the panels with a full demo game so the payload is realistic.
+    for _ in range(7):
+        await poll_game(STORE)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as c:
+        etag = (await c.get("/api/state")).headers["etag"]
+        size = len((await c.get("/api/state", headers={"Accept-Encoding": "identity"})).content)
+
+    cases = [
+        ("before: rebuild + encode per request", "/_bench/legacy_state", {"Accept-Encoding": "identity"}),
+        ("after: cached bytes (identity)", "/api/state", {"Accept-Encoding": "identity"}),
+        ("after: cached bytes (gzip)", "/api/state", {"Accept-Encoding": "gzip"}),
+        ("after: If-None-Match -> 304", "/api/state", {"If-None-Match": etag}),
+    ]
+    print(f"{readers} concurrent readers x {per_reader} requests each, payload {size} bytes\n")
+    print(f"{'case':<40} {'req/s':>10}")
+    for label, path, headers in cases:
+        rps = await run(path, readers, per_reader, headers)
+        print(f"{label:<40} {rps:>10,.0f}")
+
+
+if __name__ == "__main__":
+    readers = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    per_reader = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    asyncio.run(bench(readers, per_reader))
@@ -0,0 +1,180 @@
+"""
+pytest harness for the hot-path microbenchmarks (benchmarks/test_*.py).
+Opt-in: testpaths keeps a plain `pytest` to tests/, so these run only when
+benchmarks/ is named on the command line.
+
+    python -m pytest benchmarks -q                    # run, compare to baseline
+    python -m pytest benchmarks -q --bench-save       # re-record benchmarks/baseline.json
+
+Each benchmark is calibrated to ~10 ms batches and repeated for
+--bench-time seconds. The fastest batch (the one least disturbed by other
+load) is compared against the stored baseline, and a test fails when it is
+more than --bench-threshold times slower (default 3.0, or BENCH_THRESHOLD;
+shared CI runners and small VMs swing sub-microsecond timings by 2x on their
+own). Every run writes benchmarks/results/latest.json for per-commit
+tracking.
+"""
+import asyncio
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+BASELINE_PATH = ROOT / "benchmarks" / "baseline.json"
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+# Benchmarks import app.main: keep it from polling, journaling or hydrating live data.
+os.environ.setdefault("AUTO_POLL", "0")
+os.environ.setdefault("DEMO_MODE", "1")
+os.environ.setdefault("JOURNAL_ENABLED", "0")
+
+DEFAULT_THRESHOLD = float(os.getenv("BENCH_THRESHOLD", "3.0"))
+DEFAULT_TIME = float(os.getenv("BENCH_TIME", "0.2"))
+
+_RESULTS: dict[str, dict] = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("bench")
+    group.addoption("--bench-save", action="store_true", help="write results as the new baseline")
+    group.addoption("--bench-threshold", type=float,
+                    default=DEFAULT_THRESHOLD,
+                    help="fail when min ns/op exceeds the baseline by this factor")
+    group.addoption("--bench-time", type=float, default=DEFAULT_TIME,
+                    help="seconds spent measuring each benchmark")
+
+
+def _opt(config, name: str, default):
+    # Options only exist when this conftest is loaded at startup (pytest benchmarks ...);
+    # if it is collected late, fall back to the defaults.
+    try:
+        return config.getoption(name)
+    except ValueError:
+        return default
+
+
+def _load_baseline() -> dict:
+    try:
+        return json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _measure(fn, args, budget: float) -> dict:
+    if inspect.iscoroutinefunction(fn):
+        loop = asyncio.new_event_loop()
+
+        async def batch(n):
+            for _ in range(n):
+                await fn(*args)
+
+        def run(n):
+            loop.run_until_complete(batch(n))
+    else:
+        loop = None
+
+        def run(n):
+            for _ in range(n):
+                fn(*args)
+
+    try:
+        # Calibrate: grow the batch until one batch takes >= 10 ms.
+        n = 1
+        while True:
+            t0 = time.perf_counter()
+            run(n)
+            dt = time.perf_counter() - t0
+            if dt >= 0.01:
+                break
+            n *= 10 if dt < 0.001 else 2
+        samples = []
+        deadline = time.perf_counter() + budget
+        while len(samples) < 5 or time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            run(n)
+            samples.append((time.perf_counter() - t0) / n * 1e9)
+    finally:
+        if loop is not None:
+            loop.close()
+    return {
+        "median_ns": round(statistics.median(samples), 1),
+        "min_ns": round(min(samples), 1),
+        "batch": n,
+        "samples": len(samples),
+    }
+
+
+@pytest.fixture(scope="session")
+def _baseline():
+    return _load_baseline()
+
+
+@pytest.fixture
+def bench(request, _baseline):
+    """bench(fn, *args): time fn (sync or async), record it, check the baseline."""
+    config = request.config
+
+    def run(fn, *args, name: str | None = None):
+        key = name or request.node.name.removeprefix("test_")
+        result = _measure(fn, args, _opt(config, "--bench-time", DEFAULT_TIME))
+        base = _baseline.get("results", {}).get(key)
+        if base:
+            result["baseline_ns"] = base["min_ns"]
+            result["ratio"] = round(result["min_ns"] / base["min_ns"], 2)
+        _RESULTS[key] = result
+        threshold = _opt(config, "--bench-threshold", DEFAULT_THRESHOLD)
+        if base and not _opt(config, "--bench-save", False) and result["ratio"] > threshold:
+            pytest.fail(
+                f"{key}: {result['min_ns']:.0f} ns/op is {result['ratio']}x the baseline "
+                f"({base['min_ns']:.0f} ns/op, threshold {threshold}x)"
+            )
+        return result
+
+    return run
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _RESULTS:
+        return
+    report = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "machine": platform.machine(),
+        "results": dict(sorted(_RESULTS.items())),
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    (RESULTS_DIR / "latest.json").write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if _opt(session.config, "--bench-save", False):
+        for r in report["results"].values():
+            r.pop("baseline_ns", None)
+            r.pop("ratio", None)
+        BASELINE_PATH.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _RESULTS:
+        return
+    tr = terminalreporter
+    tr.section("benchmarks (slowest first)")
+    tr.write_line(f"{'name':<32}{'median ns/op':>14}{'min ns/op':>12}{'baseline':>12}{'ratio':>8}")
+    for key, r in sorted(_RESULTS.items(), key=lambda kv: -kv[1]["median_ns"]):
+        base = f"{r['baseline_ns']:.0f}" if "baseline_ns" in r else "-"
+        ratio = f"{r['ratio']:.2f}" if "ratio" in r else "-"
+        tr.write_line(f"{key:<32}{r['median_ns']:>14.0f}{r['min_ns']:>12.0f}{base:>12}{ratio:>8}")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Retained memory per game state when holding a long history in-process
+(season-long replay and analytics over journal records).
+
+Each row decodes the same synthetic journal lines (scores, clock and two
+tracked player lines moving) and keeps one object per line:
+
+    json records     : the decoded dicts as-is
+    plain dataclass  : a GameState-shaped @dataclass without slots or interning
+    GameState        : GameState.from_dict() (slotted, frozen, interned)
+    GameState+dict   : the same, after to_dict() filled the per-instance cache
+
+Bytes are what tracemalloc still sees allocated once the list is built,
+divided by the number of states (the list's own pointer included); the
+decode + build time comes from a separate, untraced pass.
+
+    python benchmarks/state_memory.py [states]
+"""
+import dataclasses
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.boxscore import PlayerLine
+from app.game_logic import GameState
+
+PlainState = dataclasses.make_dataclass(
+    "PlainState", [(f.name, f.type, f) for f in dataclasses.fields(GameState)]
+)
+
+
+def journal_lines(n: int) -> list[bytes]:
+    lines = []
+    for i in range(n):
+        q, left = 1 + (i // 180) % 4, 900 - (i * 5) % 900
+        play = i // 6   # polls see a new play (and new player lines) every few states
+        state = GameState(
+            "Indiana Hoosiers", "Miami Hurricanes", (i // 40) % 45, (i // 55) % 38, "live", q,
+            f"{left // 60}:{left % 60:02d}", play % 350, play % 4, play % 2,
+            (
+                PlayerLine("Fernando Mendoza", "4837248", "Indiana Hoosiers", play % 30, play % 40, play % 350,
+                           play % 4, play % 2, play % 9, play % 60, 0),
+                PlayerLine("Elijah Sarratt", "4686391", "Indiana Hoosiers",
+                           rec=play % 11, rec_yds=play % 140, rec_td=play % 2),
+            ),
+        )
+        lines.append(json.dumps({"seq": i, "state": dataclasses.asdict(state)}).encode())
+    return lines
+
+
+def measure(build, lines):
+    start = time.perf_counter()
+    held = [build(json.loads(line)["state"]) for line in lines]
+    elapsed = time.perf_counter() - start
+    del held
+    gc.collect()
+    tracemalloc.start()
+    held = [build(json.loads(line)["state"]) for line in lines]
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained / len(held), elapsed / len(held)
+
+
+def game_state_with_dict(record: dict) -> GameState:
+    state = GameState.from_dict(record)
+    state.to_dict()
+    return state
+
+
+def main(n: int) -> None:
+    lines = journal_lines(n)
+    print(f"{n:,} states, {sum(map(len, lines)) / n:.0f} journal bytes each\n")
+    print(f"{'form':<16} {'bytes/state':>12} {'us/state':>9}")
+    for label, build in (
+        ("json records", lambda record: record),
+        ("plain dataclass", lambda record: PlainState(**record)),
+        ("GameState", GameState.from_dict),
+        ("GameState+dict", game_state_with_dict),
+    ):
+        per_state, per_build = measure(build, lines)
+        print(f"{label:<16} {per_state:>12,.0f} {per_build * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Parse time and peak memory for the checked-in espn_response.json.
+
+    full decode : join the body, json.loads(), parse_summary()
+    streaming   : feed 16 KiB chunks to SummaryStream, parse_summary()
+
+Both paths must produce the same GameState. Needs `pip install ijson`.
+
+    python benchmarks/summary_parse.py [iterations]
+"""
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app import summary_stream
+from app.data_sources import parse_summary
+
+CHUNK = 16 * 1024
+
+
+def full_decode(chunks):
+    return parse_summary(json.loads(b"".join(chunks)))
+
+
+def streaming(chunks):
+    stream = summary_stream.SummaryStream()
+    for chunk in chunks:
+        stream.send(chunk)
+    return parse_summary(stream.close())
+
+
+def measure(fn, chunks, iterations):
+    fn(chunks)  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(chunks)
+    per_call = (time.perf_counter() - start) / iterations
+
+    tracemalloc.start()
+    fn(chunks)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_call, peak
+
+
+def main(iterations: int) -> None:
+    if not summary_stream.available():
+        sys.exit("ijson is not installed: pip install ijson")
+
+    raw = (ROOT / "espn_response.json").read_bytes()
+    chunks = [raw[i:i + CHUNK] for i in range(0, len(raw), CHUNK)]
+    assert full_decode(chunks) == streaming(chunks), "paths disagree"
+
+    print(f"espn_response.json: {len(raw):,} bytes, {len(chunks)} chunks, {iterations} iterations\n")
+    print(f"{'path':<14} {'ms/parse':>10} {'peak KiB':>10}")
+    for label, fn in (("full decode", full_decode), ("streaming", streaming)):
+        per_call, peak = measure(fn, chunks, iterations)
+        print(f"{label:<14} {per_call * 1000:>10.2f} {peak / 1024:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
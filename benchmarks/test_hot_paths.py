@@ -0,0 +1,218 @@
+"""
+Microbenchmarks for the per-poll and per-request hot paths.
+
+Names are grouped by where they run: poll.* is the work one poll_game()
+does for a changed state (in pipeline order), request.* is per viewer hit.
+The terminal summary sorts by cost, so the dominant stage is the first row.
+"""
+import json
+import time
+from pathlib import Path
+
+import pytest
+from starlette.requests import Request
+
+from app.ai_engine import (
+    ai_live_commentary, ai_mendoza_watch, ai_postgame_recap, ai_winprob_explain, commentary_batch,
+    live_commentary, mendoza_watch, winprob_explain,
+)
+from app.boxscore import COLUMNS, extract_players
+from app.data_sources import parse_summary
+from app.dedupe import DedupeIndex
+from app.game_logic import GameState, compute_win_prob_simple, diff_states, fingerprint, game_phase
+from app.metrics import REGISTRY, STAGE_DIFF
+from app.profiling import PROFILER, span
+from app.main import PANELS, _build_state_body, _dedupe_insert, _payload, _render_home, _render_html
+from app.ringbuf import RingBuffer, SeqCounter
+from app.store import MemoryStore
+from app.winprob import TABLE, compute_win_prob
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PREV = GameState("Miami", "Indiana", 21, 17, "live", 3, "6:55", 212, 2, 0)
+CUR = GameState("Miami", "Indiana", 21, 24, "live", 3, "4:10", 233, 2, 0)
+FINAL = GameState("Miami", "Indiana", 27, 24, "final", 4, "0:00", 301, 3, 1)
+
+
+def _state_dict(state: GameState) -> dict:
+    return state.to_dict()
+
+
+@pytest.fixture(scope="module")
+def espn_bytes() -> bytes:
+    return (ROOT / "espn_response.json").read_bytes()
+
+
+@pytest.fixture(scope="module")
+def store() -> MemoryStore:
+    s = MemoryStore(game_id="bench")
+    s.last_game = CUR
+    s.last_state = _state_dict(CUR)
+    for i in range(40):
+        for name in PANELS:
+            getattr(s, name).append(f"{name} line {i}: Indiana up 24-21 midway through the 3rd")
+    s.winprob_home = 0.42
+    return s
+
+
+# --- poll pipeline -----------------------------------------------------------
+
+def test_parse_summary(bench, espn_bytes):
+    data = json.loads(espn_bytes)
+    bench(parse_summary, data, name="poll.parse_summary")
+
+
+def test_boxscore_track_all(bench, espn_bytes):
+    # Every athlete in the passing/rushing/receiving tables, both teams.
+    players = json.loads(espn_bytes)["boxscore"]["players"]
+    specs = sorted({
+        a["athlete"]["displayName"]
+        for team in players for cat in team["statistics"] if cat["name"] in COLUMNS
+        for a in cat["athletes"]
+    })
+    assert len(extract_players(players, specs)[1]) == len(specs)
+    bench(extract_players, players, specs, name="poll.boxscore_track_all")
+
+
+def test_decode_and_parse_summary(bench, espn_bytes):
+    bench(lambda: parse_summary(json.loads(espn_bytes)), name="poll.decode_and_parse_summary")
+
+
+def test_fingerprint(bench):
+    bench(fingerprint, CUR, name="poll.fingerprint")
+
+
+def test_diff_states(bench):
+    bench(diff_states, PREV, CUR, name="poll.diff_states")
+
+
+def test_to_dict(bench):
+    bench(CUR.to_dict, name="poll.to_dict")
+
+
+def test_state_build(bench):
+    # A changed poll: a new GameState, its dict and its bytes, each built once.
+    def build():
+        GameState("Miami", "Indiana", 21, 24, "live", 3, "4:10", 233, 2, 0).to_json()
+
+    bench(build, name="poll.state_build")
+
+
+def test_game_phase(bench):
+    bench(game_phase, CUR, name="poll.game_phase")
+
+
+def test_compute_win_prob_simple(bench):
+    bench(compute_win_prob_simple, CUR, name="poll.compute_win_prob_simple")
+
+
+def test_compute_win_prob(bench):
+    bench(compute_win_prob, CUR, name="poll.compute_win_prob")
+
+
+def test_winprob_table_lookup(bench):
+    bench(TABLE.lookup, -3, 1850.0, name="poll.winprob_table_lookup")
+
+
+def test_ai_live_commentary(bench):
+    bench(ai_live_commentary, {"state": _state_dict(CUR)}, name="poll.ai_live_commentary")
+
+
+def test_ai_mendoza_watch(bench):
+    bench(ai_mendoza_watch, _state_dict(CUR), name="poll.ai_mendoza_watch")
+
+
+def test_ai_winprob_explain(bench):
+    bench(ai_winprob_explain, _state_dict(CUR), 0.42, name="poll.ai_winprob_explain")
+
+
+def test_ai_postgame_recap(bench):
+    history = [f"Miami {50 + i}% — Late one-score game" for i in range(10)]
+    notes = [f"Mendoza: {200 + i * 10} yds, 3 TD" for i in range(10)]
+    bench(ai_postgame_recap, _state_dict(FINAL), history, notes, name="poll.ai_postgame_recap")
+
+
+def test_live_commentary(bench):
+    bench(live_commentary, _state_dict(CUR), name="poll.live_commentary")
+
+
+def test_mendoza_watch(bench):
+    bench(mendoza_watch, _state_dict(CUR), name="poll.mendoza_watch")
+
+
+def test_winprob_explain(bench):
+    bench(winprob_explain, _state_dict(CUR), 0.42, name="poll.winprob_explain")
+
+
+def test_commentary_batch_slate(bench):
+    states = [
+        _state_dict(GameState("Home", "Away", (i * 3) % 45, (i * 7) % 45, "live", 1 + i % 4, "8:00", i * 5, i % 4, i % 2))
+        for i in range(60)
+    ]
+    bench(commentary_batch, states, name="poll.commentary_batch_60_games")
+
+
+def test_dedupe_insert(bench):
+    buf = RingBuffer(50, SeqCounter(), DedupeIndex(window=10))
+    lines = [f"Indiana leads {i}-{i - 3} in crunch time. Miami needs a stop here." for i in range(3, 40)]
+    it = iter(range(10**12))
+
+    def insert():
+        _dedupe_insert(buf, lines[next(it) % len(lines)])
+
+    bench(insert, name="poll.dedupe_insert")
+
+
+def test_metrics_timed_observe(bench):
+    # What each instrumented poll stage pays on top of its own work.
+    clock = time.perf_counter
+
+    def timed():
+        t = clock()
+        STAGE_DIFF.observe(clock() - t)
+
+    bench(timed, name="poll.metrics_timed_observe")
+
+
+def _span_block():
+    with span("bench"):
+        pass
+
+
+def test_span_disabled(bench):
+    bench(_span_block, name="poll.span_disabled")
+
+
+def test_span_enabled(bench, monkeypatch):
+    # Span bookkeeping only; the sampler thread is not started here.
+    monkeypatch.setattr(PROFILER, "enabled", True)
+    monkeypatch.setattr(PROFILER, "spans", {})
+    bench(_span_block, name="poll.span_enabled")
+
+
+# --- per request -------------------------------------------------------------
+
+def test_payload_full(bench, store):
+    bench(_payload, store, name="request.payload_full")
+
+
+def test_payload_delta(bench, store):
+    bench(_payload, store, store.seq.value - 3, name="request.payload_delta")
+
+
+def test_state_body_build(bench, store):
+    bench(_build_state_body, store, name="request.state_body_build")
+
+
+def test_render_index(bench, store):
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""}
+    request = Request(scope)
+    bench(_render_home, request, store, name="request.render_index")
+
+
+def test_render_index_uncached(bench, store):
+    bench(_render_html, store, name="request.render_index_uncached")
+
+
+def test_metrics_render(bench):
+    bench(REGISTRY.render, name="request.metrics_render")
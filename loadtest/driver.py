@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Load driver: many simulated dashboard clients against a running app.
+
+Each virtual client loops over a weighted mix of routes (the page, the
+state poll, the manual poll button), revalidating with If-None-Match the way
+a browser does, and sleeps a jittered think time between requests. At the
+end it prints p50/p95/p99 latency per route, throughput, error counts and
+the app's peak RSS.
+
+    # everything local: ESPN stand-in + app on free ports, no network
+    python loadtest/driver.py --spawn --clients 2000 --duration 30
+
+    # an app you started yourself (pass its pid for RSS)
+    python loadtest/driver.py --base http://127.0.0.1:8000 --pid 12345
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+import httpx
+
+DEFAULT_MIX = "/=1,/api/state=8,/admin/poll=1"
+
+
+def parse_mix(text: str) -> list[tuple[str, float]]:
+    mix = []
+    for part in text.split(","):
+        path, _, weight = part.strip().rpartition("=")
+        mix.append((path, float(weight)))
+    return mix
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    # Nearest rank: the smallest value with at least p% of the samples at or below it.
+    k = max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def rss_kib(pid: int) -> int | None:
+    """Resident set size from /proc (Linux); None elsewhere."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class Results:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.not_modified = 0
+        self.rss_start: int | None = None
+        self.rss_peak: int | None = None
+
+    def record(self, path: str, seconds: float, status: int) -> None:
+        self.latencies.setdefault(path, []).append(seconds)
+        if status == 304:
+            self.not_modified += 1
+        elif status >= 400:
+            self.errors[path] = self.errors.get(path, 0) + 1
+
+    def error(self, path: str) -> None:
+        self.errors[path] = self.errors.get(path, 0) + 1
+
+    def summary(self, elapsed: float) -> dict:
+        rows = {}
+        everything: list[float] = []
+        for path, values in sorted(self.latencies.items()):
+            values.sort()
+            everything.extend(values)
+            rows[path] = self._row(values, elapsed, self.errors.get(path, 0))
+        everything.sort()
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "routes": rows,
+            "total": self._row(everything, elapsed, sum(self.errors.values())),
+            "not_modified": self.not_modified,
+            "rss_start_kib": self.rss_start,
+            "rss_peak_kib": self.rss_peak,
+        }
+
+    @staticmethod
+    def _row(values: list[float], elapsed: float, errors: int) -> dict:
+        return {
+            "requests": len(values),
+            "errors": errors,
+            "rps": round(len(values) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+        }
+
+
+async def client_loop(client: httpx.AsyncClient, mix, think: float, deadline: float, results: Results, rng: random.Random) -> None:
+    paths = [p for p, _ in mix]
+    weights = [w for _, w in mix]
+    etags: dict[str, str] = {}
+    # Spread the first requests out instead of stampeding at t=0.
+    await asyncio.sleep(rng.uniform(0, think))
+    while time.monotonic() < deadline:
+        path = rng.choices(paths, weights)[0]
+        method = "POST" if path.startswith("/admin/") else "GET"
+        headers = {"Accept-Encoding": "gzip"}
+        if method == "GET" and path in etags:
+            headers["If-None-Match"] = etags[path]
+        t0 = time.perf_counter()
+        try:
+            resp = await client.request(method, path, headers=headers)
+            await resp.aread()
+        except httpx.HTTPError:
+            results.error(path)
+        else:
+            results.record(path, time.perf_counter() - t0, resp.status_code)
+            etag = resp.headers.get("etag")
+            if etag:
+                etags[path] = etag
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * think)
+
+
+async def sample_rss(pid: int, results: Results, stop: asyncio.Event) -> None:
+    results.rss_start = rss_kib(pid)
+    while not stop.is_set():
+        rss = rss_kib(pid)
+        if rss is not None and (results.rss_peak is None or rss > results.rss_peak):
+            results.rss_peak = rss
+        try:
+            await asyncio.wait_for(stop.wait(), 0.25)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def wait_ready(base: str, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base) as client:
+        while True:
+            try:
+                if (await client.get("/api/settings")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{base} did not come up within {timeout}s")
+            await asyncio.sleep(0.2)
+
+
+async def run(args) -> dict:
+    results = Results()
+    mix = parse_mix(args.mix)
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(args.pid, results, stop)) if args.pid else None
+
+    async with httpx.AsyncClient(base_url=args.base, limits=limits, timeout=args.timeout) as client:
+        start = time.monotonic()
+        deadline = start + args.duration
+        rng = random.Random(args.seed)
+        await asyncio.gather(*(
+            client_loop(client, mix, args.think, deadline, results, random.Random(rng.random()))
+            for _ in range(args.clients)
+        ))
+        elapsed = time.monotonic() - start
+
+    stop.set()
+    if sampler is not None:
+        await sampler
+    return results.summary(elapsed)
+
+
+def spawn(args) -> list[subprocess.Popen]:
+    """Start the ESPN stand-in and the app on free local ports."""
+    standin_port, app_port = free_port(), free_port()
+    standin = subprocess.Popen(
+        [sys.executable, str(ROOT / "loadtest" / "espn_standin.py"), "--port", str(standin_port),
+         "--speed", str(args.game_speed)],
+        cwd=ROOT,
+    )
+    env = {
+        **os.environ,
+        "DEMO_MODE": "0",
+        "ESPN_GAME_IDS": ",".join(f"{900000000 + i}" for i in range(args.games)),
+        "ESPN_BASE_URL": f"http://127.0.0.1:{standin_port}",
+        "AUTO_POLL": "1",
+        "POLL_INTERVAL_S": str(args.poll_interval),
+    }
+    app = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(app_port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    args.base = f"http://127.0.0.1:{app_port}"
+    args.pid = app.pid
+    return [app, standin]
+
+
+def print_report(report: dict) -> None:
+    print(f"\n{'route':<16}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = list(report["routes"].items()) + [("TOTAL", report["total"])]
+    for name, r in rows:
+        print(f"{name:<16}{r['requests']:>10}{r['errors']:>8}{r['rps']:>10}"
+              f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}")
+    print(f"\n304 responses: {report['not_modified']}   elapsed: {report['elapsed_s']}s")
+    if report["rss_peak_kib"] is not None:
+        print(f"app RSS: start {report['rss_start_kib'] / 1024:.1f} MiB, "
+              f"peak {report['rss_peak_kib'] / 1024:.1f} MiB")
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--base", default="http://127.0.0.1:8000")
+    ap.add_argument("--spawn", action="store_true", help="start the ESPN stand-in and the app locally")
+    ap.add_argument("--pid", type=int, default=None, help="app pid to sample RSS from")
+    ap.add_argument("--clients", type=int, default=1000)
+    ap.add_argument("--duration", type=float, default=20.0)
+    ap.add_argument("--think", type=float, default=1.0, help="mean seconds between a client's requests")
+    ap.add_argument("--mix", default=DEFAULT_MIX, help=f"route=weight,... (default {DEFAULT_MIX})")
+    ap.add_argument("--connections", type=int, default=256, help="client connection pool size")
+    ap.add_argument("--timeout", type=float, default=30.0)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--games", type=int, default=4, help="--spawn: games on the slate")
+    ap.add_argument("--game-speed", type=float, default=60.0, help="--spawn: stand-in game seconds per second")
+    ap.add_argument("--poll-interval", type=float, default=2.0, help="--spawn: app POLL_INTERVAL_S")
+    ap.add_argument("--json", type=Path, default=None, help="also write the report here")
+    args = ap.parse_args(argv)
+
+    procs = spawn(args) if args.spawn else []
+    try:
+        asyncio.run(wait_ready(args.base))
+        report = asyncio.run(run(args))
+    finally:
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            try:
+                p.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                p.kill()
+
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 1 if report["total"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
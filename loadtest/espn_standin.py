@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for ESPN's college-football site API.
+
+Serves /summary?event=<id> and /scoreboard from the recorded
+espn_response.json. Every event id gets its own simulated game: the clock
+runs at --speed game seconds per real second and scores move on a seeded
+schedule, so repeated runs see the same game. Bodies are encoded once per
+tick and carry an ETag; If-None-Match gets a 304 like the real CDN.
+
+    python loadtest/espn_standin.py [--port 8765] [--speed 60] [--tick 1.0]
+
+Point the app at it with ESPN_BASE_URL=http://127.0.0.1:8765.
+"""
+import argparse
+import copy
+import hashlib
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+
+QUARTER_SECONDS = 15 * 60
+GAME_SECONDS = 4 * QUARTER_SECONDS
+SCORING_CHANCE_EVERY = 150        # game seconds between scoring chances
+SCORE_VALUES = (0, 0, 0, 3, 7, 7)
+
+
+class SimulatedGame:
+    """One event: the recorded summary with a moving clock and score."""
+
+    def __init__(self, event_id: str, template: dict, speed: float, tick: float, kickoff: float):
+        self.event_id = event_id
+        self._template = template
+        self.speed = speed
+        self.tick = tick
+        self.kickoff = kickoff
+        self._rng_seed = event_id
+        self._cached_tick: int | None = None
+        self._body = b""
+        self._etag = ""
+        self.competition: dict = {}
+
+    def _elapsed(self, now: float) -> int:
+        return int(min(GAME_SECONDS, max(0.0, now - self.kickoff) * self.speed))
+
+    def _scores(self, elapsed: int) -> tuple[int, int]:
+        home = away = 0
+        for chance in range(elapsed // SCORING_CHANCE_EVERY):
+            rng = random.Random(f"{self._rng_seed}:{chance}")
+            points = rng.choice(SCORE_VALUES)
+            if rng.random() < 0.5:
+                home += points
+            else:
+                away += points
+        return home, away
+
+    def _build(self, elapsed: int) -> None:
+        data = copy.deepcopy(self._template)
+        data["header"]["id"] = self.event_id
+        comp = data["header"]["competitions"][0]
+        comp["id"] = self.event_id
+
+        home, away = self._scores(elapsed)
+        for c in comp.get("competitors", []):
+            c["score"] = str(home if c.get("homeAway") == "home" else away)
+
+        final = elapsed >= GAME_SECONDS
+        period = min(4, elapsed // QUARTER_SECONDS + 1)
+        left = 0 if final else QUARTER_SECONDS - (elapsed - (period - 1) * QUARTER_SECONDS)
+        clock = f"{left // 60}:{left % 60:02d}"
+        status = comp.setdefault("status", {})
+        status["period"] = period
+        status["displayClock"] = clock
+        status.setdefault("type", {})["state"] = "post" if final else "in"
+        status["type"]["completed"] = final
+
+        self.competition = comp
+        self._body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        self._etag = '"' + hashlib.blake2b(self._body, digest_size=12).hexdigest() + '"'
+
+    def body(self, now: float) -> tuple[bytes, str]:
+        tick = int((now - self.kickoff) / self.tick)
+        if tick != self._cached_tick:
+            self._build(self._elapsed(now))
+            self._cached_tick = tick
+        return self._body, self._etag
+
+
+def create_app(template_path: Path, speed: float, tick: float) -> FastAPI:
+    template = json.loads(template_path.read_text(encoding="utf-8"))
+    games: dict[str, SimulatedGame] = {}
+    stats = {"summary": 0, "not_modified": 0, "scoreboard": 0}
+    app = FastAPI(title="ESPN stand-in")
+
+    def game(event_id: str) -> SimulatedGame:
+        g = games.get(event_id)
+        if g is None:
+            # Kickoff is the first request for this event id.
+            g = games[event_id] = SimulatedGame(event_id, template, speed, tick, time.monotonic())
+        return g
+
+    @app.get("/summary")
+    async def summary(request: Request, event: str = "401769076"):
+        stats["summary"] += 1
+        body, etag = game(event).body(time.monotonic())
+        headers = {"ETag": etag, "Cache-Control": "max-age=0"}
+        if request.headers.get("if-none-match") == etag:
+            stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    @app.get("/scoreboard")
+    async def scoreboard():
+        stats["scoreboard"] += 1
+        now = time.monotonic()
+        events = []
+        for event_id, g in games.items():
+            g.body(now)
+            events.append({"id": event_id, "competitions": [g.competition]})
+        return {"events": events}
+
+    @app.get("/_stats")
+    async def standin_stats():
+        return {**stats, "games": len(games)}
+
+    return app
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--speed", type=float, default=60.0, help="game seconds per real second")
+    ap.add_argument("--tick", type=float, default=1.0, help="real seconds between body changes")
+    ap.add_argument("--template", type=Path, default=ROOT / "espn_response.json")
+    args = ap.parse_args(argv)
+    app = create_app(args.template, args.speed, args.tick)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
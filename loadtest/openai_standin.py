@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for an OpenAI-compatible /v1/chat/completions endpoint.
+
+Answers the app's numbered commentary prompts with a JSON array holding one
+canned line per item, after --delay seconds. Every --stall-every'th request
+sleeps --stall seconds instead, to exercise the LLM_BUDGET_S fallback.
+
+    python loadtest/openai_standin.py [--port 8766] [--delay 0.2] [--stall-every 0]
+
+Point the app at it with LLM_COMMENTARY=1, OPENAI_BASE_URL=http://127.0.0.1:8766/v1
+and any OPENAI_API_KEY.
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+
+import uvicorn
+from fastapi import FastAPI
+
+ITEM = re.compile(r"^\d+\.\s*\[(\w+)\]\s*(.*)$")
+
+
+def create_app(delay: float, stall_every: int, stall: float) -> FastAPI:
+    stats = {"requests": 0, "items": 0, "stalled": 0}
+    app = FastAPI(title="OpenAI stand-in")
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(body: dict):
+        stats["requests"] += 1
+        prompt = body["messages"][-1]["content"]
+        items = [m.groups() for m in map(ITEM.match, prompt.splitlines()) if m]
+        stats["items"] += len(items)
+        if stall_every and stats["requests"] % stall_every == 0:
+            stats["stalled"] += 1
+            await asyncio.sleep(stall)
+        else:
+            await asyncio.sleep(delay)
+        lines = [f"({kind}) {facts.split(',')[0]}. What a game." for kind, facts in items]
+        return {
+            "object": "chat.completion",
+            "model": body.get("model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(lines)},
+                "finish_reason": "stop",
+            }],
+        }
+
+    @app.get("/_stats")
+    async def standin_stats():
+        return stats
+
+    return app
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8766)
+    ap.add_argument("--delay", type=float, default=0.2, help="seconds per completion")
+    ap.add_argument("--stall-every", type=int, default=0, help="stall every Nth request (0 = never)")
+    ap.add_argument("--stall", type=float, default=30.0, help="seconds a stalled request takes")
+    args = ap.parse_args(argv)
+    uvicorn.run(create_app(args.delay, args.stall_every, args.stall), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
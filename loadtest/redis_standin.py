@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+In-memory stand-in for the few Redis commands app/backend.py uses.
+
+Speaks RESP2 over TCP: PING, AUTH, SELECT, GET, SET (NX/XX, PX/EX), MGET,
+DEL, PEXPIRE, PTTL, and EVAL for the lease scripts only (compare the key
+with ARGV[1], then PEXPIRE or DEL it; no Lua interpreter). Enough to run
+several workers against STATE_BACKEND=redis://127.0.0.1:6390/0 without
+installing Redis.
+
+    python loadtest/redis_standin.py [--port 6390]
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+
+class Store:
+    def __init__(self):
+        self.data: dict[bytes, bytes] = {}
+        self.expires: dict[bytes, float] = {}
+        self.commands = 0
+
+    def _live(self, key: bytes) -> bytes | None:
+        deadline = self.expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
+
+    def execute(self, args: list[bytes]):
+        self.commands += 1
+        cmd = args[0].upper().decode()
+        if cmd == "PING":
+            return "PONG"
+        if cmd in ("AUTH", "SELECT"):
+            return "OK"
+        if cmd == "GET":
+            return self._live(args[1])
+        if cmd == "MGET":
+            return [self._live(k) for k in args[1:]]
+        if cmd == "SET":
+            key, value = args[1], args[2]
+            opts = [a.upper() for a in args[3:]]
+            exists = self._live(key) is not None
+            if (b"NX" in opts and exists) or (b"XX" in opts and not exists):
+                return None
+            self.data[key] = value
+            self.expires.pop(key, None)
+            for unit, scale in ((b"PX", 0.001), (b"EX", 1.0)):
+                if unit in opts:
+                    self.expires[key] = time.monotonic() + int(opts[opts.index(unit) + 1]) * scale
+            return "OK"
+        if cmd == "DEL":
+            n = 0
+            for key in args[1:]:
+                if self._live(key) is not None:
+                    n += 1
+                    self.data.pop(key, None)
+                    self.expires.pop(key, None)
+            return n
+        if cmd == "PEXPIRE":
+            if self._live(args[1]) is None:
+                return 0
+            self.expires[args[1]] = time.monotonic() + int(args[2]) / 1000
+            return 1
+        if cmd == "PTTL":
+            if self._live(args[1]) is None:
+                return -2
+            deadline = self.expires.get(args[1])
+            return -1 if deadline is None else int((deadline - time.monotonic()) * 1000)
+        if cmd == "EVAL":
+            return self._eval(args[1].decode(), args[3:3 + int(args[2])], args[3 + int(args[2]):])
+        return Exception(f"ERR unknown command '{cmd}'")
+
+    def _eval(self, script: str, keys: list[bytes], argv: list[bytes]):
+        # The compare-and-set scripts in app/backend.py, recognised by shape.
+        if 'redis.call("GET", KEYS[1]) == ARGV[1]' not in script:
+            return Exception("ERR script not supported by the stand-in")
+        if self._live(keys[0]) != argv[0]:
+            return 0
+        if 'redis.call("PEXPIRE"' in script:
+            return self.execute([b"PEXPIRE", keys[0], argv[1]])
+        if 'redis.call("DEL"' in script:
+            return self.execute([b"DEL", keys[0]])
+        return Exception("ERR script not supported by the stand-in")
+
+
+def encode(value) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, Exception):
+        return b"-%s\r\n" % str(value).encode()
+    if isinstance(value, str):
+        return b"+%s\r\n" % value.encode()
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    return b"*%d\r\n" % len(value) + b"".join(encode(v) for v in value)
+
+
+async def read_command(reader: asyncio.StreamReader) -> list[bytes] | None:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.split()   # inline command (redis-cli / telnet)
+    args = []
+    for _ in range(int(line[1:])):
+        n = int((await reader.readline())[1:])
+        args.append((await reader.readexactly(n + 2))[:-2])
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=6390)
+    args = ap.parse_args(argv)
+    store = Store()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while (cmd := await read_command(reader)) is not None:
+                if cmd:
+                    writer.write(encode(store.execute(cmd)))
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve() -> None:
+        server = await asyncio.start_server(handle, args.host, args.port)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+"""
+Behavioural tests (`python -m pytest`). Timing benchmarks live in benchmarks/
+and run only when asked for: `python -m pytest benchmarks`.
+"""
+import os
+
+import pytest
+
+# Importing app.main must not poll, journal or share state with a running server.
+os.environ.setdefault("AUTO_POLL", "0")
+os.environ.setdefault("DEMO_MODE", "1")
+os.environ.setdefault("JOURNAL_ENABLED", "0")
+os.environ.setdefault("STATE_BACKEND", "memory")
+os.environ.setdefault("ASSET_CACHE", "0")
+os.environ.setdefault("LLM_COMMENTARY", "0")
+
+
+@pytest.fixture(autouse=True)
+def _runtime_dir(tmp_path, monkeypatch):
+    """Keep runtime/state.json (tracked) untouched: persistence writes under tmp_path."""
+    from app import persist
+
+    monkeypatch.setattr(persist, "RUNTIME_DIR", tmp_path)
+    monkeypatch.setattr(persist, "STATE_PATH", tmp_path / "state.json")
+    return tmp_path
@@ -0,0 +1,111 @@
+import asyncio
+import itertools
+
+import pytest
+
+from app import ai_engine
+from app.ai_engine import commentary_batch, live_commentary, mendoza_watch, winprob_explain
+
+# The branching rules the decision tables were compiled from, kept as the oracle
+# (the one change: a blowout with no quarter used to raise on `None >= 3`).
+
+
+def _live_reference(s: dict) -> str:
+    hs, ays, q = s["home_score"], s["away_score"], s["quarter"]
+    home, away = s["home_team"], s["away_team"]
+    if s["status"] == "pregame":
+        return f"Pregame: {away} at {home}. Teams warming up, kickoff approaching."
+    margin = abs(hs - ays)
+    leader, trailer = (home, away) if hs > ays else (away, home)
+    if hs == ays:
+        if q == 4:
+            return f"Tied {hs}-{ays} in the 4th quarter! Every possession crucial."
+        if q == 3:
+            return f"All square at {hs}-{ays}. Third quarter - game still wide open."
+        return f"Score tied {hs}-{hs}. Both teams trading blows early."
+    if margin <= 8:
+        if q == 4:
+            return f"{leader} leads {hs}-{ays} in crunch time. {trailer} needs a stop here."
+        if q == 3:
+            return f"{leader} up {hs}-{ays}. One-score game heading into the 4th."
+        return f"{leader} holds slim {hs}-{ays} advantage. Still anyone's game."
+    if margin <= 16:
+        if q == 4:
+            return f"{leader} leads {hs}-{ays} late. {trailer} needs scores on consecutive drives."
+        return f"{leader} building momentum, up {hs}-{ays}. {trailer} needs an answer."
+    if q is not None and q >= 3:
+        return f"{leader} in command {hs}-{ays}. Dominant performance unfolding."
+    return f"{leader} jumps ahead {hs}-{ays}. Early statement being made."
+
+
+def _winprob_reference(s: dict) -> str:
+    q, margin = s["quarter"], abs(s["home_score"] - s["away_score"])
+    if s["status"] == "pregame":
+        return "Even odds before kickoff"
+    if s["status"] == "final":
+        return "Game complete"
+    if q == 1:
+        return "Early - score margin has less predictive weight"
+    if q == 2:
+        return "Close at halftime - game very much in flux" if margin <= 7 else "Lead established but plenty of time remains"
+    if q == 3:
+        return "One possession game in 3rd - critical juncture" if margin <= 3 else "Margin grows more significant as time dwindles"
+    if q == 4:
+        if margin <= 7:
+            return "Late one-score game - single drive can flip outcome"
+        if margin <= 14:
+            return "Two-score lead late - needs multiple possessions to overcome"
+        return "Commanding lead with clock becoming a factor"
+    return "Win probability based on score margin and time remaining"
+
+
+def _states():
+    for hs, ays, q, status in itertools.product(
+        range(0, 45, 3), (0, 7, 10, 17, 24), (None, 0, 1, 2, 3, 4, 5, 6), ("pregame", "live", "final"),
+    ):
+        yield {"home_team": "Miami", "away_team": "Indiana", "home_score": hs, "away_score": ays,
+               "quarter": q, "status": status}
+
+
+def test_compiled_tables_match_the_rules():
+    for s in _states():
+        assert live_commentary(s) == _live_reference(s), s
+        assert winprob_explain(s) == _winprob_reference(s), s
+
+
+@pytest.mark.parametrize("line, expected", [
+    ({"pass_yds": None}, "Player stats not yet available. Check back after first quarter."),
+    ({"pass_yds": 301, "td": 3, "int": 0},
+     "301 passing yards, 3 TD, 0 INT. Outstanding passing day. Clean decision-making, protecting the football."),
+    ({"pass_yds": 200, "td": 2, "int": 1},
+     "200 passing yards, 2 TD, 1 INT. Steady performance. More positives than negatives."),
+    ({"pass_yds": 45, "td": 0, "int": 2},
+     "45 passing yards, 0 TD, 2 INT. Limited passing output. Struggling with ball security."),
+])
+def test_player_watch_lines(line, expected):
+    assert mendoza_watch({"mendoza": line}) == expected
+
+
+def test_lines_are_memoized_on_their_inputs():
+    s = {"home_team": "Oregon", "away_team": "Penn State", "home_score": 31, "away_score": 28,
+         "quarter": 4, "status": "live"}
+    live_commentary(s)
+    hits = ai_engine.live_commentary_text.cache_info().hits
+    assert live_commentary(dict(s)) == "Oregon leads 31-28 in crunch time. Penn State needs a stop here."
+    assert ai_engine.live_commentary_text.cache_info().hits == hits + 1
+
+
+def test_batch_and_async_wrappers_agree_with_the_sync_lines():
+    states = list(itertools.islice(_states(), 0, 600, 7))
+    batch = commentary_batch(states)
+    assert [b["commentary"] for b in batch] == [live_commentary(s) for s in states]
+    assert [b["winprob"] for b in batch] == [winprob_explain(s) for s in states]
+    s = states[-1]
+    assert asyncio.run(ai_engine.ai_live_commentary({"state": s})) == live_commentary(s)
+    assert asyncio.run(ai_engine.ai_winprob_explain(s, 0.5)) == winprob_explain(s)
+
+
+def test_blowout_without_a_quarter_is_an_early_line():
+    s = {"home_team": "Miami", "away_team": "Indiana", "home_score": 27, "away_score": 3,
+         "quarter": None, "status": "live"}
+    assert live_commentary(s) == "Miami jumps ahead 27-3. Early statement being made."
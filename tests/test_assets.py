@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import assets
+from app.assets import IMMUTABLE, AssetStaticFiles
+from app.config import settings
+
+LOGO = "https://example.test/logos/indiana.png"
+
+
+@pytest.fixture
+def asset_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "ASSET_DIR", tmp_path / "static" / "assets")
+    monkeypatch.setattr(assets, "MANIFEST_PATH", tmp_path / "runtime" / "assets.json")
+    monkeypatch.setattr(assets, "_local", {})
+    monkeypatch.setattr(assets, "Image", None)   # keep the bytes as given, Pillow or not
+    return assets.ASSET_DIR
+
+
+def test_file_name_follows_the_content(asset_dir):
+    first = assets._write_asset("indiana", b"logo v1", ".png", assets.TEAM_LOGO_SIZE)
+    assert first.startswith("indiana-") and first.endswith(".png")
+    assert assets._write_asset("indiana", b"logo v1", ".png", assets.TEAM_LOGO_SIZE) == first
+    second = assets._write_asset("indiana", b"logo v2", ".png", assets.TEAM_LOGO_SIZE)
+    assert second != first
+    assert (asset_dir / first).read_bytes() == b"logo v1"
+    assert (asset_dir / second).read_bytes() == b"logo v2"
+
+
+def test_warm_cache_serves_seeded_copies(asset_dir, tmp_path, monkeypatch):
+    seed = tmp_path / "seed"
+    seed.mkdir()
+    (seed / "indiana.png").write_bytes(b"seeded logo")
+    monkeypatch.setattr(settings, "asset_cache", True)
+    monkeypatch.setattr(settings, "asset_seed_dir", str(seed))
+    monkeypatch.setattr(assets, "TEAM_LOGOS", {"indiana": LOGO})
+    monkeypatch.setattr(assets, "PLAYER_IMAGES", {})
+
+    assert assets.team_logo_url("Indiana") == LOGO   # remote until cached
+    assert asyncio.run(assets.warm_asset_cache()) == 1
+    local = assets.team_logo_url("Indiana")
+    assert local.startswith("/static/assets/indiana-")
+    assert (asset_dir / local.rsplit("/", 1)[1]).read_bytes() == b"seeded logo"
+    assert json.loads(assets.MANIFEST_PATH.read_text()) == {LOGO: local.rsplit("/", 1)[1]}
+    assert asyncio.run(assets.warm_asset_cache()) == 0
+
+
+def test_only_hashed_assets_are_immutable(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "indiana-0a1b2c3d4e5f.png").write_bytes(b"png")
+    (tmp_path / "app.css").write_text("body {}")
+    app = FastAPI()
+    app.mount("/static", AssetStaticFiles(directory=tmp_path), name="static")
+    client = TestClient(app)
+
+    hashed = client.get("/static/assets/indiana-0a1b2c3d4e5f.png")
+    assert hashed.status_code == 200
+    assert hashed.headers["cache-control"] == IMMUTABLE
+    revalidated = client.get("/static/assets/indiana-0a1b2c3d4e5f.png",
+                             headers={"If-None-Match": hashed.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["cache-control"] == IMMUTABLE
+    assert "immutable" not in client.get("/static/app.css").headers.get("cache-control", "")
@@ -0,0 +1,148 @@
+import asyncio
+import time
+
+from app.backend import LEASE_NAME, RedisBackend, SharedState, SQLiteBackend
+from app.store import MemoryStore
+from loadtest.redis_standin import Store, encode, read_command
+
+
+def _pair(tmp_path):
+    db = str(tmp_path / "shared.db")
+    return SQLiteBackend(db), SQLiteBackend(db)
+
+
+def test_lease_is_exclusive_until_it_expires(tmp_path):
+    a, b = _pair(tmp_path)
+
+    async def main():
+        assert await a.acquire("a", 0.2)
+        assert not await b.acquire("b", 0.2)
+        assert await a.acquire("a", 0.2)          # renewal by the holder
+        await asyncio.sleep(0.3)
+        assert await b.acquire("b", 0.2)          # lapsed: taken over
+        assert not await a.acquire("a", 0.2)
+
+    asyncio.run(main())
+
+
+def test_release_only_drops_own_lease(tmp_path):
+    a, b = _pair(tmp_path)
+
+    async def main():
+        assert await a.acquire("a", 5)
+        await b.release("b")
+        assert not await b.acquire("b", 5)
+        await a.release("a")
+        assert await b.acquire("b", 5)
+
+    asyncio.run(main())
+
+
+async def _redis_standin():
+    store = Store()
+
+    async def handle(reader, writer):
+        while (cmd := await read_command(reader)) is not None:
+            writer.write(encode(store.execute(cmd)))
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, store, f"redis://127.0.0.1:{server.sockets[0].getsockname()[1]}/0"
+
+
+def test_redis_lease_renew_and_release_are_owner_checked():
+    async def main():
+        server, store, url = await _redis_standin()
+        a, b = RedisBackend(url), RedisBackend(url)
+        key = (a.prefix + LEASE_NAME).encode()
+        assert await a.acquire("a", 0.2)
+        assert not await b.acquire("b", 0.2)
+        assert await a.acquire("a", 0.2)          # renewal by the holder
+        await asyncio.sleep(0.3)
+        assert await b.acquire("b", 5)            # lapsed: taken over
+        assert not await a.acquire("a", 5)        # the old holder must not extend b's lease
+        await a.release("a")                      # ...nor delete it
+        assert store.data[key] == b"b"
+        await b.release("b")
+        assert key not in store.data
+        await a.close()
+        await b.close()
+        server.close()
+
+    asyncio.run(main())
+
+
+def test_follower_restores_leader_snapshot(tmp_path):
+    backend_a, backend_b = _pair(tmp_path)
+    leader_store, follower_store = MemoryStore(game_id="g"), MemoryStore(game_id="g")
+    leader = SharedState(backend_a, lease_s=5, sync_s=60)
+    follower = SharedState(backend_b, lease_s=5, sync_s=60)
+    leader.attach({"g": leader_store})
+    restored = []
+    follower.attach({"g": follower_store}, on_restore=restored.append)
+
+    async def main():
+        await leader._renew()
+        await follower._renew()
+        assert leader.is_leader and not follower.is_leader
+        leader_store.commentary.append("Indiana opens the scoring")
+        leader_store.version += 1
+        await leader.flush()
+        await follower.sync()
+        await follower.sync()                      # unchanged version: no second restore
+
+    asyncio.run(main())
+    assert follower_store.commentary.latest() == ["Indiana opens the scoring"]
+    assert restored == [follower_store]
+    assert follower.restores == 1
+
+
+class _FlakyBackend(SQLiteBackend):
+    fail = False
+
+    async def acquire(self, owner, ttl_s):
+        if self.fail:
+            raise ConnectionError("backend unreachable")
+        return await super().acquire(owner, ttl_s)
+
+
+def test_leadership_dropped_when_renewal_fails(tmp_path):
+    shared = SharedState(_FlakyBackend(str(tmp_path / "shared.db")), lease_s=5, sync_s=60)
+
+    async def main():
+        await shared._renew()
+        assert shared.is_leader
+        shared.backend.fail = True
+        try:
+            await shared._renew()
+        except ConnectionError:
+            pass
+        assert not shared.is_leader
+        shared.backend.fail = False
+        await shared._renew()
+        assert shared.is_leader
+
+    asyncio.run(main())
+
+
+def test_leadership_lapses_without_a_successful_renewal(tmp_path):
+    shared = SharedState(SQLiteBackend(str(tmp_path / "shared.db")), lease_s=0.1, sync_s=60)
+    asyncio.run(shared._renew())
+    assert shared.is_leader
+    time.sleep(0.15)                               # e.g. a renewal stuck on a dead connection
+    assert not shared.is_leader
+
+
+def test_admin_writes_rejected_on_follower(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app import main
+
+    follower = SharedState(SQLiteBackend(str(tmp_path / "shared.db")), lease_s=5, sync_s=60)
+    monkeypatch.setattr(main, "SHARED", follower)
+    main.STORE.commentary.append("kept on the follower")
+    client = TestClient(main.app)
+    assert client.post("/admin/clear/commentary").status_code == 409
+    assert client.post(f"/admin/replay/{main.STORE.game_id}", params={"index": 0}).status_code == 409
+    assert "kept on the follower" in main.STORE.commentary.latest()
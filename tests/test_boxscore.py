@@ -0,0 +1,49 @@
+from app.boxscore import extract_players
+
+
+def _boxscore(*athletes):
+    """boxscore.players with one passing category; athletes are (id, name, yards)."""
+    return [{
+        "team": {"displayName": "Indiana Hoosiers"},
+        "statistics": [{
+            "name": "passing",
+            "keys": ["completions/passingAttempts", "passingYards", "passingTouchdowns", "interceptions"],
+            "athletes": [
+                {"athlete": {"id": athlete_id, "displayName": name}, "stats": ["10/15", str(yds), "1", "0"]}
+                for athlete_id, name, yds in athletes
+            ],
+        }],
+    }]
+
+
+def test_fragment_resolved_in_one_game_does_not_pin_another():
+    primary, _ = extract_players(_boxscore(("1", "Tyler Smith", 120)), ["Smith"], game_id="game-a")
+    assert primary.athlete_id == "1"
+    primary, _ = extract_players(
+        _boxscore(("2", "Jordan Smith", 80), ("1", "Tyler Smith", 40)), ["Smith"], game_id="game-b",
+    )
+    assert primary.athlete_id == "2"
+    assert primary.pass_yds == 80
+
+
+def test_pinned_player_missing_from_boxscore_is_resolved_again():
+    extract_players(_boxscore(("1", "Tyler Smith", 120)), ["Smith"], game_id="g")
+    primary, players = extract_players(_boxscore(("3", "Sam Smith", 55)), ["Smith"], game_id="g")
+    assert primary.athlete_id == "3"
+    assert players == (primary,)
+    primary, _ = extract_players(_boxscore(("3", "Sam Smith", 70)), ["Smith"], game_id="g")
+    assert (primary.athlete_id, primary.pass_yds) == ("3", 70)
+
+
+def test_untracked_player_yields_nothing():
+    assert extract_players(_boxscore(("1", "Tyler Smith", 120)), ["Nobody Here"], game_id="g") == (None, ())
+    assert extract_players([], ["Smith"]) == (None, ())
+
+
+def test_overlapping_specs_list_a_player_once():
+    box = _boxscore(("4837248", "Fernando Mendoza", 200), ("9", "Tyler Smith", 30))
+    for specs in (["Fernando Mendoza", "Mendoza"], ["Fernando Mendoza", "4837248", "Smith"]):
+        primary, players = extract_players(box, specs, game_id="overlap")
+        assert primary.athlete_id == "4837248"
+        assert [p.athlete_id for p in players].count("4837248") == 1
+    assert [p.athlete_id for p in players] == ["4837248", "9"]
@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+def _setting(name: str, **env) -> str:
+    # Settings reads the environment at import time: probe in a fresh interpreter.
+    base = {k: v for k, v in os.environ.items() if not k.startswith(("LLM_", "OPENAI_", "JOURNAL_"))}
+    probe = f"from app.config import settings; print(settings.{name})"
+    return subprocess.run([sys.executable, "-c", probe], env={**base, **env},
+                          capture_output=True, text=True, check=True).stdout.strip()
+
+
+def _llm_enabled(**env) -> bool:
+    return _setting("llm_enabled", **env) == "True"
+
+
+@pytest.mark.parametrize("env, enabled", [
+    ({"OPENAI_API_KEY": "sk-test"}, False),                          # a key alone is not consent
+    ({"OPENAI_API_KEY": "sk-test", "LLM_COMMENTARY": "0"}, False),
+    ({"LLM_COMMENTARY": "1"}, False),                                # nothing to call
+    ({"OPENAI_API_KEY": "sk-test", "LLM_COMMENTARY": "1"}, True),
+])
+def test_llm_commentary_is_opt_in(env, enabled):
+    assert _llm_enabled(**env) is enabled
+
+
+def test_journal_is_opt_in():
+    assert _setting("journal_enabled") == "False"
+    assert _setting("journal_enabled", JOURNAL_ENABLED="1") == "True"
@@ -0,0 +1,61 @@
+import copy
+import dataclasses
+import json
+import pickle
+
+import pytest
+
+from app.boxscore import PlayerLine
+from app.game_logic import GameState, StateChange, diff_states
+
+MENDOZA = PlayerLine("Fernando Mendoza", "4837248", "Indiana Hoosiers", 6, 9, 62, 0, 0, 1, 2, 0)
+
+STATES = [
+    GameState("Miami", "Indiana", 21, 24, "live", 3, "4:10", 233, 2, 0),
+    GameState("Miami", "Indiana", 21, 24, "live", 3, "4:10", 62, 0, 0, (MENDOZA,)),
+]
+
+
+@pytest.mark.parametrize("state", STATES, ids=["no players", "players"])
+@pytest.mark.parametrize("form", ["to_dict", "asdict"])
+def test_from_dict_round_trip(state, form):
+    d = state.to_dict() if form == "to_dict" else dataclasses.asdict(state)
+    restored = GameState.from_dict(json.loads(json.dumps(d)))   # as read back from disk / the backend
+    assert restored == state
+    assert hash(restored) == hash(state)
+    assert isinstance(restored.players, tuple)
+    assert diff_states(state, restored) == StateChange.NONE
+
+
+def test_from_dict_accepts_records_without_players():
+    record = dataclasses.asdict(STATES[0])
+    del record["players"]
+    assert GameState.from_dict(record) == STATES[0]
+
+
+@pytest.mark.parametrize("state", STATES, ids=["no players", "players"])
+@pytest.mark.parametrize("clone", [copy.copy, copy.deepcopy, lambda s: pickle.loads(pickle.dumps(s))],
+                         ids=["copy", "deepcopy", "pickle"])
+def test_copy_and_pickle_keep_working_caches(state, clone):
+    state.to_json()                                   # caches filled before cloning
+    restored = clone(state)
+    assert restored == state
+    assert hash(restored) == hash(state)
+    assert restored.to_dict() == state.to_dict()
+    assert restored.to_json() == state.to_json()
+
+
+@pytest.mark.parametrize("changes, expected", [
+    ({"home_score": 28}, StateChange.SCORE),
+    ({"quarter": 4, "clock": "15:00"}, StateChange.QUARTER | StateChange.CLOCK),
+    ({"status": "final"}, StateChange.STATUS),
+    ({"away_team": "Ohio State"}, StateChange.TEAMS),
+    ({"mendoza_td": 3}, StateChange.PLAYER),
+    ({"players": (MENDOZA,)}, StateChange.PLAYER),
+])
+def test_diff_states_flags(changes, expected):
+    prev = STATES[0]
+    diff = diff_states(prev, dataclasses.replace(prev, **changes))
+    assert diff == expected
+    assert type(diff) is StateChange
+    assert diff_states(None, prev) == StateChange.ALL
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.game_logic import GameState
+from app.http_cache import pick_encoding
+from app.main import STORE, _touch, app
+
+
+@pytest.fixture
+def client():
+    # No `with`: the lifespan (poller, shared state, asset warm-up) stays off.
+    return TestClient(app)
+
+
+def _change(text: str) -> None:
+    STORE.commentary.append(text)
+    _touch(STORE)
+
+
+def test_state_answers_304_for_current_etag(client):
+    _change("etag test: first")
+    first = client.get("/api/state")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    again = client.get("/api/state", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+
+def test_state_change_invalidates_etag(client):
+    _change("etag test: before")
+    etag = client.get("/api/state").headers["etag"]
+    _change("etag test: after")
+    resp = client.get("/api/state", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+    assert "etag test: after" in resp.json()["commentary"]
+
+
+def test_state_gzip_variant(client):
+    _change("etag test: gzip")
+    resp = client.get("/api/state", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert "etag test: gzip" in resp.json()["commentary"]
+
+
+def test_pick_encoding_honours_q0():
+    assert pick_encoding("gzip;q=0, identity") == "identity"
+    assert pick_encoding("deflate, gzip") == "gzip"
+    assert pick_encoding(None) == "identity"
+
+
+def test_each_encoding_has_its_own_etag(client):
+    _change("etag test: variants")
+    plain = client.get("/api/state", headers={"Accept-Encoding": "identity"}).headers["etag"]
+    zipped = client.get("/api/state", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    assert zipped != plain
+    assert zipped == plain[:-1] + '-gzip"'
+    again = client.get("/api/state", headers={"Accept-Encoding": "gzip", "If-None-Match": zipped})
+    assert again.status_code == 304
+    other = client.get("/api/state", headers={"Accept-Encoding": "identity", "If-None-Match": zipped})
+    assert other.status_code == 200
+
+
+def test_unchanged_poll_keeps_etag(client, monkeypatch):
+    state = GameState("Miami", "Indiana", 7, 10, "live", 2, "8:00")
+
+    async def same_state(game_id):
+        return state
+
+    monkeypatch.setattr(main, "fetch_state", same_state)
+    assert asyncio.run(main.poll_game(STORE))
+    version = STORE.version
+    etag = client.get("/api/state").headers["etag"]
+    assert not asyncio.run(main.poll_game(STORE))
+    assert STORE.version == version
+    assert client.get("/api/state", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_dashboard_is_rendered_once_per_version(client, monkeypatch):
+    _change("dashboard test: first")
+    first = client.get("/")
+    assert first.status_code == 200
+    assert first.headers["cache-control"].startswith("public, max-age=0, s-maxage=")
+    assert "dashboard test: first" in first.text
+    etag = first.headers["etag"]
+
+    renders = []
+    monkeypatch.setattr(main, "_render_html", lambda store: renders.append(store) or b"rendered")
+    again = client.get("/", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert client.get("/").text == first.text
+    assert renders == []
+
+    _change("dashboard test: second")
+    changed = client.get("/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.text == "rendered"
+    assert renders == [STORE]
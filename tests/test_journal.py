@@ -0,0 +1,94 @@
+import os
+
+from app.game_logic import GameState
+from app.journal import Journal, parse_game_time
+
+
+def _state(quarter, clock, home=0):
+    return GameState("Miami", "Indiana", home, 0, "live", quarter, clock)
+
+
+def test_append_and_read_back(tmp_path):
+    journal = Journal(tmp_path)
+    assert journal.append("g", _state(1, "15:00"), ts=1.0) == 1
+    assert journal.append("g", _state(1, "9:30", home=7), ts=2.0) == 2
+    journal.close()
+    with journal.reader("g") as reader:
+        assert len(reader) == 2
+        entry = reader.entry(1)
+        assert entry["seq"] == 2
+        assert entry["elapsed"] == 330
+        assert entry["state"]["home_score"] == 7
+        assert entry["state"]["clock"] == "9:30"
+        assert reader.position_of_seq(2) == 1
+        assert reader.position_of_seq(3) is None
+
+
+def test_seq_continues_after_reopen(tmp_path):
+    journal = Journal(tmp_path)
+    journal.append("g", _state(1, "15:00"))
+    journal.close()
+    journal = Journal(tmp_path)
+    assert journal.append("g", _state(1, "14:00")) == 2
+    journal.close()
+
+
+def test_position_at_game_clock(tmp_path):
+    journal = Journal(tmp_path)
+    for q, clock in ((1, "15:00"), (1, "5:00"), (2, "10:00"), (3, "1:00")):
+        journal.append("g", _state(q, clock))
+    journal.close()
+    with journal.reader("g") as reader:
+        assert reader.position_at(parse_game_time("Q1 05:00")) == 1
+        assert reader.position_at(parse_game_time("Q2 14:00")) == 2
+        assert reader.position_at(parse_game_time("Q4 15:00")) == 4
+
+
+def test_position_at_survives_out_of_order_clock(tmp_path):
+    journal = Journal(tmp_path)
+    for q, clock in ((1, "5:00"), (2, "10:00"), (1, "14:00"), (3, "1:00")):   # a stray Q1 clock
+        journal.append("g", _state(q, clock))
+    journal.close()
+    journal = Journal(tmp_path)
+    journal.append("g", _state(2, "1:00"))        # after a reopen the max carries on
+    journal.close()
+    with journal.reader("g") as reader:
+        assert reader.position_at(parse_game_time("Q2 14:00")) == 1
+        assert reader.position_at(parse_game_time("Q3 10:00")) == 3
+        assert reader.position_at(parse_game_time("Q4 15:00")) == 5
+        assert reader.entry(2)["elapsed"] == 60  # the line keeps the real clock
+
+
+def test_torn_tail_is_dropped_on_reopen(tmp_path):
+    journal = Journal(tmp_path)
+    for clock in ("15:00", "12:00", "9:00"):
+        journal.append("g", _state(1, clock))
+    journal.close()
+    data_path, index_path = journal.paths("g")
+    with open(index_path, "ab") as f:
+        f.write(b"\x04\x00\x00")                   # half an index record
+    with open(data_path, "ab") as f:
+        f.write(b'{"seq":4,"ts"')                  # an unindexed, unfinished line
+
+    journal = Journal(tmp_path)
+    assert journal.append("g", _state(1, "6:00")) == 4
+    journal.close()
+    with journal.reader("g") as reader:
+        assert len(reader) == 4
+        assert [e["state"]["clock"] for e in reader.entries(0, 10)] == ["15:00", "12:00", "9:00", "6:00"]
+
+
+def test_index_record_past_end_of_data_is_dropped(tmp_path):
+    journal = Journal(tmp_path)
+    for clock in ("15:00", "12:00"):
+        journal.append("g", _state(1, clock))
+    journal.close()
+    data_path, _ = journal.paths("g")
+    os.truncate(data_path, data_path.stat().st_size - 5)   # the last line lost its end
+
+    journal = Journal(tmp_path)
+    assert journal.append("g", _state(1, "11:00")) == 2
+    journal.close()
+    with journal.reader("g") as reader:
+        assert [e["seq"] for e in reader.entries(0, 10)] == [1, 2]
+        assert reader.entry(1)["state"]["clock"] == "11:00"
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import time
+
+import httpx
+
+from app.llm import LLMCommentary
+
+STATE = {"home_team": "Miami", "away_team": "Indiana", "home_score": 7, "away_score": 3,
+         "status": "live", "quarter": 2, "clock": "4:00"}
+
+
+class FakeModel:
+    """OpenAI-compatible /chat/completions: one line per numbered prompt, after `delay` seconds."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls: list[list[str]] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        prompts = json.loads(request.content)["messages"][1]["content"].splitlines()
+        self.calls.append(prompts)
+        await asyncio.sleep(self.delay)
+        lines = [f"model line {i}" for i in range(1, len(prompts) + 1)]
+        return httpx.Response(200, json={"choices": [{"message": {"content": json.dumps(lines)}}]})
+
+
+def _llm(model: FakeModel, budget_s: float = 1.0, batch_window_s: float = 0.01) -> LLMCommentary:
+    return LLMCommentary("http://llm.test/v1", "test", "fake", budget_s=budget_s,
+                         batch_window_s=batch_window_s, transport=httpx.MockTransport(model))
+
+
+def test_stalled_request_falls_back_within_budget():
+    model = FakeModel(delay=5)
+    llm = _llm(model, budget_s=0.1)
+
+    async def main():
+        start = time.perf_counter()
+        line = await llm.line("k", "commentary", STATE, "rule-based line")
+        elapsed = time.perf_counter() - start
+        await llm.close()
+        return line, elapsed
+
+    line, elapsed = asyncio.run(main())
+    assert line == "rule-based line"
+    assert elapsed < 0.5
+    assert llm.fallbacks == 1
+
+
+def test_late_answer_fills_the_cache_for_the_next_poll():
+    model = FakeModel(delay=0.15)
+    llm = _llm(model, budget_s=0.05)
+
+    async def main():
+        first = await llm.line("k", "commentary", STATE, "rule-based line")
+        await asyncio.sleep(0.3)
+        second = await llm.line("k", "commentary", STATE, "rule-based line")
+        await llm.close()
+        return first, second
+
+    assert asyncio.run(main()) == ("rule-based line", "model line 1")
+    assert len(model.calls) == 1
+    assert llm.cache_hits == 1
+
+
+def test_repoll_of_same_state_is_a_cache_hit():
+    model = FakeModel()
+    llm = _llm(model)
+
+    async def main():
+        lines = [await llm.line(("Miami", "Indiana", 1), "commentary", STATE, "fallback") for _ in range(3)]
+        await llm.close()
+        return lines
+
+    assert asyncio.run(main()) == ["model line 1"] * 3
+    assert len(model.calls) == 1
+    assert llm.cache_hits == 2
+
+
+def test_lines_inside_the_batch_window_share_one_request():
+    model = FakeModel()
+    llm = _llm(model, batch_window_s=0.05)
+
+    async def main():
+        lines = await asyncio.gather(*(
+            llm.line(("game", i), "commentary", dict(STATE, home_score=i), "fallback") for i in range(3)
+        ))
+        await llm.close()
+        return lines
+
+    assert asyncio.run(main()) == ["model line 1", "model line 2", "model line 3"]
+    assert len(model.calls) == 1
+    assert len(model.calls[0]) == 3
+    assert llm.batches == 1
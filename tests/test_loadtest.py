@@ -0,0 +1,90 @@
+import asyncio
+import json
+import math
+import random
+import time
+from pathlib import Path
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app import data_sources, main
+from app.data_sources import fetch_live_espn_state
+from loadtest.driver import Results, client_loop, parse_mix, percentile
+from loadtest.espn_standin import GAME_SECONDS, SimulatedGame, create_app
+
+ESPN_RESPONSE = Path(__file__).resolve().parents[1] / "espn_response.json"
+
+
+def test_standin_answers_304_for_current_etag():
+    client = TestClient(create_app(ESPN_RESPONSE, speed=60.0, tick=60.0))
+    first = client.get("/summary", params={"event": "900000001"})
+    assert first.status_code == 200
+    assert first.json()["header"]["id"] == "900000001"
+    again = client.get("/summary", params={"event": "900000001"},
+                       headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert client.get("/_stats").json() == {"summary": 2, "not_modified": 1, "scoreboard": 0, "games": 1}
+
+
+def test_simulated_game_is_seeded_and_runs_to_final():
+    template = json.loads(ESPN_RESPONSE.read_text(encoding="utf-8"))
+    a = SimulatedGame("900000001", template, speed=1.0, tick=1.0, kickoff=0.0)
+    b = SimulatedGame("900000001", template, speed=1.0, tick=1.0, kickoff=0.0)
+    assert a.body(1800.0) == b.body(1800.0)
+
+    state = data_sources.parse_summary(json.loads(a.body(1800.0)[0]))
+    assert (state.status, state.quarter, state.clock) == ("live", 3, "15:00")
+
+    final = data_sources.parse_summary(json.loads(a.body(GAME_SECONDS + 5.0)[0]))
+    assert final.status == "final"
+    assert (final.home_score, final.away_score) == a._scores(GAME_SECONDS)
+
+
+def test_app_polls_the_standin_with_validators(monkeypatch):
+    standin = create_app(ESPN_RESPONSE, speed=60.0, tick=60.0)
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=standin))
+    monkeypatch.setattr(data_sources, "_client", client)
+    monkeypatch.setattr(data_sources, "_validators", {})
+    monkeypatch.setattr(data_sources, "ESPN_SUMMARY_URL", "http://standin/summary")   # ESPN_BASE_URL
+    not_modified = data_sources.UPSTREAM.not_modified
+
+    async def run():
+        first = await fetch_live_espn_state("900000002")
+        second = await fetch_live_espn_state("900000002")
+        stats = (await client.get("http://standin/_stats")).json()
+        await client.aclose()
+        return first, second, stats
+
+    first, second, stats = asyncio.run(run())
+    assert second is first
+    assert data_sources.UPSTREAM.not_modified == not_modified + 1
+    assert stats["not_modified"] == 1
+
+
+def test_driver_mix_and_percentiles():
+    assert parse_mix("/=1,/api/state=8, /admin/poll=1") == [("/", 1.0), ("/api/state", 8.0), ("/admin/poll", 1.0)]
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 95) == 0.095
+    assert percentile(values, 99) == 0.099
+    assert percentile(values, 100) == 0.1
+    assert math.isnan(percentile([], 50))
+
+
+def test_driver_client_revalidates_with_etags():
+    results = Results()
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://app") as client:
+            deadline = time.monotonic() + 0.3
+            await client_loop(client, [("/api/state", 1.0)], 0.01, deadline, results, random.Random(1))
+
+    asyncio.run(run())
+    report = results.summary(0.3)
+    requests = report["routes"]["/api/state"]["requests"]
+    assert requests > 1
+    assert report["total"]["errors"] == 0
+    # Nothing changes between polls: every request after the first is a 304.
+    assert report["not_modified"] == requests - 1
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.game_logic import GameState
+from app.metrics import Callback, Counter, Histogram, Registry
+
+
+def _samples(text: str) -> dict[str, float]:
+    return {line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+            for line in text.splitlines() if line and not line.startswith("#")}
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    h = registry.register(Histogram("t_seconds", "test", ("stage",), buckets=(0.1, 1.0)))
+    parse = h.labels("parse")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        parse.observe(value)
+    text = registry.render()
+    assert "# TYPE t_seconds histogram" in text
+    assert _samples(text) == {
+        't_seconds_bucket{stage="parse",le="0.1"}': 2,     # le is inclusive
+        't_seconds_bucket{stage="parse",le="1"}': 3,
+        't_seconds_bucket{stage="parse",le="+Inf"}': 4,
+        't_seconds_sum{stage="parse"}': 3.65,
+        't_seconds_count{stage="parse"}': 4,
+    }
+
+
+def test_counters_labels_and_callbacks_render():
+    registry = Registry()
+    c = registry.register(Counter("t_total", "test", ("result",)))
+    c.labels("changed").inc()
+    c.labels('say "hi"\n').inc(2)
+    registry.register(Callback("t_clients", "test", lambda: 3))
+    text = registry.render()
+    assert "# TYPE t_clients gauge" in text
+    assert _samples(text) == {
+        't_total{result="changed"}': 1,
+        't_total{result="say \\"hi\\"\\n"}': 2,
+        "t_clients": 3,
+    }
+    assert c.labels("changed") is c.labels("changed")
+    with pytest.raises(ValueError):
+        c.labels("a", "b")
+    with pytest.raises(ValueError):
+        registry.register(Counter("t_total", "again"))
+
+
+def test_metrics_endpoint_reports_polls(monkeypatch):
+    client = TestClient(main.app)
+    scores = iter(range(3, 100, 3))
+
+    async def fetch(game_id):
+        return GameState("Miami", "Indiana", next(scores), 0, "live", 2, "9:00")
+
+    monkeypatch.setattr(main, "fetch_state", fetch)
+    before = _samples(client.get("/metrics").text)
+    asyncio.run(main.poll_game(main.STORE))
+    resp = client.get("/metrics")
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = _samples(resp.text)
+
+    changed = 'cfp_polls_total{result="changed"}'
+    assert after[changed] == before.get(changed, 0) + 1
+    diff = 'cfp_poll_stage_seconds_count{stage="diff"}'
+    assert after[diff] == before.get(diff, 0) + 1
+    assert "cfp_upstream_requests_total" in after
+    assert "cfp_stream_clients" in after
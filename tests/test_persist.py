@@ -0,0 +1,44 @@
+import asyncio
+import threading
+import time
+
+from app import persist
+from app.persist import StateWriter
+
+
+def test_flush_does_not_let_an_older_write_land_last(monkeypatch):
+    landed = []
+    first_started = threading.Event()
+
+    def slow_save(payload):
+        if payload["v"] == 1:
+            first_started.set()
+            time.sleep(0.2)                 # still writing when flush() runs
+        landed.append(payload["v"])
+
+    monkeypatch.setattr(persist, "save_state", slow_save)
+    current = {"v": 1}
+    writer = StateWriter(lambda: dict(current), debounce_s=0)
+
+    async def main():
+        writer.mark_dirty()
+        await asyncio.to_thread(first_started.wait, 1)
+        current["v"] = 2
+        writer.mark_dirty()
+        await writer.flush()
+
+    asyncio.run(main())
+    assert landed == [1, 2]
+    assert writer.writes == 2
+
+
+def test_flush_writes_pending_change():
+    writer = StateWriter(lambda: {"v": 3}, debounce_s=60)
+
+    async def main():
+        writer.mark_dirty()
+        await writer.flush()
+
+    asyncio.run(main())
+    assert persist.load_state() == {"v": 3}
+    assert writer.writes == 1
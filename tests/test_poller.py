@@ -0,0 +1,58 @@
+import asyncio
+
+from app.poller import Poller
+
+
+def test_concurrent_polls_share_one_run():
+    calls = 0
+
+    async def poll_fn():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+
+    async def main():
+        poller = Poller(poll_fn, interval=60)
+        await asyncio.gather(*(poller.poll() for _ in range(5)))
+        return poller
+
+    poller = asyncio.run(main())
+    assert calls == 1
+    assert poller.runs == 1
+    assert poller.coalesced == 4
+
+
+def test_next_poll_after_completion_runs_again():
+    calls = 0
+
+    async def poll_fn():
+        nonlocal calls
+        calls += 1
+
+    async def main():
+        poller = Poller(poll_fn, interval=60)
+        await poller.poll()
+        await poller.poll()
+
+    asyncio.run(main())
+    assert calls == 2
+
+
+def test_cancelled_caller_does_not_cancel_shared_poll():
+    async def main():
+        done = asyncio.Event()
+
+        async def poll_fn():
+            await asyncio.sleep(0.02)
+            done.set()
+
+        poller = Poller(poll_fn, interval=60)
+        caller = asyncio.create_task(poller.poll())
+        await asyncio.sleep(0)
+        joiner = asyncio.create_task(poller.poll())
+        await asyncio.sleep(0.005)
+        caller.cancel()
+        await joiner
+        return done.is_set()
+
+    assert asyncio.run(main())
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import profiling
+from app.profiling import Profiler, SpanMiddleware, span
+
+
+@pytest.fixture
+def profiler(tmp_path, monkeypatch):
+    p = Profiler(tmp_path / "profile", hz=200)
+    monkeypatch.setattr(profiling, "PROFILER", p)
+    yield p
+    p.stop()
+
+
+def test_spans_are_noops_while_off(profiler):
+    assert span("poll") is span("parse")
+    with span("poll"):
+        pass
+    assert profiler.spans == {}
+
+
+def test_span_paths_nest_per_task(profiler):
+    profiler.start()
+
+    async def game():
+        with span("poll_game"):
+            await asyncio.sleep(0)
+            with span("fetch"):
+                await asyncio.sleep(0.001)
+
+    async def poll():
+        with span("poll"):
+            await asyncio.gather(game(), game())
+
+    asyncio.run(poll())
+    counts = {path: n for path, (n, _, _) in profiler.spans.items()}
+    assert counts == {"poll": 1, "poll;poll_game": 2, "poll;poll_game;fetch": 2}
+    n, total, peak = profiler.spans["poll;poll_game;fetch"]
+    assert 0.001 <= peak <= total
+
+
+def _busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_dump_writes_collapsed_stacks_and_span_table(profiler):
+    profiler.start()
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_loop, args=(stop,), name="busy-worker")
+    worker.start()
+    with span("poll"):
+        time.sleep(0.3)
+    stop.set()
+    worker.join()
+    files = profiler.stop()
+
+    lines = open(files["collapsed"], encoding="utf-8").read().splitlines()
+    assert lines
+    for line in lines:
+        stack, _, n = line.rpartition(" ")
+        assert stack and int(n) > 0
+    busy = [line for line in lines if line.startswith("busy-worker;")]
+    assert busy and "_busy_loop (" in busy[0]
+
+    dumped = json.load(open(files["spans"], encoding="utf-8"))
+    assert dumped["hz"] == 200
+    assert dumped["samples"] > 0
+    assert [row["span"] for row in dumped["spans"]] == ["poll"]
+    assert dumped["spans"][0]["count"] == 1
+    assert not profiler.enabled
+
+
+def test_middleware_names_requests_after_the_route(profiler):
+    app = FastAPI()
+
+    @app.get("/api/state/{game_id}")
+    async def state(game_id: str):
+        with span("render"):
+            return {"game_id": game_id}
+
+    client = TestClient(SpanMiddleware(app))
+    client.get("/api/state/401")      # off: nothing recorded
+    assert profiler.spans == {}
+    profiler.start()
+    client.get("/api/state/401")
+    client.get("/api/state/402")
+    assert profiler.spans["http;GET /api/state/{game_id}"][0] == 2
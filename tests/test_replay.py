@@ -0,0 +1,62 @@
+import json
+
+from app.replay import Recording, ReplaySession
+
+EVENTS = [
+    {"quarter": 1, "clock": "15:00", "home_score": 0},
+    {"quarter": 1, "clock": "8:00", "home_score": 7},
+    {"quarter": 2, "clock": "12:00", "home_score": 7},
+    {"quarter": 2, "clock": "3:00", "home_score": 14},
+    {"quarter": 3, "clock": "9:00", "home_score": 17},
+]
+
+
+def _jsonl(tmp_path, events):
+    path = tmp_path / "game.jsonl"
+    path.write_text("".join(json.dumps(e) + "\n" for e in events), encoding="utf-8")
+    return path
+
+
+def test_step_playback_repeats_last_event(tmp_path):
+    session = ReplaySession(Recording(_jsonl(tmp_path, EVENTS[:2])))
+    assert session.next_event()["clock"] == "15:00"
+    assert session.next_event()["clock"] == "8:00"
+    assert session.next_event()["clock"] == "8:00"
+
+
+def test_seek_by_index_clamps_to_length(tmp_path):
+    session = ReplaySession(Recording(_jsonl(tmp_path, EVENTS)))
+    assert session.seek(3) == 3
+    assert session.next_event()["home_score"] == 14
+    assert session.seek(99) == len(EVENTS)
+
+
+def test_seek_clock_lands_on_first_event_at_or_after(tmp_path):
+    session = ReplaySession(Recording(_jsonl(tmp_path, EVENTS)))
+    assert session.seek_clock("Q2 12:00") == 2
+    assert session.seek_clock("Q2 11:59") == 3
+    assert session.next_event()["clock"] == "3:00"
+    assert session.seek_clock("Q4 01:00") == len(EVENTS)
+    assert session.seek_clock("not a clock") is None
+
+
+def test_seek_clock_ignores_out_of_order_clock(tmp_path):
+    # A fetch-error fallback (no quarter) in the middle must not break the ordering.
+    events = EVENTS[:3] + [{"quarter": None, "clock": None}] + EVENTS[3:]
+    session = ReplaySession(Recording(_jsonl(tmp_path, events)))
+    assert session.seek_clock("Q2 05:00") == 4
+
+
+def test_timed_playback_follows_recorded_ts(tmp_path):
+    events = [dict(e, ts=100.0 + 10 * i) for i, e in enumerate(EVENTS)]
+    session = ReplaySession(Recording(_jsonl(tmp_path, events)), speed=10.0)
+    assert session.next_event(now=0.0)["clock"] == "15:00"
+    assert session.next_event(now=2.5)["clock"] == "12:00"    # 25 recorded seconds later
+
+
+def test_json_array_recording(tmp_path):
+    path = tmp_path / "demo.json"
+    path.write_text(json.dumps(EVENTS), encoding="utf-8")
+    rec = Recording(path)
+    assert len(rec) == len(EVENTS)
+    assert rec.index_at(0) == 0
@@ -0,0 +1,58 @@
+from app.dedupe import DedupeIndex
+from app.ringbuf import RingBuffer, SeqCounter
+
+
+def test_ring_buffer_keeps_newest_within_capacity():
+    buf = RingBuffer(3, SeqCounter())
+    for i in range(5):
+        buf.append(f"line {i}")
+    assert len(buf) == 3
+    assert buf.latest() == ["line 4", "line 3", "line 2"]
+    assert buf.latest(2) == ["line 4", "line 3"]
+
+
+def test_since_returns_only_newer_entries_across_panels():
+    seq = SeqCounter()
+    a, b = RingBuffer(10, seq), RingBuffer(10, seq)
+    a.append("a1")
+    mark = b.append("b1")
+    a.append("a2")
+    b.append("b2")
+    assert a.since(mark) == ["a2"]
+    assert b.since(mark) == ["b2"]
+    assert a.since(seq.value) == []
+
+
+def test_clear_moves_reset_seq_forward():
+    seq = SeqCounter()
+    buf = RingBuffer(10, seq)
+    before = buf.append("x")
+    buf.clear()
+    assert len(buf) == 0
+    assert buf.reset_seq > before
+
+
+def test_restore_round_trips_entries_and_dedupe():
+    buf = RingBuffer(10, SeqCounter(), DedupeIndex(window=10))
+    buf.append_unique("Indiana scores")
+    buf.append_unique("Miami punts")
+    copy = RingBuffer(10, SeqCounter(), DedupeIndex(window=10))
+    copy.restore(buf.entries(), buf.reset_seq)
+    assert copy.entries() == buf.entries()
+    assert copy.append_unique("indiana   SCORES") is None
+
+
+def test_dedupe_normalizes_and_slides():
+    index = DedupeIndex(window=2)
+    assert index.add_if_new("Touchdown Indiana!", now=0)
+    assert not index.add_if_new("  touchdown   indiana! ", now=0)
+    assert index.add_if_new("b", now=0)
+    assert index.add_if_new("c", now=0)        # pushes the first entry out of the window
+    assert index.add_if_new("Touchdown Indiana!", now=0)
+
+
+def test_dedupe_ttl_forgets_old_entries():
+    index = DedupeIndex(window=10, ttl_s=5)
+    assert index.add_if_new("x", now=0)
+    assert not index.add_if_new("x", now=4)
+    assert index.add_if_new("x", now=10)
@@ -0,0 +1,56 @@
+import math
+
+from app.series import WinProbSeries
+
+
+def _filled(n: int, capacity: int = 4096) -> WinProbSeries:
+    series = WinProbSeries(capacity)
+    for i in range(n):
+        series.append(1000.0 + i, float(i), 0.5 + 0.4 * math.sin(i / 15))
+    return series
+
+
+def test_lttb_keeps_endpoints_and_size():
+    series = _filled(500)
+    points = series.downsample(50)
+    assert len(points) == 50
+    assert points[0] == (1000.0, 0.0, series.prob[0])
+    assert points[-1][1] == 499.0
+    assert [p[1] for p in points] == sorted(p[1] for p in points)
+
+
+def test_lttb_keeps_extremes():
+    series = _filled(100)
+    series.append(2000.0, 100.0, 0.5)
+    series.append(2001.0, 101.0, 0.99)      # a spike must survive downsampling
+    series.append(2002.0, 102.0, 0.5)
+    for i in range(103, 200):
+        series.append(2000.0 + i, float(i), 0.5)
+    assert 0.99 in [p[2] for p in series.downsample(20)]
+
+
+def test_small_series_and_tiny_threshold_return_everything():
+    series = _filled(10)
+    assert len(series.downsample(50)) == 10
+    assert len(series.downsample(2)) == 10
+
+
+def test_same_clock_replaces_last_sample():
+    series = WinProbSeries()
+    series.append(1.0, 60.0, 0.4)
+    series.append(2.0, 60.0, 0.6)
+    assert len(series) == 1
+    assert series.prob[0] == 0.6
+
+
+def test_capacity_thins_older_half():
+    series = _filled(64, capacity=16)
+    assert len(series) <= 16
+    assert series.game_s[-1] == 63.0
+
+
+def test_downsample_memo_cleared_on_append():
+    series = _filled(100)
+    first = series.downsample(10)
+    series.append(5000.0, 100.0, 0.1)
+    assert series.downsample(10) != first
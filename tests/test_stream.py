@@ -0,0 +1,40 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import STORE, _publish, _touch, app
+from app.stream import BROADCASTER, Broadcaster, make_event
+
+
+@pytest.fixture
+def client():
+    # No `with`: the lifespan (poller, shared state, asset warm-up) stays off.
+    return TestClient(app)
+
+
+def test_slow_subscriber_drops_oldest_instead_of_blocking():
+    async def run():
+        hub = Broadcaster(queue_size=2)
+        slow = hub.subscribe("g")
+        for i in range(5):
+            hub.publish("g", make_event(str(i)))   # never awaits the reader
+        return hub, [slow.get_nowait().json for _ in range(slow.qsize())]
+
+    hub, pending = asyncio.run(run())
+    assert pending == ["3", "4"]
+    assert hub.dropped == 3
+    assert hub.published == 5
+
+
+def test_websocket_ignores_binary_frames_and_unsubscribes(client):
+    with client.websocket_connect("/ws") as ws:
+        assert json.loads(ws.receive_text())["game_id"] == STORE.game_id   # last snapshot
+        ws.send_bytes(b"\x00\x01")
+        ws.send_text("ping")
+        STORE.commentary.append("ws test: after binary")
+        _touch(STORE)
+        ws.portal.call(_publish, STORE)   # on the app's event loop, as the poller does
+        assert "ws test: after binary" in ws.receive_text()
+    assert BROADCASTER.clients == 0
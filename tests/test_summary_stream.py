@@ -0,0 +1,22 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app import summary_stream
+from app.data_sources import parse_summary
+
+ESPN_RESPONSE = Path(__file__).resolve().parents[1] / "espn_response.json"
+
+pytestmark = pytest.mark.skipif(not summary_stream.available(), reason="needs `pip install ijson`")
+
+
+@pytest.mark.parametrize("chunk", [16 * 1024, 1000, 7])
+def test_streaming_parse_matches_full_decode(chunk):
+    body = ESPN_RESPONSE.read_bytes()
+    stream = summary_stream.SummaryStream()
+    for i in range(0, len(body), chunk):
+        stream.send(body[i:i + chunk])
+    streamed = parse_summary(stream.close())
+    assert streamed == parse_summary(json.loads(body))
+    assert streamed.players                      # the boxscore made it through the stream
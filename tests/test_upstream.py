@@ -0,0 +1,118 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app import data_sources, main
+from app.data_sources import UpstreamError, fetch_live_espn_state
+from app.game_logic import GameState
+from app.metrics import POLLS_FAILED
+from app.store import MemoryStore
+
+ESPN_RESPONSE = Path(__file__).resolve().parents[1] / "espn_response.json"
+
+
+@pytest.fixture
+def espn(monkeypatch):
+    """Route the shared ESPN client through a MockTransport; set `.handler` per test."""
+    class Upstream:
+        handler = None
+
+    upstream = Upstream()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: upstream.handler(request)))
+    monkeypatch.setattr(data_sources, "_client", client)
+    monkeypatch.setattr(data_sources, "_validators", {})
+    return upstream
+
+
+def test_failed_fetch_raises_instead_of_placeholder(espn):
+    def handler(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    espn.handler = handler
+    errors = data_sources.UPSTREAM.errors
+    with pytest.raises(UpstreamError):
+        asyncio.run(fetch_live_espn_state("222"))
+    assert data_sources.UPSTREAM.errors == errors + 1
+
+
+def test_not_modified_reuses_the_parsed_state(espn):
+    body = ESPN_RESPONSE.read_bytes()
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, stream=httpx.ByteStream(body), headers={"ETag": '"v1"'})
+
+    espn.handler = handler
+    before = data_sources.UpstreamStats(**vars(data_sources.UPSTREAM))
+
+    first = asyncio.run(fetch_live_espn_state("401"))
+    second = asyncio.run(fetch_live_espn_state("401"))
+
+    assert seen == [None, '"v1"']
+    assert second is first
+    after = data_sources.UPSTREAM
+    assert after.requests == before.requests + 2
+    assert after.not_modified == before.not_modified + 1
+    assert after.bytes_received == before.bytes_received + len(body)
+    assert after.errors == before.errors
+
+
+def test_connection_trace_counts_new_and_pooled_connections(monkeypatch):
+    monkeypatch.setattr(data_sources, "UPSTREAM", data_sources.UpstreamStats())
+
+    async def send(events):
+        trace = data_sources._connection_trace()
+        for event in events:
+            await trace(event, {})
+
+    fresh = ["connection.connect_tcp.started", "connection.connect_tcp.complete",
+             "http11.send_request_headers.started", "http11.send_request_headers.complete"]
+    pooled = ["http11.send_request_headers.started", "http11.send_request_headers.complete"]
+
+    async def run():
+        await send(fresh)
+        await send(pooled)
+        await send(["http2.send_request_headers.started"])
+
+    asyncio.run(run())
+    assert data_sources.UPSTREAM.new_connections == 1
+    assert data_sources.UPSTREAM.reused_connections == 2
+    assert data_sources.UPSTREAM.to_dict()["reused_connections"] == 2
+
+
+def test_summary_without_competitions_is_an_error(espn):
+    espn.handler = lambda request: httpx.Response(200, json={"header": {}})
+    with pytest.raises(UpstreamError):
+        asyncio.run(fetch_live_espn_state("222"))
+
+
+def test_failing_game_in_a_slate_keeps_its_state(monkeypatch):
+    good = MemoryStore(game_id="111")
+    flaky = MemoryStore(game_id="222")
+    oregon = GameState("Oregon", "Penn State", 14, 10, "live", 2, "3:00")
+    flaky.last_game = oregon
+    flaky.commentary.append("Oregon leads at the half")
+
+    async def fetch(game_id):
+        if game_id == "222":
+            raise UpstreamError("game 222: ReadTimeout()")
+        return GameState("Miami", "Indiana", 7, 3, "live", 1, "5:00")
+
+    monkeypatch.setattr(main, "fetch_state", fetch)
+    monkeypatch.setattr(main, "STORES", {"111": good, "222": flaky})
+    failed = POLLS_FAILED.value
+    version = flaky.version
+
+    asyncio.run(main.poll_once())
+
+    assert good.last_game.home_team == "Miami"
+    assert flaky.last_game is oregon
+    assert flaky.version == version
+    assert flaky.commentary.latest() == ["Oregon leads at the half"]
+    assert len(flaky.winprob_series) == 0
+    assert POLLS_FAILED.value == failed + 1
@@ -0,0 +1,37 @@
+import pytest
+
+from app.game_logic import GameState
+from app.winprob import TABLE, WinProbTable, compute_win_prob
+
+
+def _live(home, away, quarter, clock):
+    return GameState("Miami", "Indiana", home, away, "live", quarter, clock)
+
+
+def test_probability_rises_with_the_lead():
+    probs = [compute_win_prob(_live(home, 10, 3, "7:30")) for home in range(0, 25, 3)]
+    assert probs == sorted(probs)
+    assert probs[0] < 0.5 < probs[-1]
+    assert compute_win_prob(_live(10, 10, 3, "7:30")) == pytest.approx(0.5)
+
+
+def test_same_lead_counts_for_more_as_time_runs_out():
+    clocks = [(1, "15:00"), (2, "7:00"), (3, "1:00"), (4, "8:00"), (4, "0:45")]
+    leading = [compute_win_prob(_live(17, 10, q, c)) for q, c in clocks]
+    trailing = [compute_win_prob(_live(10, 17, q, c)) for q, c in clocks]
+    assert leading == sorted(leading) and leading[0] < leading[-1]
+    assert trailing == sorted(trailing, reverse=True) and trailing[0] > trailing[-1]
+
+
+def test_final_and_pregame():
+    assert compute_win_prob(GameState("Miami", "Indiana", 27, 24, "final", 4, "0:00")) == 0.99
+    assert compute_win_prob(GameState("Miami", "Indiana", 24, 27, "final", 4, "0:00")) == 0.01
+    assert compute_win_prob(GameState("Miami", "Indiana")) == pytest.approx(0.5)
+
+
+def test_table_round_trips_through_a_file(tmp_path):
+    path = tmp_path / "winprob.bin"
+    TABLE.save(path)
+    loaded = WinProbTable.load(path)
+    for margin, secs in ((-3, 1850.0), (7, 12.5), (60, 3600), (0, 0)):
+        assert loaded.lookup(margin, secs) == TABLE.lookup(margin, secs)